@@ -0,0 +1,119 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def eye_aspect_ratio(eyes):
+    """Eye aspect ratio for an array of eyes shaped (n_eyes, 6, 2).
+
+    Points are ordered outer corner, two upper lid points, inner corner and
+    two lower lid points, as in EyeTracker.LEFT_EYE_INDICES. The ratio of lid
+    opening to eye width does not depend on face size or distance.
+    """
+    vertical = (np.linalg.norm(eyes[:, 1] - eyes[:, 5], axis=1) +
+                np.linalg.norm(eyes[:, 2] - eyes[:, 4], axis=1))
+    width = np.linalg.norm(eyes[:, 0] - eyes[:, 3], axis=1)
+    return vertical / np.maximum(2 * width, 1e-6)
+
+class BlinkDetector:
+    """Classifies blinks of both eyes from a sliding window of eye aspect ratios.
+
+    Samples go into a NumPy ring buffer and every update classifies the whole
+    window in one vectorized pass, so the result does not depend on per-frame
+    state transitions and stays correct at any camera rate. Each eye has its
+    own adaptive threshold: the open-eye EAR of the current user, taken as a
+    high percentile of the window since eyes are open most of the time,
+    scaled by close_ratio.
+    """
+    def __init__(self, capacity=256, close_ratio=0.65, initial_baseline=0.28, open_percentile=85,
+                 min_baseline_samples=30, long_blink=1.0, double_blink=0.5, wink_duration=0.2):
+        self.capacity = capacity
+        self.close_ratio = close_ratio
+        self.open_percentile = open_percentile
+        self.min_baseline_samples = min_baseline_samples
+        self.long_blink = long_blink          # Seconds closed for a long blink
+        self.double_blink = double_blink      # Max seconds between the ends of two blinks
+        self.wink_duration = wink_duration    # Seconds one eye alone must stay closed
+
+        # Every sample is written twice, capacity apart, so the newest
+        # capacity samples are always one contiguous view of the buffer
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._ears = np.zeros((2 * capacity, 2), dtype=np.float64)
+        self._index = np.arange(capacity)
+        self._next = 0
+        self.count = 0
+
+        self.initial_baseline = initial_baseline
+        self.baseline = np.full(2, initial_baseline, dtype=np.float64)
+        self.threshold = self.baseline * close_ratio
+
+    def reset(self):
+        """Forget the window and the learned thresholds, e.g. when the user changes"""
+        self._next = 0
+        self.count = 0
+        self.baseline[:] = self.initial_baseline
+        np.multiply(self.baseline, self.close_ratio, out=self.threshold)
+
+    def update(self, timestamp, ears, left_blink, right_blink):
+        """Add the (left, right) EARs for a frame and fill both BlinkInfo objects"""
+        i = self._next
+        self._times[i] = self._times[i + self.capacity] = timestamp
+        self._ears[i] = self._ears[i + self.capacity] = ears
+        self._next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+        start = self._next + self.capacity - self.count
+        times = self._times[start:start + self.count]
+        window = self._ears[start:start + self.count]
+
+        # Follow the open-eye level of this user
+        if self.count >= self.min_baseline_samples:
+            np.percentile(window, self.open_percentile, axis=0, out=self.baseline)
+            np.multiply(self.baseline, self.close_ratio, out=self.threshold)
+
+        self._classify(times, window, left_blink, right_blink)
+
+    def _classify(self, times, ears, left_blink, right_blink):
+        left_blink.reset()
+        right_blink.reset()
+        n = len(times)
+        now = times[-1]
+        index = self._index[:n, None]
+
+        closed = ears < self.threshold
+        left_blink.is_closed = bool(closed[-1, 0])
+        right_blink.is_closed = bool(closed[-1, 1])
+        if n < 2:
+            return
+
+        # Index of the latest open sample at or before each sample, per eye;
+        # a closed run ending at sample k started at last_open[k] + 1
+        last_open = np.maximum.accumulate(np.where(closed, -1, index), axis=0)
+
+        # Samples where an eye opened after being closed, and the latest such
+        # sample before the current one
+        opened = np.zeros_like(closed)
+        opened[1:] = closed[:-1] & ~closed[1:]
+        last_end = np.maximum.accumulate(np.where(opened, index, -1), axis=0)
+
+        # One eye closed while the other is open
+        one_closed = closed & ~closed[:, ::-1]
+        last_both = np.maximum.accumulate(np.where(one_closed, -1, index), axis=0)
+
+        for eye, info in ((0, left_blink), (1, right_blink)):
+            if info.is_closed:
+                info.duration = float(now - times[last_open[-1, eye] + 1])
+            elif opened[-1, eye]:
+                # A blink just completed
+                info.blink_detected = True
+                info.duration = float(now - times[last_open[-2, eye] + 1])
+                info.long_blink = info.duration >= self.long_blink
+                previous_end = last_end[-2, eye]
+                info.double_blink = bool(previous_end >= 0 and now - times[previous_end] < self.double_blink)
+
+            if one_closed[-1, eye]:
+                info.wink = bool(now - times[last_both[-1, eye] + 1] >= self.wink_duration)
+
+    def get_thresholds(self):
+        return {'baseline': self.baseline.tolist(), 'threshold': self.threshold.tolist()}
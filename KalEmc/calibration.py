@@ -0,0 +1,305 @@
+"""
+Multi-point gaze calibration.
+
+The user looks at 9 or 16 on-screen targets in turn while gaze samples are
+collected. A mapping from the gaze signal to normalized screen coordinates
+(0..1 on both axes) is then fitted with NumPy least squares: a polynomial
+in the gaze coordinates or a homography. Applying a fitted mapping is a
+handful of multiply-adds per sample.
+"""
+
+import logging
+import multiprocessing as mp
+import queue
+import time
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Gaze samples in flight to the calibration window process
+SAMPLE_QUEUE_SIZE = 64
+
+def calibration_targets(points=9, margin=0.1):
+    """Grid of normalized screen targets, row by row; points must be 9 or 16"""
+    side = {9: 3, 16: 4}.get(points)
+    if side is None:
+        raise ValueError(f"Calibration needs 9 or 16 points, not {points}")
+    steps = np.linspace(margin, 1 - margin, side)
+    return np.array([(x, y) for y in steps for x in steps], dtype=np.float64)
+
+class GazeMapping:
+    """Base class for fitted gaze -> normalized screen mappings"""
+    def fit(self, gaze, screen):
+        """Fit to (n, 2) gaze and screen arrays; returns the RMS residual"""
+        raise NotImplementedError
+
+    def apply(self, gaze, out=None):
+        """Map one (x, y) gaze sample to normalized screen coordinates"""
+        raise NotImplementedError
+
+    def residual(self, gaze, screen):
+        mapped = np.array([self.apply(point) for point in gaze])
+        return float(np.sqrt(np.mean(np.sum((mapped - screen) ** 2, axis=1))))
+
+class PolynomialMapping(GazeMapping):
+    """Full polynomial in gaze x and y up to the given degree, per screen axis.
+
+    Degree 2 has 6 terms and suits 9 points; degree 3 has 10 and needs 16.
+    """
+    def __init__(self, degree=2):
+        self.degree = degree
+        self.powers = [(i - j, j) for i in range(degree + 1) for j in range(i + 1)]
+        self.coefficients = None
+        self._features = np.zeros(len(self.powers), dtype=np.float64)
+
+    def _design(self, gaze):
+        x, y = gaze[:, 0], gaze[:, 1]
+        return np.stack([x ** px * y ** py for px, py in self.powers], axis=1)
+
+    def fit(self, gaze, screen):
+        gaze = np.asarray(gaze, dtype=np.float64)
+        if len(gaze) < len(self.powers):
+            raise ValueError(f"Degree {self.degree} needs at least {len(self.powers)} points, got {len(gaze)}")
+        self.coefficients, _, _, _ = np.linalg.lstsq(self._design(gaze), np.asarray(screen, dtype=np.float64),
+                                                     rcond=None)
+        return self.residual(gaze, screen)
+
+    def apply(self, gaze, out=None):
+        x, y = float(gaze[0]), float(gaze[1])
+        features = self._features
+        for i, (px, py) in enumerate(self.powers):
+            features[i] = x ** px * y ** py
+        return np.dot(features, self.coefficients, out=out)
+
+    def get_state(self):
+        return {'model': 'polynomial', 'degree': self.degree, 'coefficients': self.coefficients}
+
+class HomographyMapping(GazeMapping):
+    """Projective mapping, fitted by linear least squares with h33 fixed to 1"""
+    def __init__(self):
+        self.matrix = None
+        self._point = np.ones(3, dtype=np.float64)
+        self._projected = np.zeros(3, dtype=np.float64)
+
+    def fit(self, gaze, screen):
+        gaze = np.asarray(gaze, dtype=np.float64)
+        screen = np.asarray(screen, dtype=np.float64)
+        if len(gaze) < 4:
+            raise ValueError(f"A homography needs at least 4 points, got {len(gaze)}")
+
+        # u = (h0 x + h1 y + h2) / (h6 x + h7 y + 1), and likewise for v
+        x, y = gaze[:, 0], gaze[:, 1]
+        u, v = screen[:, 0], screen[:, 1]
+        zeros = np.zeros_like(x)
+        ones = np.ones_like(x)
+        rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y], axis=1)
+        rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y], axis=1)
+        h, _, _, _ = np.linalg.lstsq(np.vstack([rows_u, rows_v]), np.concatenate([u, v]), rcond=None)
+        self.matrix = np.append(h, 1.0).reshape(3, 3)
+        return self.residual(gaze, screen)
+
+    def apply(self, gaze, out=None):
+        self._point[0] = gaze[0]
+        self._point[1] = gaze[1]
+        np.dot(self.matrix, self._point, out=self._projected)
+        if out is None:
+            out = np.empty(2, dtype=np.float64)
+        np.divide(self._projected[:2], self._projected[2], out=out)
+        return out
+
+    def get_state(self):
+        return {'model': 'homography', 'matrix': self.matrix}
+
+def create_mapping(model='polynomial', points=9):
+    """Mapping suited to a calibration with the given number of points"""
+    if model == 'polynomial':
+        return PolynomialMapping(degree=3 if points >= 16 else 2)
+    if model == 'homography':
+        return HomographyMapping()
+    raise ValueError(f"Unknown calibration model '{model}', expected 'polynomial' or 'homography'")
+
+def mapping_from_state(state):
+    """Rebuild a fitted mapping from its get_state() dictionary"""
+    if state['model'] == 'polynomial':
+        mapping = PolynomialMapping(degree=state['degree'])
+        mapping.coefficients = np.asarray(state['coefficients'], dtype=np.float64).reshape(len(mapping.powers), 2)
+        return mapping
+    if state['model'] == 'homography':
+        mapping = HomographyMapping()
+        mapping.matrix = np.asarray(state['matrix'], dtype=np.float64).reshape(3, 3)
+        return mapping
+    raise ValueError(f"Unknown calibration model '{state['model']}'")
+
+class CalibrationSession:
+    """Collects gaze samples for each target in turn.
+
+    Samples from the first settle seconds after a target appears are
+    skipped while the eyes move to it; the median of the rest is the gaze
+    for that target, which ignores blinks and stray glances.
+    """
+    def __init__(self, targets, samples_per_target=30, settle=0.6):
+        self.targets = np.asarray(targets, dtype=np.float64)
+        self.samples_per_target = samples_per_target
+        self.settle = settle
+        self.index = 0
+        self.gaze = np.zeros_like(self.targets)
+        self._samples = []
+        self._target_start = None
+
+    @property
+    def finished(self):
+        return self.index >= len(self.targets)
+
+    @property
+    def current_target(self):
+        return None if self.finished else self.targets[self.index]
+
+    @property
+    def progress(self):
+        """Share of the current target's samples collected so far"""
+        return len(self._samples) / self.samples_per_target
+
+    def add_sample(self, gaze, timestamp):
+        """Record one gaze sample; returns True when it completed the current target"""
+        if self.finished:
+            return False
+        if self._target_start is None:
+            self._target_start = timestamp
+        if timestamp - self._target_start < self.settle:
+            return False
+
+        self._samples.append((float(gaze[0]), float(gaze[1])))
+        if len(self._samples) < self.samples_per_target:
+            return False
+
+        self.gaze[self.index] = np.median(np.array(self._samples), axis=0)
+        self.index += 1
+        self._samples = []
+        self._target_start = None
+        return True
+
+    def fit(self, model='polynomial'):
+        """Fit a mapping to the collected targets; returns (mapping, RMS residual)"""
+        if not self.finished:
+            raise RuntimeError("Calibration is not complete")
+        mapping = create_mapping(model, len(self.targets))
+        residual = mapping.fit(self.gaze, self.targets)
+        return mapping, residual
+
+def run_calibration(read_gaze, screen_size, points=9, model='polynomial', samples_per_target=30,
+                    timeout_per_target=10.0, window_name="Eye Mouse Calibration"):
+    """Show targets full screen and fit a mapping from the gaze seen at each.
+
+    The targets are shown by a separate process, like DebugPreview, so
+    HighGUI never runs on the caller's thread (the tray owns the main
+    thread on macOS). read_gaze() is called here and returns (gaze,
+    timestamp) for the next frame, or None when no eyes were found; the
+    samples are streamed to the target process, which runs the
+    CalibrationSession. Returns (mapping, residual), or None when the user
+    pressed Esc, a target timed out or the window went away.
+    """
+    targets = calibration_targets(points)
+    ctx = mp.get_context('spawn')
+    sample_queue = ctx.Queue(maxsize=SAMPLE_QUEUE_SIZE)
+    result_queue = ctx.Queue()
+    process = ctx.Process(
+        target=_calibration_main,
+        args=(targets, tuple(screen_size), samples_per_target, timeout_per_target, sample_queue, result_queue,
+              window_name),
+        name="Calibration"
+    )
+    process.daemon = True
+    process.start()
+
+    try:
+        while True:
+            try:
+                gaze = result_queue.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            if not process.is_alive():
+                try:
+                    # It may have exited right after sending its result
+                    gaze = result_queue.get(timeout=0.5)
+                    break
+                except queue.Empty:
+                    logger.warning("Calibration window closed unexpectedly")
+                    return None
+
+            result = read_gaze()
+            if result is None:
+                continue
+            sample, timestamp = result
+            try:
+                sample_queue.put_nowait((float(sample[0]), float(sample[1]), timestamp))
+            except queue.Full:
+                # The window process is behind; a dropped sample is harmless
+                pass
+    finally:
+        # Unsent samples must not hold up interpreter exit
+        sample_queue.cancel_join_thread()
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.terminate()
+
+    if gaze is None:
+        return None
+    mapping = create_mapping(model, points)
+    residual = mapping.fit(gaze, targets)
+    logger.info(f"Calibration fitted with {points} points ({model}), RMS residual {residual * 100:.1f}% of screen")
+    return mapping, residual
+
+def _calibration_main(targets, screen_size, samples_per_target, timeout_per_target, sample_queue, result_queue,
+                      window_name):
+    """Entry point of the calibration window process.
+
+    Puts the per-target gaze on result_queue once every target is done, or
+    None if cancelled or timed out.
+    """
+    width, height = screen_size
+    session = CalibrationSession(targets, samples_per_target=samples_per_target)
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.namedWindow(window_name, cv2.WND_PROP_FULLSCREEN)
+    cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+
+    shown_index = -1
+    shown_at = 0.0
+    try:
+        while not session.finished:
+            if session.index != shown_index:
+                shown_index = session.index
+                shown_at = time.monotonic()
+            elif time.monotonic() - shown_at > timeout_per_target:
+                logger.warning(f"No steady gaze on calibration target {session.index + 1}, giving up")
+                result_queue.put(None)
+                return
+
+            target = session.current_target
+            center = (int(target[0] * width), int(target[1] * height))
+            progress = session.progress
+            canvas[:] = 0
+            cv2.circle(canvas, center, 20, (255, 255, 255), 2)
+            cv2.circle(canvas, center, 4, (0, 0, 255), -1)
+            if progress:
+                cv2.ellipse(canvas, center, (28, 28), -90, 0, int(360 * progress), (0, 255, 0), 3)
+            cv2.imshow(window_name, canvas)
+            if cv2.waitKey(1) & 0xFF == 27:
+                logger.info("Calibration cancelled")
+                result_queue.put(None)
+                return
+
+            # Take every sample that arrived since the last redraw
+            try:
+                x, y, timestamp = sample_queue.get(timeout=0.01)
+                while True:
+                    session.add_sample((x, y), timestamp)
+                    x, y, timestamp = sample_queue.get_nowait()
+            except queue.Empty:
+                pass
+
+        result_queue.put(session.gaze)
+    finally:
+        cv2.destroyAllWindows()
@@ -0,0 +1,103 @@
+"""
+Persistent calibration profiles.
+
+A fitted gaze mapping only holds for the user, camera and screen it was
+calibrated with, so each profile is stored under a key made of all three,
+one small binary file per key in the config directory: a header, the key
+itself (checked on load, in case of a hash collision) and the mapping
+parameters as little-endian float64.
+"""
+
+import getpass
+import hashlib
+import logging
+import os
+import struct
+import time
+
+import numpy as np
+
+from KalEmc.calibration import mapping_from_state
+from KalEmc.utils import create_config_dir
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'KECALIB1'
+VERSION = 1
+HEADER = struct.Struct('<8sIBBHdd')  # magic, version, model, degree, key length, residual, created
+PROFILE_DIR = "calibration"
+PROFILE_SUFFIX = ".kecal"
+
+MODELS = {'polynomial': 0, 'homography': 1}
+MODEL_NAMES = {code: name for name, code in MODELS.items()}
+
+def profile_key(camera_key, screen_size, user=None):
+    """Key of the profile for a camera (see camera_probe.get_device_key) and screen size"""
+    if user is None:
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "default"
+    width, height = screen_size
+    return f"{user}|{camera_key}|{width}x{height}"
+
+def profile_path(key, directory=None):
+    directory = directory or os.path.join(create_config_dir(), PROFILE_DIR)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, digest + PROFILE_SUFFIX)
+
+def save_profile(key, mapping, residual, directory=None):
+    """Store a fitted mapping under key; returns the file path, or None on error"""
+    state = mapping.get_state()
+    if state['model'] == 'polynomial':
+        degree, values = state['degree'], state['coefficients']
+    else:
+        degree, values = 0, state['matrix']
+    encoded_key = key.encode('utf-8')
+    header = HEADER.pack(MAGIC, VERSION, MODELS[state['model']], degree, len(encoded_key), residual, time.time())
+
+    path = profile_path(key, directory)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written aside and renamed, so a crash never leaves half a profile
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(encoded_key)
+            f.write(np.ascontiguousarray(values, dtype='<f8').tobytes())
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.error(f"Error saving calibration profile: {e}")
+        return None
+    logger.info(f"Calibration profile saved to {path}")
+    return path
+
+def load_profile(key, directory=None):
+    """Return (mapping, residual) stored under key, or None if there is none"""
+    path = profile_path(key, directory)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.error(f"Error loading calibration profile: {e}")
+        return None
+
+    try:
+        magic, version, model, degree, key_length, residual, _ = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a calibration profile of this version")
+        start = HEADER.size + key_length
+        if data[HEADER.size:start].decode('utf-8') != key:
+            return None
+        values = np.frombuffer(data, dtype='<f8', offset=start)
+        name = MODEL_NAMES[model]
+        if name == 'polynomial':
+            mapping = mapping_from_state({'model': name, 'degree': degree, 'coefficients': values})
+        else:
+            mapping = mapping_from_state({'model': name, 'matrix': values})
+    except (struct.error, KeyError, ValueError) as e:
+        logger.error(f"Ignoring unreadable calibration profile {path}: {e}")
+        return None
+    return mapping, residual
@@ -0,0 +1,218 @@
+"""
+Camera mode auto-probe.
+
+Tries combinations of pixel format (fourcc), resolution, frame rate and
+driver buffer size on a camera, measures the frame rate it really delivers
+and how long each read takes, and picks the best mode. The choice is cached
+per device in the config directory so later starts skip probing.
+
+    python -m KalEmc.camera_probe 0
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+
+import cv2
+import numpy as np
+
+from KalEmc.clock import SystemClock
+from KalEmc.utils import create_config_dir
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "camera_modes.json"
+
+FOURCCS = ('MJPG', 'YUYV')
+RESOLUTIONS = ((640, 480), (1280, 720))
+FRAME_RATES = (60, 30)
+BUFFER_SIZES = (1, 4)
+
+def candidate_modes(fourccs=FOURCCS, resolutions=RESOLUTIONS, frame_rates=FRAME_RATES, buffer_sizes=BUFFER_SIZES):
+    """Every combination to try, as mode dictionaries"""
+    return [
+        {'fourcc': fourcc, 'width': width, 'height': height, 'fps': fps, 'buffer_size': buffer_size}
+        for fourcc in fourccs
+        for width, height in resolutions
+        for fps in frame_rates
+        for buffer_size in buffer_sizes
+    ]
+
+def decode_fourcc(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+def apply_camera_mode(cap, mode):
+    """Request a mode on an open cv2.VideoCapture.
+
+    The pixel format is set first because some drivers only accept a
+    resolution or frame rate that the current format supports.
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode['fourcc']))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode['width'])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode['height'])
+    cap.set(cv2.CAP_PROP_FPS, mode['fps'])
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, mode['buffer_size'])
+
+def actual_camera_mode(cap, mode):
+    """The mode the driver actually settled on after apply_camera_mode"""
+    buffer_size = cap.get(cv2.CAP_PROP_BUFFERSIZE)
+    return {
+        'fourcc': decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)) or mode['fourcc'],
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': mode['fps'],
+        # Backends that ignore the buffer size report 0
+        'buffer_size': int(buffer_size) if buffer_size > 0 else mode['buffer_size']
+    }
+
+def measure_camera_mode(cap, frames=30, warmup=5, clock=None):
+    """Read frames in the current mode and return delivered fps and read latency.
+
+    Returns None if the camera stopped delivering frames.
+    """
+    clock = clock if clock is not None else SystemClock()
+    for _ in range(warmup):
+        ret, _ = cap.read()
+        if not ret:
+            return None
+
+    read_times = np.empty(frames)
+    start = clock.time()
+    for i in range(frames):
+        read_start = clock.time()
+        ret, _ = cap.read()
+        if not ret:
+            return None
+        read_times[i] = clock.time() - read_start
+    elapsed = clock.time() - start
+
+    p50, p95 = np.percentile(read_times, [50, 95]) * 1000
+    return {
+        'delivered_fps': frames / elapsed if elapsed > 0 else 0.0,
+        'read_p50_ms': float(p50),
+        'read_p95_ms': float(p95)
+    }
+
+def _mode_key(result):
+    # Highest real frame rate first (in 5 fps steps so measurement noise does
+    # not decide), then the shallowest driver queue, the quickest reads and
+    # the smallest frames
+    mode = result['mode']
+    return (-round(result['delivered_fps'] / 5), mode['buffer_size'], round(result['read_p95_ms']),
+            mode['width'] * mode['height'])
+
+def probe_camera(camera_id, modes=None, frames=30, capture_factory=cv2.VideoCapture, clock=None):
+    """Measure every candidate mode and return the results, best first.
+
+    Modes the driver silently replaced with one that was already measured
+    are skipped.
+    """
+    modes = modes if modes is not None else candidate_modes()
+    cap = capture_factory(camera_id)
+    if not cap.isOpened():
+        logger.error(f"Cannot open camera {camera_id} for probing")
+        return []
+
+    results = []
+    seen = set()
+    try:
+        for mode in modes:
+            apply_camera_mode(cap, mode)
+            actual = actual_camera_mode(cap, mode)
+            key = tuple(actual.values())
+            if key in seen:
+                continue
+            seen.add(key)
+
+            stats = measure_camera_mode(cap, frames=frames, clock=clock)
+            if stats is None:
+                logger.warning(f"Camera {camera_id} delivered no frames in mode {actual}")
+                continue
+            logger.debug(f"Camera {camera_id} {actual}: {stats['delivered_fps']:.1f} fps, "
+                         f"read p95 {stats['read_p95_ms']:.1f} ms")
+            results.append({'mode': actual, **stats})
+    finally:
+        cap.release()
+
+    results.sort(key=_mode_key)
+    return results
+
+def get_device_key(camera_id):
+    """Identify a camera across restarts, by device name where the OS exposes it"""
+    if platform.system() == "Linux":
+        name_path = f"/sys/class/video4linux/video{camera_id}/name"
+        try:
+            with open(name_path) as f:
+                return f"{camera_id}:{f.read().strip()}"
+        except OSError:
+            pass
+    return str(camera_id)
+
+def _cache_path():
+    return os.path.join(create_config_dir(), CACHE_FILE)
+
+def load_cached_modes(path=None):
+    path = path or _cache_path()
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading camera mode cache: {e}")
+        return {}
+
+def save_cached_mode(device_key, result, path=None):
+    path = path or _cache_path()
+    cache = load_cached_modes(path)
+    cache[device_key] = result
+    try:
+        with open(path, 'w') as f:
+            json.dump(cache, f, indent=2)
+        return True
+    except OSError as e:
+        logger.error(f"Error saving camera mode cache: {e}")
+        return False
+
+def get_camera_mode(camera_id, refresh=False, cache_path=None, **probe_kwargs):
+    """Return the best mode for a camera, probing only if it is not cached"""
+    device_key = get_device_key(camera_id)
+    if not refresh:
+        cached = load_cached_modes(cache_path).get(device_key)
+        if cached is not None:
+            return cached['mode']
+
+    logger.info(f"Probing camera {camera_id} modes, this takes a few seconds")
+    results = probe_camera(camera_id, **probe_kwargs)
+    if not results:
+        return None
+
+    best = results[0]
+    logger.info(f"Camera {camera_id} mode: {best['mode']} ({best['delivered_fps']:.1f} fps)")
+    save_cached_mode(device_key, best, cache_path)
+    return best['mode']
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe camera modes and cache the best one")
+    parser.add_argument("camera_id", type=int, nargs="?", default=0)
+    parser.add_argument("--frames", type=int, default=30, help="Frames measured per mode")
+    args = parser.parse_args()
+
+    results = probe_camera(args.camera_id, frames=args.frames)
+    if not results:
+        raise SystemExit(f"No usable modes on camera {args.camera_id}")
+
+    print(f"{'fourcc':<6} {'size':>10} {'fps':>4} {'buf':>4} {'real fps':>9} {'read p95 ms':>12}")
+    for result in results:
+        mode = result['mode']
+        print(f"{mode['fourcc']:<6} {mode['width']:>5}x{mode['height']:<4} {mode['fps']:>4} {mode['buffer_size']:>4} "
+              f"{result['delivered_fps']:9.1f} {result['read_p95_ms']:12.2f}")
+
+    save_cached_mode(get_device_key(args.camera_id), results[0])
+    print(f"\nCached {results[0]['mode']}")
+
+if __name__ == "__main__":
+    main()
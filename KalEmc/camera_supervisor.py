@@ -0,0 +1,155 @@
+import logging
+import threading
+
+from KalEmc.clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = 'healthy'
+UNAVAILABLE = 'unavailable'
+
+class CameraSupervisor:
+    """Tracks the health of a FrameSource and re-opens it in the background.
+
+    Readers report every read with report_success() / report_failure(). After
+    failure_threshold consecutive failures the source is released and a
+    reconnect thread retries open() with exponential backoff, so callers never
+    block on the device. While the device node is missing (USB unplug) the
+    thread only polls for it, and retries immediately once it is back.
+    """
+    def __init__(self, source, failure_threshold=5, initial_backoff=0.5, max_backoff=10.0,
+                 presence_interval=0.5, clock=None, on_reconnect=None):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.presence_interval = presence_interval
+        self.clock = clock if clock is not None else SystemClock()
+        self.on_reconnect = on_reconnect
+
+        self.state = HEALTHY
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._available = threading.Event()
+        self._available.set()
+        self._stop = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._outage_start = None
+
+        # Statistics
+        self.outages = 0
+        self.reconnect_attempts = 0
+        self.last_outage_duration = 0.0
+        self.total_downtime = 0.0
+
+    @property
+    def available(self):
+        return self._available.is_set()
+
+    def wait_available(self, timeout=None):
+        """Wait until the source is usable; never opens the device itself"""
+        return self._available.wait(timeout)
+
+    def report_success(self):
+        if self._failures:
+            self._failures = 0
+
+    def report_failure(self):
+        self._failures += 1
+        if self._failures == 1:
+            logger.warning(f"Failed to capture frame from {self.source.name}")
+        if self._failures >= self.failure_threshold:
+            self.mark_lost(f"{self._failures} failed reads")
+
+    def mark_lost(self, reason):
+        """Declare the source unavailable and start reconnecting in the background"""
+        with self._lock:
+            # After stop() the owner has released the source for good
+            if self._stopped or self.state == UNAVAILABLE:
+                return
+            self.state = UNAVAILABLE
+            self._available.clear()
+            self._outage_start = self.clock.time()
+            self.outages += 1
+            logger.error(f"{self.source.name} unavailable ({reason}), reconnecting in the background")
+
+            self.source.release()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._reconnect_loop, name=f"CameraSupervisor-{self.source.name}")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _reconnect_loop(self):
+        backoff = self.initial_backoff
+        device_missing = False
+        while not self._stop.is_set():
+            if not self.source.is_present():
+                if not device_missing:
+                    logger.warning(f"{self.source.name} unplugged, waiting for it to come back")
+                    device_missing = True
+                self._stop.wait(self.presence_interval)
+                continue
+
+            if device_missing:
+                # Replugged: retry right away instead of waiting out the backoff
+                logger.info(f"{self.source.name} plugged back in")
+                device_missing = False
+                backoff = self.initial_backoff
+
+            self.reconnect_attempts += 1
+            try:
+                opened = self.source.open()
+            except Exception as e:
+                logger.debug(f"Reopening {self.source.name} failed: {e}")
+                opened = False
+
+            if opened:
+                if self._stop.is_set():
+                    # Stopped while opening: leave the device closed
+                    self.source.release()
+                    return
+                self._recovered()
+                return
+
+            logger.debug(f"Reopening {self.source.name} failed, next attempt in {backoff:.1f}s")
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _recovered(self):
+        duration = self.clock.time() - self._outage_start
+        self.last_outage_duration = duration
+        self.total_downtime += duration
+        logger.info(f"{self.source.name} recovered after {duration:.1f}s unavailable")
+
+        if self.on_reconnect is not None:
+            try:
+                self.on_reconnect()
+            except Exception as e:
+                logger.error(f"Error in camera reconnect callback: {e}")
+
+        with self._lock:
+            self._failures = 0
+            self.state = HEALTHY
+            self._available.set()
+
+    def get_stats(self):
+        downtime = self.total_downtime
+        if self.state == UNAVAILABLE and self._outage_start is not None:
+            downtime += self.clock.time() - self._outage_start
+        return {
+            'state': self.state,
+            'outages': self.outages,
+            'reconnect_attempts': self.reconnect_attempts,
+            'last_outage_duration': self.last_outage_duration,
+            'total_downtime': downtime
+        }
+
+    def stop(self, timeout=1.0):
+        """Stop reconnecting; later mark_lost() calls are ignored"""
+        with self._lock:
+            self._stopped = True
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
@@ -0,0 +1,149 @@
+import threading
+import logging
+import time
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+class LatestFrameBuffer:
+    """Small ring buffer that always hands out the most recent frame"""
+    def __init__(self, size=3, max_age=0.1):
+        self.size = max(1, size)
+        self.max_age = max_age  # Frames older than this at hand-off are counted as stale
+
+        self._frames = [None] * self.size
+        self._timestamps = [0.0] * self.size
+        self._write_index = -1
+        self._read_seq = -1
+        self._write_seq = -1
+        self._cond = threading.Condition()
+
+        # Statistics
+        self.frames_written = 0
+        self.frames_read = 0
+        self.dropped_frames = 0  # Overwritten before the consumer ever saw them
+        self.stale_frames = 0    # Handed out later than max_age after capture
+
+    def put(self, frame, timestamp=None):
+        """Store a new frame, replacing the oldest slot"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self._cond:
+            self._write_index = (self._write_index + 1) % self.size
+            self._frames[self._write_index] = frame
+            self._timestamps[self._write_index] = timestamp
+
+            # Every frame between the last one read and this one is lost
+            if self._write_seq > self._read_seq:
+                self.dropped_frames += 1
+
+            self._write_seq += 1
+            self.frames_written += 1
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Return (frame, timestamp) for the newest unseen frame, or (None, None) on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._write_seq > self._read_seq, timeout):
+                return None, None
+
+            frame = self._frames[self._write_index]
+            timestamp = self._timestamps[self._write_index]
+            self._read_seq = self._write_seq
+            self.frames_read += 1
+
+        if self.max_age is not None and time.monotonic() - timestamp > self.max_age:
+            self.stale_frames += 1
+
+        return frame, timestamp
+
+    def clear(self):
+        with self._cond:
+            self._frames = [None] * self.size
+            self._read_seq = self._write_seq
+
+    def get_stats(self):
+        """Return buffer counters as a dictionary"""
+        return {
+            'frames_written': self.frames_written,
+            'frames_read': self.frames_read,
+            'dropped_frames': self.dropped_frames,
+            'stale_frames': self.stale_frames
+        }
+
+class CaptureThread:
+    """Background thread that reads frames from a FrameSource into a LatestFrameBuffer.
+
+    With a CameraSupervisor, read failures are reported to it and the thread
+    waits while the supervisor re-opens the source.
+    """
+    def __init__(self, source, buffer=None, flip=True, name="CaptureThread", supervisor=None):
+        self.source = source
+        self.buffer = buffer if buffer is not None else LatestFrameBuffer()
+        self.flip = flip
+        self.supervisor = supervisor
+        self.name = name
+        self.running = False
+        self.read_failures = 0
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"{self.name} started")
+
+    def _run(self):
+        while self.running:
+            if self.supervisor is not None and not self.supervisor.wait_available(0.5):
+                continue
+
+            ret, frame = self.source.read()
+            timestamp = getattr(self.source, 'capture_time', 0.0) or time.monotonic()
+
+            if not ret:
+                if getattr(self.source, 'exhausted', False):
+                    logger.info(f"{self.name}: end of stream")
+                    break
+                self.read_failures += 1
+                if self.supervisor is not None:
+                    self.supervisor.report_failure()
+                else:
+                    logger.error("Failed to capture frame")
+                # Back off briefly so a dead device does not spin the CPU
+                time.sleep(0.05)
+                continue
+
+            if self.supervisor is not None:
+                self.supervisor.report_success()
+
+            if self.flip:
+                # Flip the frame horizontally for a selfie-view display
+                frame = cv2.flip(frame, 1)
+
+            self.buffer.put(frame, timestamp)
+
+    def read(self, timeout=0.5):
+        """Return the newest frame captured since the last call, or None"""
+        frame, _ = self.buffer.get(timeout)
+        return frame
+
+    def read_timestamped(self, timeout=0.5):
+        """Like read(), but return (frame, capture time), or (None, None)"""
+        return self.buffer.get(timeout)
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info(f"{self.name} stopped")
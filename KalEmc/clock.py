@@ -0,0 +1,27 @@
+import time
+
+class SystemClock:
+    """Monotonic clock used during live tracking"""
+    def time(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+class ManualClock:
+    """Clock that only moves when told to, for replaying recorded sessions and tests"""
+    def __init__(self, start=0.0):
+        self.current = start
+
+    def time(self):
+        return self.current
+
+    def set(self, timestamp):
+        self.current = timestamp
+
+    def advance(self, seconds):
+        self.current += seconds
+
+    def sleep(self, seconds):
+        # Replay never blocks; waiting just moves virtual time forward
+        self.advance(seconds)
@@ -0,0 +1,184 @@
+import logging
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class DebugPreview:
+    """Opt-in debug sink that draws tracking overlays in a separate preview process.
+
+    Frames are copied into a two-slot shared memory buffer and only a small
+    overlay description crosses the process boundary, so drawing and window
+    events never run on the tracking loop. submit() never blocks; frames are
+    dropped while the preview is still busy with the previous one.
+    """
+    def __init__(self, window_name="Eye Tracking Debug"):
+        self.window_name = window_name
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+        self._ctx = mp.get_context('spawn')
+        self._queue = None
+        self._process = None
+        self._shm = None
+        self._slots = None
+        self._next_slot = 0
+        self._shape = None
+        self._closed = False
+
+    def _start(self, shape, dtype):
+        self._shape = shape
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * nbytes)
+        self._slots = np.ndarray((2,) + shape, dtype=dtype, buffer=self._shm.buf)
+        self._queue = self._ctx.Queue(maxsize=1)
+        self._process = self._ctx.Process(
+            target=_preview_main,
+            args=(self._shm.name, shape, np.dtype(dtype).str, self._queue, self.window_name),
+            name="DebugPreview"
+        )
+        self._process.daemon = True
+        self._process.start()
+        logger.info(f"Debug preview started (pid {self._process.pid})")
+
+    def submit(self, frame, overlay):
+        """Hand a frame and its overlay to the preview process without blocking"""
+        if self._closed:
+            return False
+
+        if self._process is None:
+            self._start(frame.shape, frame.dtype)
+        elif not self._process.is_alive():
+            logger.info("Debug preview window closed")
+            self.stop()
+            return False
+
+        if frame.shape != self._shape:
+            logger.warning(f"Debug preview frame shape changed to {frame.shape}, frame skipped")
+            self.frames_dropped += 1
+            return False
+
+        # This is the only producer, so a full queue means the preview still
+        # owns the slot it was last told about; the other slot is free
+        # whenever the queue is empty
+        if self._queue.full():
+            self.frames_dropped += 1
+            return False
+
+        slot = self._next_slot
+        self._slots[slot] = frame
+        try:
+            self._queue.put_nowait((slot, overlay))
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+
+        self._next_slot = 1 - slot
+        self.frames_sent += 1
+        return True
+
+    def stop(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._process is not None:
+            try:
+                self._queue.put(None, timeout=0.5)
+            except queue.Full:
+                pass
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+        if self._shm is not None:
+            self._slots = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        logger.info("Debug preview stopped")
+
+def build_overlay(left_eye, right_eye, left_pupil, right_pupil, left_blink, right_blink):
+    """Collect the values draw_debug_indicators needs into a small picklable dict.
+
+    Values are copied out of the PupilInfo and BlinkInfo objects, which the
+    tracker reuses for the next frame before the queue has pickled them.
+    """
+    def pupil_values(pupil):
+        if pupil is None:
+            return None
+        return (pupil.x, pupil.y, pupil.relative_x, pupil.relative_y)
+
+    return {
+        'left_eye': np.asarray(left_eye)[:, :2].astype(np.int32),
+        'right_eye': np.asarray(right_eye)[:, :2].astype(np.int32),
+        'left_pupil': pupil_values(left_pupil),
+        'right_pupil': pupil_values(right_pupil),
+        'left_closed': left_blink.is_closed,
+        'right_closed': right_blink.is_closed
+    }
+
+def draw_debug_indicators(frame, overlay):
+    """Draw debug indicators on the frame for visualization"""
+    # Draw eye regions
+    cv2.polylines(frame, [overlay['left_eye']], True, (0, 255, 0), 1)
+    cv2.polylines(frame, [overlay['right_eye']], True, (0, 255, 0), 1)
+
+    # Draw pupils
+    left_pupil = overlay['left_pupil']
+    right_pupil = overlay['right_pupil']
+    if left_pupil:
+        cv2.circle(frame, (int(left_pupil[0]), int(left_pupil[1])), 3, (0, 0, 255), -1)
+    if right_pupil:
+        cv2.circle(frame, (int(right_pupil[0]), int(right_pupil[1])), 3, (0, 0, 255), -1)
+
+    # Add gaze direction text
+    if left_pupil and right_pupil:
+        gaze_text = f"Gaze: L({left_pupil[2]:.2f}, {left_pupil[3]:.2f}), " \
+                    f"R({right_pupil[2]:.2f}, {right_pupil[3]:.2f})"
+        cv2.putText(frame, gaze_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+    # Add blink status
+    left_status = "Closed" if overlay['left_closed'] else "Open"
+    right_status = "Closed" if overlay['right_closed'] else "Open"
+
+    cv2.putText(frame, f"Left: {left_status}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    cv2.putText(frame, f"Right: {right_status}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+    return frame
+
+def _preview_main(shm_name, shape, dtype, frame_queue, window_name):
+    """Entry point of the preview process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((2,) + tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf)
+    frame = np.empty(shape, dtype=np.dtype(dtype))
+
+    try:
+        while True:
+            try:
+                item = frame_queue.get(timeout=0.05)
+            except queue.Empty:
+                # Keep the window responsive between frames
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+
+            if item is None:
+                break
+
+            slot, overlay = item
+            # Copy out first; the slot is reused once the next message is taken
+            np.copyto(frame, slots[slot])
+            draw_debug_indicators(frame, overlay)
+            cv2.imshow(window_name, frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        del slots
+        shm.close()
+        cv2.destroyAllWindows()
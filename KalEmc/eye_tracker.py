@@ -2,327 +2,499 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import logging
-import time
+from KalEmc.blink_detector import BlinkDetector, eye_aspect_ratio
+from KalEmc.camera_supervisor import CameraSupervisor
+from KalEmc.capture import CaptureThread, LatestFrameBuffer
+from KalEmc.clock import SystemClock
+from KalEmc.frame_source import CameraSource
+from KalEmc.gaze_sample import GazeSample, PupilInfo
+from KalEmc.inference_worker import InferenceWorker
+from KalEmc.landmark_flow import LandmarkFlowTracker
+from KalEmc.debug_preview import build_overlay
+from KalEmc.pupil_detector import PupilDetector
+from KalEmc.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 class EyeTracker:
-    def __init__(self, camera_id=0):
+    def __init__(self, camera_id=0, threaded_capture=False, buffer_size=3,
+                 roi_tracking=False, roi_padding=0.3, inference_width=None, debug_sink=None,
+                 source=None, flip=True, clock=None, flow_tracking=False, keyframe_interval=4,
+                 inference_process=False, inference_cpu=None, auto_camera_mode=False):
         self.camera_id = camera_id
-        self.cap = None
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        self.clock = clock if clock is not None else SystemClock()
+        
+        # Where frames come from: live camera by default, or any FrameSource
+        # such as a video file or image directory for replay
+        self.source = source if source is not None else CameraSource(camera_id, auto_mode=auto_camera_mode)
+        self.flip = flip
+        
+        # Re-opens the source in the background with backoff when it fails
+        self.supervisor = CameraSupervisor(self.source, clock=self.clock, on_reconnect=self._on_camera_reconnected)
+        
+        # Optional background capture so camera I/O overlaps with inference
+        self.threaded_capture = threaded_capture
+        self.buffer_size = buffer_size
+        self.capture_thread = None
+        
+        # Set by release(); a released tracker hands out no frames and never
+        # asks the supervisor to reopen the camera
+        self._closed = False
+        
+        # Face ROI tracking: run inference on a padded crop around the previous
+        # face instead of the full frame, optionally downscaled to inference_width
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.inference_width = inference_width
+        self._face_roi = None  # (x0, y0, x1, y1) in full-frame pixels
+        
+        # Optional optical-flow tracking of the landmarks between FaceMesh keyframes
+        self.flow_tracker = LandmarkFlowTracker(keyframe_interval) if flow_tracking else None
+        
+        # Optional debug overlay consumer (e.g. DebugPreview); nothing is
+        # drawn or copied when this is None
+        self.debug_sink = debug_sink
         
         # Landmark indices for eyes
         # These indices are specific to MediaPipe face mesh
         self.LEFT_EYE_INDICES = [362, 385, 387, 263, 373, 380]  # Left eye landmarks
         self.RIGHT_EYE_INDICES = [33, 160, 158, 133, 153, 144]  # Right eye landmarks
         
-        # For blink detection
-        self.LEFT_EYE_VERTICAL = [385, 380]  # Top and bottom landmarks
-        self.RIGHT_EYE_VERTICAL = [160, 144]  # Top and bottom landmarks
-        
         # For pupil tracking (iris landmarks)
         self.LEFT_IRIS = [474, 475, 476, 477]  # Left iris landmarks
         self.RIGHT_IRIS = [469, 470, 471, 472]  # Right iris landmarks
         
-        # Blink state tracking
-        self.left_eye_state = {'closed': False, 'closed_time': 0, 'last_blink': 0}
-        self.right_eye_state = {'closed': False, 'closed_time': 0, 'last_blink': 0}
+        # Face extremes (forehead, chin, cheeks) used to place the tracking ROI
+        self.FACE_BOUNDS = [10, 152, 234, 454]
+        
+        # Only these landmarks are ever used, so extraction is limited to them.
+        # Rows of the landmark buffer are laid out as: left eye, right eye,
+        # face bounds, left iris, right iris.
+        self._base_landmark_indices = self.LEFT_EYE_INDICES + self.RIGHT_EYE_INDICES + self.FACE_BOUNDS
+        self._iris_landmark_indices = self.LEFT_IRIS + self.RIGHT_IRIS
+        n_eye = len(self.LEFT_EYE_INDICES)
+        n_base = len(self._base_landmark_indices)
+        n_iris = len(self.LEFT_IRIS)
+        self._left_eye_rows = slice(0, n_eye)
+        self._right_eye_rows = slice(n_eye, 2 * n_eye)
+        self._left_iris_rows = slice(n_base, n_base + n_iris)
+        self._right_iris_rows = slice(n_base + n_iris, n_base + 2 * n_iris)
+        self._eye_rows = slice(0, 2 * n_eye)
+        self._n_base_rows = n_base
+        self._n_extracted_rows = 0
+        self._has_iris = False
+        
+        # Preallocated (x, y, z) buffer reused on every frame; x and y in pixels
+        self._landmarks = np.zeros((n_base + 2 * n_iris, 3), dtype=np.float64)
+        self._landmark_scale = np.ones(3, dtype=np.float64)
+        self._landmark_offset = np.zeros(3, dtype=np.float64)
+        
+        # FaceMesh runs either in this process or in a separate worker process
+        # fed through shared memory, so other Python threads cannot stall it
+        self.face_mesh = None
+        self.inference_worker = None
+        if inference_process:
+            self.inference_worker = InferenceWorker(self._base_landmark_indices, self._iris_landmark_indices,
+                                                    cpu=inference_cpu)
+            self.inference_worker.start()
+        else:
+            self.mp_face_mesh = mp.solutions.face_mesh
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                max_num_faces=1,
+                refine_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        
+        # Fallback pupil detection when iris landmarks are missing
+        self.pupil_detector = PupilDetector()
+        self._gray = None
+        
+        # Output sample, refilled in place on every frame
+        self._sample = GazeSample()
+        
+        # Blink classification over a window of eye aspect ratios
+        self.blink_detector = BlinkDetector()
         
         # Frame dimensions
         self.frame_width = 0
         self.frame_height = 0
         
+        # Capture time of the last frame handed out by capture_frame()
+        self.capture_time = 0.0
+        
         # Initialize camera
-        self.initialize_camera()
+        if not self.initialize_camera():
+            self.supervisor.mark_lost("open failed")
         
     def initialize_camera(self):
         try:
-            self.cap = cv2.VideoCapture(self.camera_id)
-            if not self.cap.isOpened():
-                logger.error(f"Cannot open camera {self.camera_id}")
+            if not self.source.open():
+                logger.error(f"Cannot open {self.source.name}")
                 return False
-                
-            # Set camera properties for better performance
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
             
             # Get actual frame dimensions
-            self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.frame_width, self.frame_height = self.source.get_frame_size()
+            
+            logger.info(f"{self.source.name} initialized successfully with resolution {self.frame_width}x{self.frame_height}")
             
-            logger.info(f"Camera {self.camera_id} initialized successfully with resolution {self.frame_width}x{self.frame_height}")
+            if self.threaded_capture:
+                self._start_capture_thread()
             return True
         except Exception as e:
             logger.error(f"Error initializing camera: {e}")
             return False
     
-    def capture_frame(self):
-        if self.cap is None or not self.cap.isOpened():
-            if not self.initialize_camera():
+    def _start_capture_thread(self):
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+        self.capture_thread = CaptureThread(
+            self.source,
+            LatestFrameBuffer(size=self.buffer_size),
+            flip=self.flip,
+            name=f"CaptureThread-{self.camera_id}",
+            supervisor=self.supervisor
+        )
+        self.capture_thread.start()
+    
+    def _on_camera_reconnected(self):
+        """Called on the supervisor thread once the source is open again"""
+        self.frame_width, self.frame_height = self.source.get_frame_size()
+        if self.threaded_capture and self.capture_thread is None:
+            # The first open failed, so capture never started
+            self._start_capture_thread()
+    
+    @property
+    def cap(self):
+        """Underlying cv2.VideoCapture for camera and video sources"""
+        return getattr(self.source, 'cap', None)
+    
+    def capture_frame(self, timeout=0.5):
+        if self._closed:
+            return None
+        
+        # A finished replay is not reopened
+        if not self.source.exhausted:
+            if self.capture_thread is None and self.supervisor.available and not self.source.is_opened():
+                self.supervisor.mark_lost("source closed")
+            
+            # The supervisor re-opens the source on its own thread; never
+            # open the device here, only wait a bounded time for it
+            if not self.supervisor.wait_available(timeout):
                 return None
+        
+        if self.capture_thread is not None:
+            # Hand out the newest frame from the background thread
+            frame, capture_time = self.capture_thread.read_timestamped(timeout)
+            if frame is not None:
+                self.capture_time = capture_time
+            return frame
                 
-        ret, frame = self.cap.read()
+        ret, frame = self.source.read()
         if not ret:
-            logger.error("Failed to capture frame")
+            if not self.source.exhausted:
+                self.supervisor.report_failure()
             return None
+        self.supervisor.report_success()
+        self.capture_time = getattr(self.source, 'capture_time', 0.0) or self.clock.time()
             
-        # Flip the frame horizontally for a selfie-view display
-        frame = cv2.flip(frame, 1)
+        if self.flip:
+            # Flip the frame horizontally for a selfie-view display
+            frame = cv2.flip(frame, 1)
         return frame
     
-    def detect_eyes(self, frame):
-        if frame is None:
+    def detect_eyes(self, frame, capture_time=None):
+        """Track the eyes in a frame and return a GazeSample, or None if no face was found.
+        
+        capture_time defaults to the capture time of the last frame returned
+        by capture_frame(). The returned sample is reused by the next call;
+        copy it to keep it.
+        """
+        if frame is None or self._closed:
             return None
             
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, _ = frame.shape
         
-        # Process the frame to detect face landmarks
-        results = self.face_mesh.process(rgb_frame)
+        # Locate the eye and iris landmarks in full-frame pixels
+        gray = None
+        if self.flow_tracker is not None:
+            gray = self.flow_tracker.convert(frame)
+            has_iris = self._track_landmarks(frame, gray)
+        else:
+            has_iris = self._detect_landmarks(frame)
         
-        if not results.multi_face_landmarks:
+        if has_iris is None:
             return None
-            
-        face_landmarks = results.multi_face_landmarks[0]
-        
-        # Extract eye landmarks
-        h, w, _ = frame.shape
-        landmark_points = []
+        landmarks = self._landmarks
         
-        for idx, landmark in enumerate(face_landmarks.landmark):
-            x, y = int(landmark.x * w), int(landmark.y * h)
-            landmark_points.append((x, y, landmark.z))
+        if self.roi_tracking:
+            self._update_face_roi(w, h)
         
-        # Get eye landmarks
-        left_eye = [landmark_points[i] for i in self.LEFT_EYE_INDICES]
-        right_eye = [landmark_points[i] for i in self.RIGHT_EYE_INDICES]
+        left_eye = landmarks[self._left_eye_rows]
+        right_eye = landmarks[self._right_eye_rows]
         
         # Get iris landmarks for more accurate pupil tracking
-        left_iris = [landmark_points[i] for i in self.LEFT_IRIS] if len(landmark_points) > 478 else None
-        right_iris = [landmark_points[i] for i in self.RIGHT_IRIS] if len(landmark_points) > 473 else None
+        left_iris = landmarks[self._left_iris_rows] if has_iris else None
+        right_iris = landmarks[self._right_iris_rows] if has_iris else None
         
-        # Calculate eye aspect ratio for blink detection
-        left_eye_top = landmark_points[self.LEFT_EYE_VERTICAL[0]]
-        left_eye_bottom = landmark_points[self.LEFT_EYE_VERTICAL[1]]
-        left_eye_height = self._calculate_distance(left_eye_top, left_eye_bottom)
-        
-        right_eye_top = landmark_points[self.RIGHT_EYE_VERTICAL[0]]
-        right_eye_bottom = landmark_points[self.RIGHT_EYE_VERTICAL[1]]
-        right_eye_height = self._calculate_distance(right_eye_top, right_eye_bottom)
-        
-        # Check blink state
-        current_time = time.time()
-        left_blink_info = self._check_blink_state(left_eye_height, self.left_eye_state, current_time, threshold=0.018)
-        right_blink_info = self._check_blink_state(right_eye_height, self.right_eye_state, current_time, threshold=0.018)
+        # Eye aspect ratios of both eyes in one pass, then blink classification
+        sample = self._sample
+        current_time = self.clock.time()
+        ears = eye_aspect_ratio(landmarks[self._eye_rows, :2].reshape(2, -1, 2))
+        self.blink_detector.update(current_time, ears, sample.left_blink, sample.right_blink)
         
         # Calculate eye centers
-        left_eye_center = self._calculate_eye_center(left_eye)
-        right_eye_center = self._calculate_eye_center(right_eye)
+        self._calculate_eye_center(left_eye, out=sample.left_eye_center)
+        self._calculate_eye_center(right_eye, out=sample.right_eye_center)
         
         # Calculate pupil positions - prefer iris landmarks if available
-        if left_iris and right_iris:
-            left_pupil = self._calculate_iris_center(left_iris, left_eye)
-            right_pupil = self._calculate_iris_center(right_iris, right_eye)
+        if left_iris is not None and right_iris is not None:
+            self._calculate_iris_center(left_iris, left_eye, out=sample.left_pupil)
+            self._calculate_iris_center(right_iris, right_eye, out=sample.right_pupil)
         else:
-            # Fallback to darkest point method
-            left_pupil = self._detect_pupil(frame, left_eye)
-            right_pupil = self._detect_pupil(frame, right_eye)
-        
-        # Optional: Draw visual debug indicators on frame
-        debug_frame = self._draw_debug_indicators(frame.copy(), left_eye, right_eye, 
-                                                 left_pupil, right_pupil, 
-                                                 left_blink_info, right_blink_info)
-        # Show debug frame
-        # cv2.imshow("Eye Tracking Debug", debug_frame)
-        # cv2.waitKey(1)
-        
-        # Calculate gaze direction
-        gaze_info = {
-            'left_eye_center': left_eye_center,
-            'right_eye_center': right_eye_center,
-            'left_pupil': left_pupil,
-            'right_pupil': right_pupil,
-            'left_blink': left_blink_info,
-            'right_blink': right_blink_info
-        }
-        
-        return gaze_info
+            # Fallback to darkest region method, converting to grayscale once for both eyes
+            if gray is None:
+                self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+                gray = self._gray
+            self._detect_pupil(gray, left_eye, out=sample.left_pupil)
+            self._detect_pupil(gray, right_eye, out=sample.right_pupil)
+        sample.has_pupils = True
+        
+        # How much this detection can be trusted when fusing several cameras
+        sample.confidence = self._estimate_confidence(left_eye, right_eye, has_iris)
+        sample.timestamp = current_time
+        sample.capture_time = self.capture_time if capture_time is None else capture_time
+        
+        # Optional: Hand the frame and overlay data to the debug sink
+        if self.debug_sink is not None:
+            self.debug_sink.submit(frame, build_overlay(left_eye, right_eye,
+                                                        sample.left_pupil, sample.right_pupil,
+                                                        sample.left_blink, sample.right_blink))
+        
+        return sample
+    
+    def _detect_landmarks(self, frame):
+        """Run FaceMesh and fill the landmark buffer.
+        
+        Returns whether iris landmarks are available, or None if no face was found.
+        """
+        # Process the frame (or the tracked face region) to detect face landmarks
+        has_iris, roi = self._process_face(frame)
+        if has_iris is None:
+            return None
+        
+        # Map the normalized landmarks to full-frame pixels
+        h, w = frame.shape[:2]
+        self._has_iris = has_iris
+        self._map_landmarks(w, h, roi, has_iris)
+        self._n_extracted_rows = self._n_base_rows + (len(self._iris_landmark_indices) if self._has_iris else 0)
+        return self._has_iris
+    
+    def _track_landmarks(self, frame, gray):
+        """Fill the landmark buffer from optical flow, running FaceMesh only on keyframes"""
+        if not self.flow_tracker.needs_keyframe():
+            points = self.flow_tracker.track(gray)
+            if points is not None:
+                # z keeps its keyframe value
+                self._landmarks[:self._n_extracted_rows, :2] = points
+                return self._has_iris
+        
+        has_iris = self._detect_landmarks(frame)
+        if has_iris is None:
+            self.flow_tracker.invalidate()
+            return None
+        
+        self.flow_tracker.reset(gray, self._landmarks[:self._n_extracted_rows, :2])
+        return has_iris
+    
+    def _process_face(self, frame):
+        """Run FaceMesh on the tracked face ROI, or the full frame when tracking is lost.
+        
+        Returns (has_iris, roi) where roi is the (x0, y0, x1, y1) region the
+        normalized landmarks in the buffer refer to, or (None, None) if no
+        face was found.
+        """
+        if self.roi_tracking and self._face_roi is not None:
+            x0, y0, x1, y1 = self._face_roi
+            has_iris = self._run_face_mesh(frame[y0:y1, x0:x1])
+            if has_iris is not None:
+                return has_iris, self._face_roi
+            
+            # Tracking lost - retry on the full frame
+            logger.debug("Face ROI lost, falling back to full frame")
+            self._face_roi = None
+        
+        has_iris = self._run_face_mesh(frame)
+        if has_iris is None:
+            return None, None
+        h, w = frame.shape[:2]
+        return has_iris, (0, 0, w, h)
+    
+    def _run_face_mesh(self, image):
+        """Downscale a BGR image, run FaceMesh on it and copy the normalized landmarks into the buffer.
+        
+        Returns whether iris landmarks are available, or None if no face was found.
+        """
+        if self.inference_width and image.shape[1] > self.inference_width:
+            scale = self.inference_width / image.shape[1]
+            image = cv2.resize(image, (self.inference_width, max(1, int(image.shape[0] * scale))),
+                               interpolation=cv2.INTER_AREA)
+        
+        if self.inference_worker is not None:
+            # The worker converts to RGB itself
+            with tracer.span("face_mesh.process"):
+                return self.inference_worker.process(np.ascontiguousarray(image), self._landmarks)
+        
+        # Convert to RGB for MediaPipe
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with tracer.span("face_mesh.process"):
+            results = self.face_mesh.process(rgb_image)
+        
+        if not results.multi_face_landmarks:
+            return None
+        return self._copy_landmarks(results.multi_face_landmarks[0].landmark)
+    
+    def _update_face_roi(self, width, height):
+        """Place the next inference ROI around the current face with padding"""
+        points = self._landmarks[:self._n_base_rows, :2]
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
+        pad_x = (max_x - min_x) * self.roi_padding
+        pad_y = (max_y - min_y) * self.roi_padding
+        
+        x0 = max(0, int(min_x - pad_x))
+        y0 = max(0, int(min_y - pad_y))
+        x1 = min(width, int(max_x + pad_x) + 1)
+        y1 = min(height, int(max_y + pad_y) + 1)
+        
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            self._face_roi = None
+        else:
+            self._face_roi = (x0, y0, x1, y1)
+    
+    def _extract_landmarks(self, landmarks, width, height, roi=None):
+        """Copy the tracked landmarks into the preallocated buffer in pixel space.
+        
+        Landmarks are normalized to roi (x0, y0, x1, y1), defaulting to the
+        full frame. Returns True if iris landmarks were available and extracted.
+        """
+        has_iris = self._copy_landmarks(landmarks)
+        self._map_landmarks(width, height, roi, has_iris)
+        return has_iris
+    
+    def _copy_landmarks(self, landmarks):
+        """Copy the tracked FaceMesh landmarks, still normalized, into the buffer"""
+        buf = self._landmarks
+        row = 0
+        for idx in self._base_landmark_indices:
+            lm = landmarks[idx]
+            buf[row, 0] = lm.x
+            buf[row, 1] = lm.y
+            buf[row, 2] = lm.z
+            row += 1
+        
+        # Iris landmarks (468-477) only exist with refine_landmarks=True
+        has_iris = len(landmarks) > max(self._iris_landmark_indices)
+        if has_iris:
+            for idx in self._iris_landmark_indices:
+                lm = landmarks[idx]
+                buf[row, 0] = lm.x
+                buf[row, 1] = lm.y
+                buf[row, 2] = lm.z
+                row += 1
+        return has_iris
+    
+    def _map_landmarks(self, width, height, roi=None, has_iris=True):
+        """Map the normalized landmarks in the buffer from roi to full-frame pixels"""
+        rows = self._n_base_rows + (len(self._iris_landmark_indices) if has_iris else 0)
+        if roi is None:
+            roi = (0, 0, width, height)
+        x0, y0, x1, y1 = roi
+        
+        # z is normalized to the image width, so rescale it to the full frame
+        self._landmark_scale[0] = x1 - x0
+        self._landmark_scale[1] = y1 - y0
+        self._landmark_scale[2] = (x1 - x0) / width
+        self._landmark_offset[0] = x0
+        self._landmark_offset[1] = y0
+        self._landmarks[:rows] *= self._landmark_scale
+        self._landmarks[:rows] += self._landmark_offset
+    
+    def _estimate_confidence(self, left_eye, right_eye, has_iris):
+        """Score a detection between 0 and 1.
+        
+        A head turned away from the camera foreshortens the far eye, so the
+        ratio of the two eye widths measures how frontal the view is. Pupils
+        from the darkest-region fallback are trusted less than iris landmarks.
+        """
+        left_width = self._calculate_distance(left_eye[0, :2], left_eye[3, :2])
+        right_width = self._calculate_distance(right_eye[0, :2], right_eye[3, :2])
+        widest = max(left_width, right_width)
+        if widest <= 0:
+            return 0.0
+        frontality = min(left_width, right_width) / widest
+        return frontality * (1.0 if has_iris else 0.6)
     
     def _calculate_distance(self, point1, point2):
-        return np.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2 + (point1[2] - point2[2])**2)
+        return float(np.linalg.norm(np.subtract(point1, point2)))
     
-    def _calculate_eye_center(self, eye_points):
-        x_coords = [p[0] for p in eye_points]
-        y_coords = [p[1] for p in eye_points]
-        return (int(np.mean(x_coords)), int(np.mean(y_coords)))
+    def _calculate_eye_center(self, eye_points, out=None):
+        """Fill out, a (2,) integer array, with the eye center; returns a tuple without out"""
+        center = np.asarray(eye_points)[:, :2].mean(axis=0)
+        if out is None:
+            return (int(center[0]), int(center[1]))
+        out[:] = center
+        return out
     
-    def _calculate_iris_center(self, iris_points, eye_points):
-        """Calculate iris center and relative position within eye region"""
-        iris_center_x = np.mean([p[0] for p in iris_points])
-        iris_center_y = np.mean([p[1] for p in iris_points])
+    def _calculate_iris_center(self, iris_points, eye_points, out=None):
+        """Calculate iris center and relative position within eye region into a PupilInfo"""
+        iris_center = np.asarray(iris_points)[:, :2].mean(axis=0)
         
         # Calculate eye region boundaries
-        min_x = min(p[0] for p in eye_points)
-        max_x = max(p[0] for p in eye_points)
-        min_y = min(p[1] for p in eye_points)
-        max_y = max(p[1] for p in eye_points)
+        eye_xy = np.asarray(eye_points)[:, :2]
+        eye_min = eye_xy.min(axis=0)
+        eye_max = eye_xy.max(axis=0)
+        eye_size = eye_max - eye_min
         
         # Calculate relative position (normalized between -1 and 1)
-        eye_width = max_x - min_x
-        eye_height = max_y - min_y
-        
-        if eye_width == 0 or eye_height == 0:
-            relative_x = 0
-            relative_y = 0
+        if eye_size[0] == 0 or eye_size[1] == 0:
+            relative = np.zeros(2)
         else:
-            eye_center_x = (min_x + max_x) / 2
-            eye_center_y = (min_y + max_y) / 2
-            
-            relative_x = 2 * (iris_center_x - eye_center_x) / eye_width
-            relative_y = 2 * (iris_center_y - eye_center_y) / eye_height
+            relative = 2 * (iris_center - (eye_min + eye_max) / 2) / eye_size
         
         # Amplify to make movements more pronounced
-        relative_x *= 2.0
-        relative_y *= 2.0
-        
-        return {
-            'position': (int(iris_center_x), int(iris_center_y)),
-            'relative_x': relative_x,
-            'relative_y': relative_y
-        }
+        relative *= 2.0
+        
+        if out is None:
+            out = PupilInfo()
+        return out.set(iris_center[0], iris_center[1], relative[0], relative[1])
     
-    def _detect_pupil(self, frame, eye_points):
-        """Detect pupil using the darkest point in the eye region"""
-        # Create a mask for the eye region
-        mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-        eye_points_2d = [(p[0], p[1]) for p in eye_points]
-        eye_points_2d = np.array(eye_points_2d, dtype=np.int32)
-        cv2.fillPoly(mask, [eye_points_2d], 255)
-        
-        # Extract the eye region
-        eye_roi = cv2.bitwise_and(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), mask=mask)
-        
-        # Apply GaussianBlur to reduce noise
-        eye_roi = cv2.GaussianBlur(eye_roi, (7, 7), 0)
-        
-        # Find the darkest point in the eye region (approximation of pupil)
-        min_val, _, min_loc, _ = cv2.minMaxLoc(eye_roi, mask=mask)
-        
-        # Calculate eye boundaries
-        min_x = min(p[0] for p in eye_points)
-        max_x = max(p[0] for p in eye_points)
-        min_y = min(p[1] for p in eye_points)
-        max_y = max(p[1] for p in eye_points)
-        
-        # Calculate eye center
-        eye_center_x = (min_x + max_x) / 2
-        eye_center_y = (min_y + max_y) / 2
-        
-        # Calculate relative positions
-        eye_width = max_x - min_x
-        eye_height = max_y - min_y
-        
-        if eye_width == 0 or eye_height == 0:
-            relative_x = 0
-            relative_y = 0
-        else:
-            relative_x = 2 * (min_loc[0] - eye_center_x) / eye_width
-            relative_y = 2 * (min_loc[1] - eye_center_y) / eye_height
-            
-        # Amplify to make movements more pronounced
-        relative_x *= 2.0
-        relative_y *= 2.0
-        
-        return {
-            'position': min_loc,
-            'relative_x': relative_x,
-            'relative_y': relative_y
-        }
+    def _detect_pupil(self, gray, eye_points, out=None):
+        """Detect pupil using the darkest region inside the eye bounding box"""
+        return self.pupil_detector.detect(gray, eye_points, out=out)
     
-    def _check_blink_state(self, eye_height, eye_state, current_time, threshold=0.018):
-        """Check if the eye is blinking and what type of blink it is"""
-        # Determine if eye is closed based on height threshold
-        is_closed = eye_height < threshold
-        
-        # Update state tracking
-        blink_info = {
-            'is_closed': is_closed,
-            'duration': 0,
-            'blink_detected': False,
-            'long_blink': False,
-            'double_blink': False
-        }
-        
-        if is_closed and not eye_state['closed']:
-            # Eye just closed
-            eye_state['closed'] = True
-            eye_state['closed_time'] = current_time
-        elif not is_closed and eye_state['closed']:
-            # Eye just opened - completed a blink
-            eye_state['closed'] = False
-            blink_duration = current_time - eye_state['closed_time']
-            
-            # Check if it's a long blink (≥1 second)
-            if blink_duration >= 1.0:
-                blink_info['long_blink'] = True
-                logger.debug(f"Long blink detected: {blink_duration:.2f}s")
-            
-            # Check if it's a double blink (two blinks within 0.5 seconds)
-            if current_time - eye_state['last_blink'] < 0.5:
-                blink_info['double_blink'] = True
-                logger.debug("Double blink detected")
-            
-            eye_state['last_blink'] = current_time
-            blink_info['blink_detected'] = True
-            blink_info['duration'] = blink_duration
-        
-        # If still closed, update the current duration
-        if is_closed:
-            blink_info['duration'] = current_time - eye_state['closed_time']
-            
-        return blink_info
+    def get_capture_stats(self):
+        """Return dropped/stale frame counters for threaded capture"""
+        if self.capture_thread is None:
+            return None
+        return self.capture_thread.buffer.get_stats()
     
-    def _draw_debug_indicators(self, frame, left_eye, right_eye, left_pupil, right_pupil, left_blink, right_blink):
-        """Draw debug indicators on the frame for visualization"""
-        # Draw eye regions
-        left_eye_points = np.array([(p[0], p[1]) for p in left_eye], dtype=np.int32)
-        right_eye_points = np.array([(p[0], p[1]) for p in right_eye], dtype=np.int32)
-        
-        cv2.polylines(frame, [left_eye_points], True, (0, 255, 0), 1)
-        cv2.polylines(frame, [right_eye_points], True, (0, 255, 0), 1)
-        
-        # Draw pupils
-        if left_pupil:
-            cv2.circle(frame, left_pupil['position'], 3, (0, 0, 255), -1)
-        if right_pupil:
-            cv2.circle(frame, right_pupil['position'], 3, (0, 0, 255), -1)
-        
-        # Add gaze direction text
-        if left_pupil and right_pupil:
-            gaze_text = f"Gaze: L({left_pupil['relative_x']:.2f}, {left_pupil['relative_y']:.2f}), " \
-                        f"R({right_pupil['relative_x']:.2f}, {right_pupil['relative_y']:.2f})"
-            cv2.putText(frame, gaze_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        # Add blink status
-        left_status = "Closed" if left_blink['is_closed'] else "Open"
-        right_status = "Closed" if right_blink['is_closed'] else "Open"
-        
-        cv2.putText(frame, f"Left: {left_status}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        cv2.putText(frame, f"Right: {right_status}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        return frame
+    def get_camera_health(self):
+        """Return the supervisor's state, outage count and downtime"""
+        return self.supervisor.get_stats()
     
     def release(self):
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
-        self.face_mesh.close()
+        self._closed = True
+        self.supervisor.stop()
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+            self.capture_thread = None
+        if self.debug_sink is not None:
+            self.debug_sink.stop()
+        self.source.release()
+        if self.inference_worker is not None:
+            self.inference_worker.stop()
+        if self.face_mesh is not None:
+            self.face_mesh.close()
         cv2.destroyAllWindows()
         logger.info("Eye tracker resources released")
\ No newline at end of file
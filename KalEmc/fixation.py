@@ -0,0 +1,122 @@
+"""
+Streaming fixation and saccade classification of the pointer target.
+
+While the user fixates, the gaze keeps wandering over a small area
+(tremor, drift, micro-saccades and tracking noise) and moving the pointer
+along with it only makes click targets shake. FixationDetector combines
+the two classic rules, each O(1) per sample:
+
+    I-DT  samples within dispersion of the running fixation centroid
+          belong to the fixation and hold the pointer, however fast the
+          noise makes them jump
+    I-VT  a sample outside it that moved faster than saccade_velocity is a
+          saccade and moves the pointer at once; slower ones are smooth
+          pursuit or drift, and move it once min_exit_samples in a row
+          have left the fixation
+
+Once a fixation has lasted settle_time, the pointer moves once more to its
+centroid, which is steadier than the sample the saccade landed on.
+Positions are fractions of the screen (0..1 on both axes).
+"""
+
+import math
+
+from KalEmc.smoothing import DEFAULT_INTERVAL
+
+FIXATION = 'fixation'
+SACCADE = 'saccade'
+PURSUIT = 'pursuit'
+
+class FixationDetector:
+    def __init__(self, dispersion=0.05, saccade_velocity=2.0, min_exit_samples=2, settle_time=0.1,
+                 max_centroid_samples=30):
+        self.dispersion = dispersion
+        self.saccade_velocity = saccade_velocity
+        self.min_exit_samples = min_exit_samples
+        self.settle_time = settle_time
+        # Beyond this many samples the centroid becomes a moving average,
+        # so it follows slow drift within a long fixation
+        self.max_centroid_samples = max_centroid_samples
+
+        # Where the pointer should be after the last update that returned True
+        self.x = 0.0
+        self.y = 0.0
+        self.counts = {FIXATION: 0, SACCADE: 0, PURSUIT: 0}
+        self.moves = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the current fixation; the next sample moves the pointer"""
+        self.state = None
+        self._last_x = self._last_y = None
+        self._last_time = None
+        self._centroid_x = self._centroid_y = 0.0
+        self._centroid_samples = 0
+        self._fixation_start = 0.0
+        self._settled = False
+        self._exit_samples = 0
+
+    def _anchor(self, x, y, timestamp):
+        self._centroid_x = x
+        self._centroid_y = y
+        self._centroid_samples = 1
+        self._fixation_start = timestamp
+        self._settled = False
+        self._exit_samples = 0
+
+    def _move(self, state, x, y):
+        self.state = state
+        self.counts[state] += 1
+        self.x = x
+        self.y = y
+        self.moves += 1
+        return True
+
+    def update(self, x, y, timestamp):
+        """Classify one sample; returns True when the pointer should move to (self.x, self.y)"""
+        last_x, last_y, last_time = self._last_x, self._last_y, self._last_time
+        self._last_x, self._last_y, self._last_time = x, y, timestamp
+        if last_x is None:
+            self._anchor(x, y, timestamp)
+            return self._move(SACCADE, x, y)
+
+        if math.hypot(x - self._centroid_x, y - self._centroid_y) > self.dispersion:
+            dt = timestamp - last_time
+            if dt <= 0:
+                dt = DEFAULT_INTERVAL
+            if math.hypot(x - last_x, y - last_y) / dt >= self.saccade_velocity:
+                self._anchor(x, y, timestamp)
+                return self._move(SACCADE, x, y)
+
+            self._exit_samples += 1
+            if self._exit_samples >= self.min_exit_samples:
+                self._anchor(x, y, timestamp)
+                return self._move(PURSUIT, x, y)
+            # A single stray sample does not end the fixation
+            self.state = FIXATION
+            self.counts[FIXATION] += 1
+            return False
+
+        # Still fixating: fold the sample into the centroid
+        self._exit_samples = 0
+        if self._centroid_samples < self.max_centroid_samples:
+            self._centroid_samples += 1
+        weight = 1.0 / self._centroid_samples
+        self._centroid_x += (x - self._centroid_x) * weight
+        self._centroid_y += (y - self._centroid_y) * weight
+        self.state = FIXATION
+        self.counts[FIXATION] += 1
+
+        if not self._settled and timestamp - self._fixation_start >= self.settle_time:
+            self._settled = True
+            self.moves += 1
+            self.x = self._centroid_x
+            self.y = self._centroid_y
+            return True
+        return False
+
+    def get_stats(self):
+        """Samples per class and pointer moves, as a dictionary"""
+        stats = dict(self.counts)
+        stats['moves'] = self.moves
+        return stats
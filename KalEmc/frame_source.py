@@ -0,0 +1,262 @@
+import logging
+import os
+import platform
+import time
+
+import cv2
+
+from KalEmc.camera_probe import apply_camera_mode, get_camera_mode
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+class FrameSource:
+    """Base class for anything EyeTracker can read frames from.
+
+    read() follows the cv2.VideoCapture convention and returns (ret, frame).
+    After a successful read, capture_time holds the time.monotonic() time at
+    which that frame was captured, or 0.0 if the source cannot tell.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.exhausted = False  # Set once a finite source has no more frames
+        self.capture_time = 0.0
+
+    def open(self):
+        raise NotImplementedError
+
+    def is_opened(self):
+        raise NotImplementedError
+
+    def read(self):
+        raise NotImplementedError
+
+    def get_frame_size(self):
+        raise NotImplementedError
+
+    def is_present(self):
+        """Whether the underlying device or file exists, as far as can be told"""
+        return True
+
+    def release(self):
+        pass
+
+class _Pacer:
+    """Sleeps so that frames are delivered at a given rate"""
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0
+        self._next_time = None
+
+    def reset(self):
+        self._next_time = None
+
+    def wait(self):
+        now = time.monotonic()
+        if self._next_time is None:
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        else:
+            # Fell behind; do not try to catch up with a burst of frames
+            self._next_time = now
+        self._next_time += self.interval
+
+class CameraSource(FrameSource):
+    """Live webcam via cv2.VideoCapture.
+
+    With auto_mode the pixel format, resolution, frame rate and buffer size
+    come from the camera probe (cached per device) instead of width, height
+    and fps.
+    """
+    def __init__(self, camera_id=0, width=640, height=480, fps=30, auto_mode=False):
+        super().__init__(f"camera {camera_id}")
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.auto_mode = auto_mode
+        self.mode = None
+        self.cap = None
+
+    def open(self):
+        self.release()
+        if self.auto_mode and self.mode is None:
+            # Probing opens the device itself, so do it before opening here
+            self.mode = get_camera_mode(self.camera_id)
+
+        self.cap = cv2.VideoCapture(self.camera_id)
+        if not self.cap.isOpened():
+            return False
+
+        if self.mode is not None:
+            apply_camera_mode(self.cap, self.mode)
+        else:
+            # Set camera properties for better performance
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        return True
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if ret:
+            self.capture_time = self._frame_timestamp()
+        return ret, frame
+
+    def _frame_timestamp(self):
+        """Capture time of the frame just read, on the time.monotonic() clock.
+
+        V4L2 reports the driver's buffer timestamp, taken on CLOCK_MONOTONIC
+        when the frame arrived, as CAP_PROP_POS_MSEC. Other backends report
+        stream positions instead, so the value is only trusted when it is a
+        plausible recent monotonic time; otherwise the time the read returned
+        is used, which also counts decode time.
+        """
+        now = time.monotonic()
+        try:
+            position = float(self.cap.get(cv2.CAP_PROP_POS_MSEC)) / 1000
+        except (TypeError, ValueError):
+            return now
+        if 0 <= now - position < 1.0:
+            return position
+        return now
+
+    def is_present(self):
+        # V4L2 device nodes disappear on USB unplug; elsewhere there is no cheap check
+        if platform.system() == "Linux" and isinstance(self.camera_id, int):
+            return os.path.exists(f"/dev/video{self.camera_id}")
+        return True
+
+    def get_frame_size(self):
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def release(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+
+class VideoFileSource(FrameSource):
+    """Replay a recorded video file, at recorded pace or as fast as possible"""
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(f"video {path}")
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = None
+        self._pacer = None
+
+    def open(self):
+        self.release()
+        if not os.path.isfile(self.path):
+            logger.error(f"Video file not found: {self.path}")
+            return False
+
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self._pacer = _Pacer(fps) if self.realtime else None
+        self.exhausted = False
+        return True
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        if self.exhausted:
+            return False, None
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.exhausted = True
+            return False, None
+
+        if self._pacer is not None:
+            self._pacer.wait()
+        self.capture_time = time.monotonic()
+        return True, frame
+
+    def get_frame_size(self):
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def release(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+
+class ImageSequenceSource(FrameSource):
+    """Replay a directory of images in file name order"""
+    def __init__(self, directory, fps=30, realtime=False, loop=False):
+        super().__init__(f"images {directory}")
+        self.directory = directory
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.files = []
+        self.index = 0
+        self._frame_size = (0, 0)
+        self._pacer = None
+
+    def open(self):
+        if not os.path.isdir(self.directory):
+            logger.error(f"Image directory not found: {self.directory}")
+            return False
+
+        self.files = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            logger.error(f"No images found in {self.directory}")
+            return False
+
+        first = cv2.imread(self.files[0])
+        if first is None:
+            return False
+        self._frame_size = (first.shape[1], first.shape[0])
+
+        self.index = 0
+        self.exhausted = False
+        self._pacer = _Pacer(self.fps) if self.realtime else None
+        return True
+
+    def is_opened(self):
+        return bool(self.files)
+
+    def read(self):
+        if self.index >= len(self.files):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.index = 0
+
+        frame = cv2.imread(self.files[self.index])
+        self.index += 1
+        if frame is None:
+            logger.error(f"Could not read image {self.files[self.index - 1]}")
+            return False, None
+
+        if self._pacer is not None:
+            self._pacer.wait()
+        self.capture_time = time.monotonic()
+        return True, frame
+
+    def get_frame_size(self):
+        return self._frame_size
+
+    def release(self):
+        self.files = []
+
+def create_frame_source(spec, realtime=False, loop=False):
+    """Create a FrameSource from a camera index, video file path or image directory"""
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
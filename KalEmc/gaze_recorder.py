@@ -0,0 +1,258 @@
+"""
+Compact binary recording and replay of the per-frame gaze sample stream.
+
+A recording is a 16-byte header followed by fixed-width little-endian
+records (RECORD_DTYPE), so it can be memory-mapped and replayed through
+GestureController far faster than real time using a ManualClock.
+Samples are written from and read back into GazeSample objects.
+"""
+
+import argparse
+import logging
+import struct
+import time
+
+import numpy as np
+
+from KalEmc.clock import ManualClock
+from KalEmc.gaze_sample import GazeSample
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'KEGAZE01'
+VERSION = 1
+HEADER = struct.Struct('<8sII')  # magic, version, record size
+
+# Blink flag bits
+CLOSED = 1
+BLINK_DETECTED = 2
+LONG_BLINK = 4
+DOUBLE_BLINK = 8
+WINK = 16
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('has_pupils', 'u1'),
+    ('left_blink_flags', 'u1'),
+    ('right_blink_flags', 'u1'),
+    ('reserved', 'u1'),
+    ('left_blink_duration', '<f4'),
+    ('right_blink_duration', '<f4'),
+    ('left_eye_center', '<i4', (2,)),
+    ('right_eye_center', '<i4', (2,)),
+    ('left_pupil_position', '<i4', (2,)),
+    ('right_pupil_position', '<i4', (2,)),
+    ('left_pupil_relative', '<f4', (2,)),
+    ('right_pupil_relative', '<f4', (2,)),
+])
+
+def _pack_blink(blink_info):
+    flags = 0
+    if blink_info.is_closed:
+        flags |= CLOSED
+    if blink_info.blink_detected:
+        flags |= BLINK_DETECTED
+    if blink_info.long_blink:
+        flags |= LONG_BLINK
+    if blink_info.double_blink:
+        flags |= DOUBLE_BLINK
+    if blink_info.wink:
+        flags |= WINK
+    return flags
+
+def _unpack_blink(flags, duration, blink_info):
+    blink_info.is_closed = bool(flags & CLOSED)
+    blink_info.duration = float(duration)
+    blink_info.blink_detected = bool(flags & BLINK_DETECTED)
+    blink_info.long_blink = bool(flags & LONG_BLINK)
+    blink_info.double_blink = bool(flags & DOUBLE_BLINK)
+    blink_info.wink = bool(flags & WINK)
+
+class GazeRecorder:
+    """Append GazeSample records to a recording file"""
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+        logger.info(f"Recording gaze samples to {path}")
+
+    def write(self, sample, timestamp=None):
+        if timestamp is None:
+            timestamp = sample.timestamp
+
+        rec = self._record[0]
+        rec['timestamp'] = timestamp
+        rec['left_blink_flags'] = _pack_blink(sample.left_blink)
+        rec['right_blink_flags'] = _pack_blink(sample.right_blink)
+        rec['left_blink_duration'] = sample.left_blink.duration
+        rec['right_blink_duration'] = sample.right_blink.duration
+        rec['left_eye_center'] = sample.left_eye_center
+        rec['right_eye_center'] = sample.right_eye_center
+
+        rec['has_pupils'] = 1 if sample.has_pupils else 0
+        if sample.has_pupils:
+            left_pupil = sample.left_pupil
+            right_pupil = sample.right_pupil
+            rec['left_pupil_position'] = (left_pupil.x, left_pupil.y)
+            rec['right_pupil_position'] = (right_pupil.x, right_pupil.y)
+            rec['left_pupil_relative'] = (left_pupil.relative_x, left_pupil.relative_y)
+            rec['right_pupil_relative'] = (right_pupil.relative_x, right_pupil.relative_y)
+        else:
+            rec['left_pupil_position'] = 0
+            rec['right_pupil_position'] = 0
+            rec['left_pupil_relative'] = 0
+            rec['right_pupil_relative'] = 0
+
+        self._file.write(self._record.tobytes())
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"Recorded {self.count} gaze samples to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class GazeRecording:
+    """Memory-mapped, read-only view of a recording file"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a gaze recording")
+
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a gaze recording")
+        if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Unsupported gaze recording version {version} in {path}")
+
+        try:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size)
+        except ValueError:
+            # np.memmap refuses empty files
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records['timestamp']
+
+    @property
+    def duration(self):
+        if len(self.records) < 2:
+            return 0.0
+        return float(self.records['timestamp'][-1] - self.records['timestamp'][0])
+
+    def sample(self, index, out=None):
+        """Fill out, a GazeSample, from one record; a new sample is created if out is None"""
+        rec = self.records[index]
+        if out is None:
+            out = GazeSample()
+        out.timestamp = float(rec['timestamp'])
+        out.capture_time = 0.0  # Not recorded; replays report no capture latency
+        out.left_eye_center[:] = rec['left_eye_center']
+        out.right_eye_center[:] = rec['right_eye_center']
+        _unpack_blink(rec['left_blink_flags'], rec['left_blink_duration'], out.left_blink)
+        _unpack_blink(rec['right_blink_flags'], rec['right_blink_duration'], out.right_blink)
+
+        out.has_pupils = bool(rec['has_pupils'])
+        if out.has_pupils:
+            for pupil, side in ((out.left_pupil, 'left'), (out.right_pupil, 'right')):
+                position = rec[f'{side}_pupil_position']
+                relative = rec[f'{side}_pupil_relative']
+                pupil.set(position[0], position[1], relative[0], relative[1])
+        return out
+
+    def __iter__(self):
+        """Yield every record into one reused GazeSample"""
+        sample = GazeSample()
+        for index in range(len(self.records)):
+            yield self.sample(index, sample)
+
+class CountingMouseController:
+    """Stand-in MouseController that counts injected events instead of moving the pointer"""
+    def __init__(self, screen_width=1920, screen_height=1080):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.counts = {'move_to': 0, 'left_click': 0, 'right_click': 0, 'double_click': 0, 'scroll': 0}
+        self.last_position = None
+
+    def get_screen_size(self):
+        return self.screen_width, self.screen_height
+
+    def move_to(self, x, y, capture_time=None):
+        self.counts['move_to'] += 1
+        self.last_position = (x, y)
+        return True
+
+    def left_click(self):
+        self.counts['left_click'] += 1
+        return True
+
+    def right_click(self):
+        self.counts['right_click'] += 1
+        return True
+
+    def double_click(self):
+        self.counts['double_click'] += 1
+        return True
+
+    def scroll(self, amount):
+        self.counts['scroll'] += 1
+        return True
+
+def replay(recording, gesture_controller, clock):
+    """Push every recorded sample through a GestureController as fast as possible.
+
+    The controller must have been created with the given ManualClock so that
+    blink timing follows the recorded timestamps. Returns the sample count.
+    """
+    count = 0
+    for sample in recording:
+        clock.set(sample.timestamp)
+        gesture_controller.process_eye_data(sample)
+        count += 1
+    return count
+
+def main():
+    from KalEmc.gesture_controller import GestureController
+    from KalEmc.smoothing import parse_smoothing
+
+    parser = argparse.ArgumentParser(description="Replay a gaze recording through the gesture controller")
+    parser.add_argument("recording", help="Path to a gaze recording file")
+    parser.add_argument("--sensitivity", type=float, default=20)
+    parser.add_argument("--smoothing", type=parse_smoothing, default=0.5,
+                        help="EMA weight of the previous output, or one of none, ema, one_euro, kalman")
+    parser.add_argument("--no-fixation", action="store_true",
+                        help="Move on every sample instead of holding the pointer during fixations")
+    args = parser.parse_args()
+
+    recording = GazeRecording(args.recording)
+    clock = ManualClock()
+    mouse = CountingMouseController()
+    controller = GestureController(mouse, sensitivity=args.sensitivity, smoothing=args.smoothing, clock=clock,
+                                   fixation_detection=not args.no_fixation)
+
+    start = time.perf_counter()
+    count = replay(recording, controller, clock)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {count} samples ({recording.duration:.1f}s recorded) in {elapsed:.2f}s")
+    for name, value in mouse.counts.items():
+        print(f"  {name}: {value}")
+    if controller.fixation_detector is not None:
+        stats = controller.fixation_detector.get_stats()
+        print(f"  samples: {stats['fixation']} fixation, {stats['saccade']} saccade, {stats['pursuit']} pursuit")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Per-frame data model for the tracking pipeline.
+
+GazeSample, PupilInfo and BlinkInfo use __slots__ and are meant to be
+allocated once and refilled every frame, so the hot path does not create
+dictionaries or tuples. A sample handed out by the pipeline is overwritten
+by the next frame; use copy_from() to keep one.
+"""
+
+import numpy as np
+
+class PupilInfo:
+    """Pupil position in frame pixels and relative to the eye box center"""
+    __slots__ = ('x', 'y', 'relative_x', 'relative_y')
+
+    def __init__(self, x=0, y=0, relative_x=0.0, relative_y=0.0):
+        self.x = x
+        self.y = y
+        self.relative_x = relative_x
+        self.relative_y = relative_y
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+    def set(self, x, y, relative_x, relative_y):
+        self.x = int(x)
+        self.y = int(y)
+        self.relative_x = float(relative_x)
+        self.relative_y = float(relative_y)
+        return self
+
+    def copy_from(self, other):
+        self.x = other.x
+        self.y = other.y
+        self.relative_x = other.relative_x
+        self.relative_y = other.relative_y
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, PupilInfo):
+            return NotImplemented
+        return (self.x == other.x and self.y == other.y and
+                self.relative_x == other.relative_x and self.relative_y == other.relative_y)
+
+    def __repr__(self):
+        return f"PupilInfo(x={self.x}, y={self.y}, relative_x={self.relative_x:.3f}, relative_y={self.relative_y:.3f})"
+
+class BlinkInfo:
+    """Blink state of one eye for one frame; wink means only this eye is closed"""
+    __slots__ = ('is_closed', 'duration', 'blink_detected', 'long_blink', 'double_blink', 'wink')
+
+    def __init__(self, is_closed=False, duration=0.0, blink_detected=False, long_blink=False, double_blink=False,
+                 wink=False):
+        self.is_closed = is_closed
+        self.duration = duration
+        self.blink_detected = blink_detected
+        self.long_blink = long_blink
+        self.double_blink = double_blink
+        self.wink = wink
+
+    def reset(self):
+        self.is_closed = False
+        self.duration = 0.0
+        self.blink_detected = False
+        self.long_blink = False
+        self.double_blink = False
+        self.wink = False
+        return self
+
+    def clear_events(self):
+        """Clear the one-shot events, keeping the eye's closed/wink state"""
+        self.blink_detected = False
+        self.long_blink = False
+        self.double_blink = False
+        return self
+
+    def copy_from(self, other):
+        self.is_closed = other.is_closed
+        self.duration = other.duration
+        self.blink_detected = other.blink_detected
+        self.long_blink = other.long_blink
+        self.double_blink = other.double_blink
+        self.wink = other.wink
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, BlinkInfo):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"BlinkInfo({fields})"
+
+class GazeSample:
+    """Everything the gesture layer needs from one tracked frame.
+
+    timestamp is when the sample was produced; capture_time is when its frame
+    was captured (0.0 if unknown), both on the tracker's monotonic clock.
+    """
+    __slots__ = ('timestamp', 'capture_time', 'left_eye_center', 'right_eye_center', 'left_pupil', 'right_pupil',
+                 'has_pupils', 'left_blink', 'right_blink', 'confidence')
+
+    def __init__(self):
+        self.timestamp = 0.0
+        self.capture_time = 0.0
+        self.left_eye_center = np.zeros(2, dtype=np.int32)
+        self.right_eye_center = np.zeros(2, dtype=np.int32)
+        self.left_pupil = PupilInfo()
+        self.right_pupil = PupilInfo()
+        self.has_pupils = False
+        self.left_blink = BlinkInfo()
+        self.right_blink = BlinkInfo()
+        self.confidence = 0.0
+
+    def copy_from(self, other):
+        self.timestamp = other.timestamp
+        self.capture_time = other.capture_time
+        self.left_eye_center[:] = other.left_eye_center
+        self.right_eye_center[:] = other.right_eye_center
+        self.left_pupil.copy_from(other.left_pupil)
+        self.right_pupil.copy_from(other.right_pupil)
+        self.has_pupils = other.has_pupils
+        self.left_blink.copy_from(other.left_blink)
+        self.right_blink.copy_from(other.right_blink)
+        self.confidence = other.confidence
+        return self
+
+    def copy(self):
+        return GazeSample().copy_from(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, GazeSample):
+            return NotImplemented
+        return (self.timestamp == other.timestamp and
+                self.capture_time == other.capture_time and
+                np.array_equal(self.left_eye_center, other.left_eye_center) and
+                np.array_equal(self.right_eye_center, other.right_eye_center) and
+                self.has_pupils == other.has_pupils and
+                (not self.has_pupils or (self.left_pupil == other.left_pupil and
+                                         self.right_pupil == other.right_pupil)) and
+                self.left_blink == other.left_blink and
+                self.right_blink == other.right_blink and
+                self.confidence == other.confidence)
+
+    def __repr__(self):
+        return (f"GazeSample(timestamp={self.timestamp:.3f}, left_pupil={self.left_pupil!r}, "
+                f"right_pupil={self.right_pupil!r}, left_blink={self.left_blink!r}, "
+                f"right_blink={self.right_blink!r}, confidence={self.confidence:.2f})")
@@ -1,24 +1,47 @@
 import logging
-import time
 import numpy as np
+from KalEmc.clock import SystemClock
+from KalEmc.fixation import FixationDetector
+from KalEmc.latency import LatencyMonitor
+from KalEmc.smoothing import create_filter
+from KalEmc.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Seconds after a gesture fires during which the same gesture is ignored
+DEFAULT_REFRACTORY_PERIODS = {
+    'left_click': 0.0,
+    'right_click': 0.5,
+    'double_click': 0.5,
+    'scroll': 0.0
+}
+
 class GestureController:
-    def __init__(self, mouse_controller, sensitivity=20, smoothing=0.5):
+    def __init__(self, mouse_controller, sensitivity=20, smoothing=0.5, clock=None, refractory_periods=None,
+                 smoothing_params=None, fixation_detection=True, fixation_params=None):
         self.mouse_controller = mouse_controller
+        self.clock = clock if clock is not None else SystemClock()
         self.sensitivity = sensitivity  # Increased sensitivity
-        self.smoothing = smoothing      # Reduced smoothing for more responsive movement
         
-        # Previous eye positions for smoothing
-        self.prev_left_pupil = None
-        self.prev_right_pupil = None
+        # Gaze filter: a number is the EMA weight of the previous output,
+        # or name one of 'ema', 'one_euro', 'kalman', 'none'
+        self.smoothing_params = smoothing_params or {}
+        self.smoothing = smoothing
+        self._gaze = np.zeros(2, dtype=np.float64)
         
         # Blink tracking
         self.last_blink_time = 0
         self.blink_count = 0
         self.double_blink_threshold = 0.5  # Time window for double blink detection
         
+        # Per-gesture refractory periods; repeats are dropped by timestamp so
+        # gaze processing never stops
+        self.refractory_periods = dict(DEFAULT_REFRACTORY_PERIODS)
+        if refractory_periods:
+            self.refractory_periods.update(refractory_periods)
+        self._refractory_until = {}
+        self.suppressed_gestures = 0
+        
         # Screen dimensions
         self.screen_width, self.screen_height = self.mouse_controller.get_screen_size()
         
@@ -28,12 +51,31 @@ class GestureController:
         self.range_x = 0.5  # Reduced range means smaller eye movements create larger cursor movements
         self.range_y = 0.5
         
+        # Fitted multi-point calibration; replaces center/range when set
+        self.gaze_mapping = None
+        self._screen_point = np.zeros(2, dtype=np.float64)
+        
+        # Holds the pointer during fixations; moves only on saccades and pursuit
+        self.fixation_detector = FixationDetector(**(fixation_params or {})) if fixation_detection else None
+        
         # Debug info
         self.last_norm_x = 0
         self.last_norm_y = 0
         
+        # Latency from frame capture to detection and to the injected move
+        self.latency = LatencyMonitor()
+        
         logger.info("Gesture controller initialized")
         
+    @property
+    def smoothing(self):
+        return self._smoothing
+    
+    @smoothing.setter
+    def smoothing(self, value):
+        self._smoothing = value
+        self.gaze_filter = create_filter(value, **self.smoothing_params)
+        
     def calibrate(self, center_x=0, center_y=0, range_x=0.5, range_y=0.5):
         """Update calibration parameters for mapping eye positions to screen coordinates"""
         self.center_x = center_x
@@ -41,11 +83,40 @@ class GestureController:
         self.range_x = range_x
         self.range_y = range_y
         logger.info(f"Calibration updated: center=({center_x}, {center_y}), range=({range_x}, {range_y})")
+    
+    def set_gaze_mapping(self, mapping):
+        """Use a fitted GazeMapping (see calibration.py), or None for center/range calibration"""
+        self.gaze_mapping = mapping
+        self.gaze_filter.reset()
+        if self.fixation_detector is not None:
+            self.fixation_detector.reset()
+        logger.info(f"Gaze mapping set to {type(mapping).__name__ if mapping else 'center/range'}")
+    
+    def gaze_signal(self, eye_data, out=None):
+        """Unsmoothed (x, y) gaze of both eyes, the input of calibration and smoothing"""
+        if out is None:
+            out = np.empty(2, dtype=np.float64)
+        # Average the two eyes with some base amplification
+        out[0] = (eye_data.left_pupil.relative_x + eye_data.right_pupil.relative_x) * 1.5
+        out[1] = (eye_data.left_pupil.relative_y + eye_data.right_pupil.relative_y) * 1.5
+        return out
+        
+    def _gesture_ready(self, gesture, current_time):
+        """Whether gesture may fire now; if so, start its refractory period"""
+        if current_time < self._refractory_until.get(gesture, float('-inf')):
+            self.suppressed_gestures += 1
+            logger.debug(f"{gesture} suppressed during refractory period")
+            return False
+        self._refractory_until[gesture] = current_time + self.refractory_periods.get(gesture, 0.0)
+        return True
         
     def process_eye_data(self, eye_data):
-        """Process eye tracking data and convert to mouse actions"""
+        """Process a GazeSample and convert it to mouse actions"""
         if not eye_data:
             return
+        
+        if eye_data.capture_time > 0:
+            self.latency.record('capture_to_detect', eye_data.timestamp - eye_data.capture_time)
             
         # Process blinks first
         self._process_blinks(eye_data)
@@ -55,70 +126,62 @@ class GestureController:
         
     def _process_blinks(self, eye_data):
         """Handle blink-based mouse events"""
-        left_blink = eye_data.get('left_blink', {})
-        right_blink = eye_data.get('right_blink', {})
-        current_time = time.time()
+        left_blink = eye_data.left_blink
+        right_blink = eye_data.right_blink
+        current_time = self.clock.time()
         
         # Handle left eye long blink (right click)
-        if left_blink.get('long_blink', False):
-            logger.debug("Long blink detected - Right click")
-            self.mouse_controller.right_click()
-            time.sleep(0.5)  # Prevent immediate re-detection
+        if left_blink.long_blink:
+            if self._gesture_ready('right_click', current_time):
+                logger.debug("Long blink detected - Right click")
+                self.mouse_controller.right_click()
             
         # Handle left eye double blink (double click)
-        elif left_blink.get('double_blink', False):
-            logger.debug("Double blink detected - Double click")
-            self.mouse_controller.double_click()
-            time.sleep(0.5)  # Prevent immediate re-detection
+        elif left_blink.double_blink:
+            if self._gesture_ready('double_click', current_time):
+                logger.debug("Double blink detected - Double click")
+                self.mouse_controller.double_click()
             
         # Handle single blink (left click)
-        elif left_blink.get('blink_detected', False) and not right_blink.get('blink_detected', False):
+        elif left_blink.blink_detected and not right_blink.blink_detected:
             # Only consider it a single click if it's not part of a double click sequence
-            if current_time - self.last_blink_time > self.double_blink_threshold:
+            if (current_time - self.last_blink_time > self.double_blink_threshold and
+                    self._gesture_ready('left_click', current_time)):
                 logger.debug("Single blink detected - Left click")
                 self.mouse_controller.left_click()
                 
             self.last_blink_time = current_time
             
-        # Handle left wink (scroll up)
-        if not left_blink.get('is_closed', False) and right_blink.get('is_closed', False):
-            logger.debug("Right wink detected - Scroll down")
-            self.mouse_controller.scroll(-2)  # Negative values scroll down
-            
         # Handle right wink (scroll down)
-        elif left_blink.get('is_closed', False) and not right_blink.get('is_closed', False):
-            logger.debug("Left wink detected - Scroll up")
-            self.mouse_controller.scroll(2)  # Positive values scroll up
+        if right_blink.wink:
+            if self._gesture_ready('scroll', current_time):
+                logger.debug("Right wink detected - Scroll down")
+                self.mouse_controller.scroll(-2)  # Negative values scroll down
+            
+        # Handle left wink (scroll up)
+        elif left_blink.wink:
+            if self._gesture_ready('scroll', current_time):
+                logger.debug("Left wink detected - Scroll up")
+                self.mouse_controller.scroll(2)  # Positive values scroll up
             
     def _process_gaze(self, eye_data):
         """Handle gaze-based mouse movement"""
         # Average the positions from both eyes for more stability
-        left_pupil = eye_data.get('left_pupil', {})
-        right_pupil = eye_data.get('right_pupil', {})
-        
-        if not left_pupil or not right_pupil:
+        if not eye_data.has_pupils:
             return
             
-        # Get relative positions
-        left_x = left_pupil.get('relative_x', 0)
-        left_y = left_pupil.get('relative_y', 0)
-        right_x = right_pupil.get('relative_x', 0)
-        right_y = right_pupil.get('relative_y', 0)
-        
-        # Average the two eyes with some base amplification
-        avg_x = (left_x + right_x) * 1.5
-        avg_y = (left_y + right_y) * 1.5
-        
-        # Apply smoothing if we have previous positions
-        if self.prev_left_pupil is not None and self.prev_right_pupil is not None:
-            avg_x = avg_x * (1 - self.smoothing) + ((self.prev_left_pupil.get('relative_x', 0) + 
-                                                     self.prev_right_pupil.get('relative_x', 0)) * 1.5) * self.smoothing
-            avg_y = avg_y * (1 - self.smoothing) + ((self.prev_left_pupil.get('relative_y', 0) + 
-                                                     self.prev_right_pupil.get('relative_y', 0)) * 1.5) * self.smoothing
-        
-        # Map to screen coordinates
-        norm_x = (avg_x - self.center_x) / self.range_x
-        norm_y = (avg_y - self.center_y) / self.range_y
+        # Smooth both axes at once
+        filtered = self.gaze_filter.filter(self.gaze_signal(eye_data, out=self._gaze), eye_data.timestamp)
+        
+        if self.gaze_mapping is not None:
+            # Fitted calibration gives normalized screen coordinates directly
+            screen = self.gaze_mapping.apply(filtered, out=self._screen_point)
+            norm_x = 2 * float(screen[0]) - 1
+            norm_y = 2 * float(screen[1]) - 1
+        else:
+            # Map to screen coordinates
+            norm_x = (float(filtered[0]) - self.center_x) / self.range_x
+            norm_y = (float(filtered[1]) - self.center_y) / self.range_y
         
         # Log significant changes in gaze direction for debugging
         if abs(norm_x - self.last_norm_x) > 0.1 or abs(norm_y - self.last_norm_y) > 0.1:
@@ -126,21 +189,33 @@ class GestureController:
             self.last_norm_x = norm_x
             self.last_norm_y = norm_y
         
-        # Apply sensitivity and calculate new position
-        # Convert to absolute screen coordinates
-        target_x = int((norm_x * self.sensitivity * self.screen_width/20) + (self.screen_width / 2))
-        target_y = int((norm_y * self.sensitivity * self.screen_height/20) + (self.screen_height / 2))
+        if self.gaze_mapping is not None:
+            screen_x = (norm_x + 1) / 2
+            screen_y = (norm_y + 1) / 2
+        else:
+            # Apply sensitivity, as a fraction of the screen
+            screen_x = norm_x * self.sensitivity / 20 + 0.5
+            screen_y = norm_y * self.sensitivity / 20 + 0.5
         
         # Ensure within screen bounds
-        target_x = max(0, min(self.screen_width, target_x))
-        target_y = max(0, min(self.screen_height, target_y))
-        
-        # Move mouse pointer if movement is significant enough
-        # Reduced threshold to make movement more responsive
-        if abs(norm_x) > 0.02 or abs(norm_y) > 0.02:
-            logger.debug(f"Moving mouse to: ({target_x}, {target_y})")
-            self.mouse_controller.move_to(target_x, target_y)
-        
-        # Store for next smoothing calculation
-        self.prev_left_pupil = left_pupil
-        self.prev_right_pupil = right_pupil
\ No newline at end of file
+        screen_x = max(0.0, min(1.0, screen_x))
+        screen_y = max(0.0, min(1.0, screen_y))
+        
+        if self.fixation_detector is not None:
+            # Hold still during fixations instead of following every jitter
+            if not self.fixation_detector.update(screen_x, screen_y, eye_data.timestamp):
+                return
+            screen_x = self.fixation_detector.x
+            screen_y = self.fixation_detector.y
+        elif abs(norm_x) <= 0.02 and abs(norm_y) <= 0.02:
+            return
+        
+        # Convert to absolute screen coordinates
+        target_x = int(screen_x * self.screen_width)
+        target_y = int(screen_y * self.screen_height)
+        
+        logger.debug(f"Moving mouse to: ({target_x}, {target_y})")
+        with tracer.span("mouse.move_to"):
+            # A PointerInjector times the move from capture to injection
+            self.mouse_controller.move_to(target_x, target_y, capture_time=eye_data.capture_time)
+
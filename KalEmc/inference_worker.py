@@ -0,0 +1,196 @@
+import logging
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class InferenceWorker:
+    """Runs FaceMesh in its own process, isolated from the main interpreter's GIL.
+
+    Frames are written into a ring of shared memory slots and only small
+    (seq, slot, height, width) tuples cross the pipe, so frames are never
+    pickled. The worker writes the requested landmarks, normalized like
+    FaceMesh output, into a shared result array for the same slot.
+    """
+    def __init__(self, base_indices, iris_indices, max_frame_shape=(1080, 1920, 3), slots=2,
+                 cpu=None, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 startup_timeout=30.0):
+        self.base_indices = list(base_indices)
+        self.iris_indices = list(iris_indices)
+        self.n_rows = len(self.base_indices) + len(self.iris_indices)
+        self.max_frame_bytes = int(np.prod(max_frame_shape))
+        self.slots = slots
+        self.cpu = cpu  # Core to pin the worker to, if supported
+        self.face_mesh_options = {
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        self.startup_timeout = startup_timeout
+
+        self._ctx = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._frames_shm = None
+        self._results_shm = None
+        self._frames = None
+        self._results = None
+        self._next_slot = 0
+        self._seq = 0
+
+        # Statistics
+        self.timeouts = 0
+        self.restarts = 0
+
+    def start(self):
+        if self._process is not None:
+            return True
+
+        self._frames_shm = shared_memory.SharedMemory(create=True, size=self.slots * self.max_frame_bytes)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=self.slots * self.n_rows * 3 * 4)
+        self._frames = np.ndarray((self.slots, self.max_frame_bytes), dtype=np.uint8, buffer=self._frames_shm.buf)
+        self._results = np.ndarray((self.slots, self.n_rows, 3), dtype=np.float32, buffer=self._results_shm.buf)
+
+        self._conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self._frames_shm.name, self._results_shm.name, self.slots,
+                  self.max_frame_bytes, self.base_indices, self.iris_indices, self.cpu,
+                  self.face_mesh_options),
+            name="InferenceWorker"
+        )
+        self._process.daemon = True
+        self._process.start()
+        child_conn.close()
+
+        # Wait until the model is loaded so the first frame is not a timeout
+        if not self._conn.poll(self.startup_timeout) or self._conn.recv() != 'ready':
+            logger.error("Inference worker failed to start")
+            self.stop()
+            return False
+
+        logger.info(f"Inference worker started (pid {self._process.pid}, cpu {self.cpu})")
+        return True
+
+    def process(self, image, out, timeout=1.0):
+        """Run FaceMesh on a BGR image and copy the normalized landmarks into out.
+
+        Returns whether iris landmarks are available, or None if no face was
+        found or the worker did not answer in time.
+        """
+        if self._process is None or not self._process.is_alive():
+            if self._process is not None:
+                logger.warning("Inference worker died, restarting")
+                self.restarts += 1
+                self.stop()
+            if not self.start():
+                return None
+
+        if image.nbytes > self.max_frame_bytes:
+            logger.error(f"Frame of {image.shape} does not fit the inference worker's frame slots")
+            return None
+
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        self._frames[slot, :image.nbytes] = image.reshape(-1)
+        self._seq += 1
+        self._conn.send((self._seq, slot, image.shape[0], image.shape[1]))
+
+        while True:
+            if not self._conn.poll(timeout):
+                self.timeouts += 1
+                logger.warning("Inference worker timed out")
+                return None
+            seq, found, has_iris = self._conn.recv()
+            # Replies to requests that already timed out are discarded
+            if seq == self._seq:
+                break
+
+        if not found:
+            return None
+
+        rows = self.n_rows if has_iris else len(self.base_indices)
+        out[:rows] = self._results[slot, :rows]
+        return has_iris
+
+    def stop(self):
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+            self._conn.close()
+            self._conn = None
+
+        self._frames = None
+        self._results = None
+        for shm in (self._frames_shm, self._results_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._frames_shm = None
+        self._results_shm = None
+
+def _worker_main(conn, frames_name, results_name, slots, max_frame_bytes, base_indices, iris_indices,
+                 cpu, face_mesh_options):
+    """Entry point of the inference process"""
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            logger.warning(f"Could not pin inference worker to cpu {cpu}: {e}")
+
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    frames = np.ndarray((slots, max_frame_bytes), dtype=np.uint8, buffer=frames_shm.buf)
+    n_rows = len(base_indices) + len(iris_indices)
+    results = np.ndarray((slots, n_rows, 3), dtype=np.float32, buffer=results_shm.buf)
+    indices = list(base_indices) + list(iris_indices)
+    max_iris_index = max(iris_indices)
+
+    face_mesh = mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1,
+        refine_landmarks=True,
+        **face_mesh_options
+    )
+    conn.send('ready')
+
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+
+            seq, slot, height, width = request
+            image = frames[slot, :height * width * 3].reshape(height, width, 3)
+            results_mp = face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+            if not results_mp.multi_face_landmarks:
+                conn.send((seq, False, False))
+                continue
+
+            landmarks = results_mp.multi_face_landmarks[0].landmark
+            has_iris = len(landmarks) > max_iris_index
+            out = results[slot]
+            rows = n_rows if has_iris else len(base_indices)
+            for row in range(rows):
+                lm = landmarks[indices[row]]
+                out[row, 0] = lm.x
+                out[row, 1] = lm.y
+                out[row, 2] = lm.z
+            conn.send((seq, True, has_iris))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        face_mesh.close()
+        del frames, results
+        frames_shm.close()
+        results_shm.close()
@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LandmarkFlowTracker:
+    """Tracks eye and iris landmarks between FaceMesh keyframes with pyramidal Lucas-Kanade.
+
+    FaceMesh only needs to run on keyframes; in between, the landmark points
+    of the last keyframe are carried forward with optical flow. A keyframe is
+    requested every keyframe_interval frames, and forced early when a point is
+    lost, the flow error is above max_error, or any point moved more than
+    max_motion pixels in one frame.
+    """
+    def __init__(self, keyframe_interval=4, max_error=12.0, max_motion=10.0, win_size=(21, 21), max_level=2):
+        self.keyframe_interval = keyframe_interval
+        self.max_error = max_error
+        self.max_motion = max_motion
+        self.win_size = win_size
+        self.max_level = max_level
+        self.criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+
+        # Two grayscale buffers used alternately, so the previous frame is
+        # still intact while the current one is converted
+        self._gray_buffers = [None, None]
+        self._current = 0
+        self._prev_gray = None
+        self._points = None  # (N, 1, 2) float32
+        self.frames_since_keyframe = 0
+
+        # Statistics
+        self.keyframes = 0
+        self.tracked_frames = 0
+        self.forced_keyframes = 0
+
+    def convert(self, frame):
+        """Convert a BGR frame to grayscale into the next free buffer"""
+        self._current = 1 - self._current
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buffers[self._current])
+        self._gray_buffers[self._current] = gray
+        return gray
+
+    def needs_keyframe(self):
+        return self._points is None or self.frames_since_keyframe >= self.keyframe_interval
+
+    def reset(self, gray, points):
+        """Start tracking from keyframe points (N, 2) in pixels"""
+        self._prev_gray = gray
+        self._points = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 1, 2)
+        self.frames_since_keyframe = 0
+        self.keyframes += 1
+
+    def invalidate(self):
+        self._prev_gray = None
+        self._points = None
+
+    def track(self, gray):
+        """Return tracked points (N, 2) for this frame, or None if a keyframe is needed"""
+        if self._points is None:
+            return None
+
+        new_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, self._points, None,
+            winSize=self.win_size, maxLevel=self.max_level, criteria=self.criteria
+        )
+
+        if new_points is None or not status.all():
+            return self._force_keyframe("landmark lost")
+        if error.max() > self.max_error:
+            return self._force_keyframe(f"flow error {error.max():.1f}")
+
+        motion = np.abs(new_points - self._points).max()
+        if motion > self.max_motion:
+            return self._force_keyframe(f"motion {motion:.1f}px")
+
+        self._prev_gray = gray
+        self._points = new_points
+        self.frames_since_keyframe += 1
+        self.tracked_frames += 1
+        return new_points.reshape(-1, 2)
+
+    def _force_keyframe(self, reason):
+        logger.debug(f"Forcing FaceMesh keyframe: {reason}")
+        self.forced_keyframes += 1
+        self.invalidate()
+        return None
+
+    def get_stats(self):
+        return {
+            'keyframes': self.keyframes,
+            'tracked_frames': self.tracked_frames,
+            'forced_keyframes': self.forced_keyframes
+        }
@@ -0,0 +1,176 @@
+"""
+End-to-end latency histograms for the tracking pipeline.
+
+Latencies are measured from the capture time carried by each GazeSample,
+so they cover everything between the camera handing over a frame and the
+pointer action it caused: capture hand-off, inference, gesture processing
+and mouse injection. Histograms use fixed log-spaced buckets, so recording
+is cheap enough to stay on in production.
+
+Run `python -m KalEmc.latency` for a self-test that drives the real
+tracking pipeline from a camera or recording into a counting stand-in
+mouse instead of the system pointer, and prints the latency report.
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import time
+
+class LatencyHistogram:
+    """Log-spaced histogram of latencies in seconds"""
+    def __init__(self, min_latency=1e-4, max_latency=10.0, bins_per_decade=20):
+        decades = math.log10(max_latency / min_latency)
+        n_edges = int(round(decades * bins_per_decade)) + 1
+        self.edges = [min_latency * 10 ** (i / bins_per_decade) for i in range(n_edges)]
+        # counts[0] is below the first edge, counts[-1] above the last
+        self.counts = [0] * (n_edges + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_right(self.edges, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, in seconds"""
+        if self.count == 0:
+            return 0.0
+        target = q / 100 * self.count
+        for index, cumulative in enumerate(itertools.accumulate(self.counts)):
+            if cumulative >= target:
+                break
+        if index >= len(self.edges):
+            return self.max
+        return min(self.edges[index], self.max)
+
+    def get_stats(self):
+        """Return count, mean, percentiles and max as a dictionary, in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+    def format(self, width=40):
+        """Text rendering of the non-empty buckets, one line each"""
+        if self.count == 0:
+            return "  (no samples)"
+        peak = max(self.counts)
+        lines = []
+        for index, count in enumerate(self.counts):
+            if count == 0:
+                continue
+            upper = self.edges[index] if index < len(self.edges) else self.max
+            bar = '#' * max(1, round(width * count / peak))
+            lines.append(f"  <= {upper * 1000:8.2f} ms {count:7d} {bar}")
+        return "\n".join(lines)
+
+class LatencyMonitor:
+    """Named latency histograms, created on first use"""
+    def __init__(self, **histogram_kwargs):
+        self.histogram_kwargs = histogram_kwargs
+        self.histograms = {}
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(**self.histogram_kwargs)
+        histogram.record(seconds)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def get_stats(self):
+        return {name: histogram.get_stats() for name, histogram in self.histograms.items()}
+
+    def format_report(self):
+        """Summary line and histogram for every recorded latency"""
+        sections = []
+        for name, histogram in self.histograms.items():
+            stats = histogram.get_stats()
+            sections.append(f"{name}: n={stats['count']} mean={stats['mean_ms']:.1f} ms "
+                            f"p50={stats['p50_ms']:.1f} ms p95={stats['p95_ms']:.1f} ms "
+                            f"p99={stats['p99_ms']:.1f} ms max={stats['max_ms']:.1f} ms\n"
+                            f"{histogram.format()}")
+        return "\n".join(sections)
+
+def run_self_test(tracker, controller, duration=10.0, max_frames=None):
+    """Run capture, detection and gesture processing for duration seconds.
+
+    Returns frame and detection counts; latencies end up in controller.latency.
+    """
+    frames = detections = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end and (max_frames is None or frames < max_frames):
+        frame = tracker.capture_frame()
+        if frame is None:
+            if tracker.source.exhausted:
+                break
+            continue
+        frames += 1
+        sample = tracker.detect_eyes(frame)
+        if sample is None:
+            continue
+        detections += 1
+        controller.process_eye_data(sample)
+    return {'frames': frames, 'detections': detections}
+
+def main():
+    from KalEmc.eye_tracker import EyeTracker
+    from KalEmc.frame_source import create_frame_source
+    from KalEmc.gaze_recorder import CountingMouseController
+    from KalEmc.gesture_controller import GestureController
+    from KalEmc.pointer_injector import PointerInjector
+
+    parser = argparse.ArgumentParser(description="Measure capture-to-pointer latency against a stand-in mouse")
+    parser.add_argument("--source", default="0", help="Camera index, video file or image directory")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to measure")
+    parser.add_argument("--frames", type=int, default=None, help="Stop after this many frames")
+    parser.add_argument("--roi-tracking", action="store_true")
+    parser.add_argument("--inference-width", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="Also write the statistics to this file")
+    args = parser.parse_args()
+
+    # Recordings are paced like a live camera so capture-to-frame timing is realistic
+    source = create_frame_source(args.source, realtime=True)
+    tracker = EyeTracker(source=source, threaded_capture=True, roi_tracking=args.roi_tracking,
+                         inference_width=args.inference_width)
+    display = CountingMouseController()
+    injector = PointerInjector(display)
+    controller = GestureController(injector)
+    injector.start()
+    try:
+        counts = run_self_test(tracker, controller, duration=args.duration, max_frames=args.frames)
+    finally:
+        tracker.release()
+        injector.stop()
+
+    print(f"{counts['frames']} frames, {counts['detections']} detections, "
+          f"{display.counts['move_to']} pointer moves")
+    print(controller.latency.format_report())
+    print(injector.latency.format_report())
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'counts': counts, 'actions': display.counts, 'latency': controller.latency.get_stats(),
+                       'injector': injector.get_stats()}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,77 @@
+import os
+import signal
 import threading
 import time
 import logging
 from KalEmc.voice_listener import VoiceListener
+from KalEmc.calibration import run_calibration
+from KalEmc.calibration_store import load_profile, profile_key, save_profile
+from KalEmc.camera_probe import get_device_key
 from KalEmc.eye_tracker import EyeTracker
+from KalEmc.debug_preview import DebugPreview
+from KalEmc.gaze_recorder import GazeRecorder
 from KalEmc.gesture_controller import GestureController
 from KalEmc.mouse_controller import MouseController
+from KalEmc.multi_camera import create_multi_camera_tracker
+from KalEmc.pointer_injector import PointerInjector
+from KalEmc.tracing import tracer
+from KalEmc.utils import create_config_dir
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class EyeMouseAssistant:
-    def __init__(self, wake_word="wake up", sleep_word="go to sleep"):
+    def __init__(self, wake_word="wake up", sleep_word="go to sleep", roi_tracking=False, inference_width=None,
+                 debug_preview=False, source=None, record_path=None, trace=False, flow_tracking=False,
+                 inference_process=False, inference_cpu=None, camera_ids=None, auto_camera_mode=False,
+                 idle_release=30.0, refresh_rate=60.0):
         logger.info("Initializing Eye Mouse Assistant")
+        if trace:
+            tracer.enable()
         self.running = False
         self.active = False
         
+        # Set while tracking or shutting down; the main loop blocks on it
+        # while asleep instead of polling
+        self._wake_event = threading.Event()
+        
         # Initialize components
         self.voice_listener = VoiceListener(wake_word, sleep_word)
         self.mouse_controller = MouseController()
-        self.eye_tracker = EyeTracker()
-        self.gesture_controller = GestureController(self.mouse_controller)
+        # Pointer actions are injected from their own thread, with moves
+        # coalesced and capped at the display refresh rate
+        self.pointer_injector = PointerInjector(self.mouse_controller, refresh_rate=refresh_rate)
+        self.gesture_controller = GestureController(self.pointer_injector)
+        
+        # The camera and FaceMesh are only held while tracking: they are
+        # acquired on activate() and released idle_release seconds after
+        # deactivate(), unless tracking resumes first
+        self.camera_ids = camera_ids
+        self.debug_preview = debug_preview
+        self.source = source
+        self.tracker_kwargs = {
+            'roi_tracking': roi_tracking,
+            'inference_width': inference_width,
+            'flow_tracking': flow_tracking,
+            'inference_process': inference_process,
+            'auto_camera_mode': auto_camera_mode
+        }
+        self.inference_cpu = inference_cpu
+        self.idle_release = idle_release
+        self.eye_tracker = None
+        self.multi_camera = None
+        self._tracker_lock = threading.Lock()
+        self._release_timer = None
+        # Held for each read of the tracker and while its sample is in use;
+        # the main loop and calibrate() share the tracker's reused state
+        self._read_lock = threading.Lock()
+        
+        # The stored calibration profile is looked up on first activation,
+        # so startup never waits on it
+        self._profile_loaded = False
+        
+        # Optional recording of the gaze stream for offline replay
+        self.gaze_recorder = GazeRecorder(record_path) if record_path else None
         
         # Register callbacks
         self.voice_listener.set_wake_callback(self.activate)
@@ -27,48 +79,215 @@ class EyeMouseAssistant:
         
     def activate(self):
         logger.info("Activating eye tracking")
+        self._acquire_tracker()
+        self._load_calibration_profile()
         self.active = True
+        self._wake_event.set()
         
     def deactivate(self):
         logger.info("Deactivating eye tracking")
         self.active = False
+        if self.running:
+            self._wake_event.clear()
+        self._schedule_release()
+    
+    def _create_tracker(self):
+        """Open the camera(s) and load the face model"""
+        debug_sink = DebugPreview() if self.debug_preview else None
+        if self.camera_ids and len(self.camera_ids) > 1:
+            # Several cameras tracked in parallel and fused per sample
+            self.multi_camera = create_multi_camera_tracker(self.camera_ids, debug_sink=debug_sink,
+                                                            **self.tracker_kwargs)
+            self.multi_camera.start()
+            return self.multi_camera
+        
+        camera_id = self.camera_ids[0] if self.camera_ids else 0
+        return EyeTracker(camera_id=camera_id, threaded_capture=True, source=self.source,
+                          inference_cpu=self.inference_cpu, debug_sink=debug_sink, **self.tracker_kwargs)
+    
+    def _acquire_tracker(self):
+        """Make sure tracking resources are held, cancelling a pending release"""
+        with self._tracker_lock:
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+            if self.eye_tracker is None:
+                start = time.monotonic()
+                self.eye_tracker = self._create_tracker()
+                logger.info(f"Tracking resources acquired in {time.monotonic() - start:.2f}s")
+    
+    def _schedule_release(self):
+        with self._tracker_lock:
+            if self.eye_tracker is None or self._release_timer is not None:
+                return
+            self._release_timer = threading.Timer(self.idle_release, self._release_idle_tracker)
+            self._release_timer.daemon = True
+            self._release_timer.start()
+    
+    def _release_idle_tracker(self):
+        with self._tracker_lock:
+            self._release_timer = None
+            if self.active:
+                return
+            self._release_tracker()
+            logger.info(f"Tracking resources released after {self.idle_release:.0f}s idle")
+    
+    def _release_tracker(self):
+        """Release the camera and face model; the caller holds _tracker_lock"""
+        if self.eye_tracker is not None:
+            self.eye_tracker.release()
+        self.eye_tracker = None
+        self.multi_camera = None
+        
+    def calibrate(self, points=9, model='polynomial'):
+        """Run a multi-point calibration and use the fitted gaze mapping.
+        
+        Returns the RMS residual as a share of the screen, or None if the
+        calibration was cancelled.
+        """
+        self._acquire_tracker()
+        # Park the main loop while the calibration reads the tracker; a frame
+        # it is already reading finishes first under _read_lock
+        self._wake_event.clear()
+        try:
+            result = run_calibration(self._read_calibration_gaze,
+                                     (self.gesture_controller.screen_width, self.gesture_controller.screen_height),
+                                     points=points, model=model)
+        finally:
+            if self.active or not self.running:
+                self._wake_event.set()
+            else:
+                self._schedule_release()
+        
+        if result is None:
+            return None
+        mapping, residual = result
+        self.gesture_controller.set_gaze_mapping(mapping)
+        self._profile_loaded = True
+        key = self._calibration_profile_key()
+        if key is not None:
+            save_profile(key, mapping, residual)
+        return residual
+    
+    def _calibration_profile_key(self):
+        """Profile key for this user, camera(s) and screen; None for recorded sources"""
+        if self.source is not None:
+            return None
+        camera_key = "+".join(get_device_key(camera_id) for camera_id in (self.camera_ids or [0]))
+        return profile_key(camera_key, (self.gesture_controller.screen_width, self.gesture_controller.screen_height))
+    
+    def _load_calibration_profile(self):
+        if self._profile_loaded:
+            return
+        self._profile_loaded = True
+        key = self._calibration_profile_key()
+        profile = load_profile(key) if key is not None else None
+        if profile is None:
+            return
+        mapping, residual = profile
+        self.gesture_controller.set_gaze_mapping(mapping)
+        logger.info(f"Loaded calibration profile (RMS residual {residual * 100:.1f}% of screen)")
+    
+    def _read_calibration_gaze(self):
+        # Waits out a frame the main loop may still be reading or processing
+        with self._read_lock:
+            eye_data = self._read_eye_data()
+            if eye_data is None or not eye_data.has_pupils:
+                return None
+            return self.gesture_controller.gaze_signal(eye_data), eye_data.timestamp
         
     def start(self):
         self.running = True
+        if not self.active:
+            self._wake_event.clear()
         
         # Start voice listener in a separate thread
-        voice_thread = threading.Thread(target=self.voice_listener.start_listening)
+        voice_thread = threading.Thread(target=self.voice_listener.start_listening, name="VoiceListener")
         voice_thread.daemon = True
         voice_thread.start()
+        self.pointer_injector.start()
         
         # Main processing loop
         logger.info("Eye Mouse Assistant is running. Say 'wake up' to activate.")
         try:
             while self.running:
-                if self.active:
-                    # Process eye tracking when active
-                    frame = self.eye_tracker.capture_frame()
-                    if frame is not None:
-                        eye_data = self.eye_tracker.detect_eyes(frame)
-                        if eye_data:
+                # Blocks until activate() or stop() while asleep
+                self._wake_event.wait()
+                if not self.running:
+                    break
+                
+                # Both paths block until a new frame or fused sample is
+                # available, so the loop runs at frame-arrival pace
+                with self._read_lock:
+                    eye_data = self._read_eye_data()
+                    if eye_data:
+                        if self.gaze_recorder is not None:
+                            self.gaze_recorder.write(eye_data)
+                        with tracer.span("process_eye_data"):
                             self.gesture_controller.process_eye_data(eye_data)
-                    
-                # Sleep to reduce CPU usage
-                time.sleep(0.01)
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
         finally:
             self.stop()
             
+    def _read_eye_data(self):
+        # A local reference, so a concurrent release cannot swap it mid-read;
+        # once released, the tracker returns None instead of reopening the camera
+        tracker = self.eye_tracker
+        if tracker is None:
+            return None
+        if tracker is self.multi_camera:
+            with tracer.span("read_gaze"):
+                return tracker.read_gaze()
+        
+        with tracer.span("capture_frame"):
+            frame = tracker.capture_frame()
+        if frame is None:
+            return None
+        with tracer.span("detect_eyes"):
+            return tracker.detect_eyes(frame)
+            
     def stop(self):
         logger.info("Shutting down Eye Mouse Assistant")
         self.running = False
         self.active = False
+        self._wake_event.set()
         self.voice_listener.stop_listening()
-        self.eye_tracker.release()
+        with self._tracker_lock:
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+            self._release_tracker()
+        self.pointer_injector.stop()
+        if self.gaze_recorder is not None:
+            self.gaze_recorder.close()
+        if self.gesture_controller.latency.histograms:
+            logger.info(f"Capture latency:\n{self.gesture_controller.latency.format_report()}")
+        if self.pointer_injector.moves_requested:
+            stats = self.pointer_injector.get_stats()
+            logger.info(f"Pointer injection: {stats['moves_sent']} moves sent, "
+                        f"{stats['moves_coalesced']} coalesced, max queue depth {stats['max_queue_depth']}\n"
+                        f"{self.pointer_injector.latency.format_report()}")
+        if tracer.enabled:
+            self.export_trace()
+    
+    def export_trace(self, path=None):
+        """Write the recorded latency spans as Chrome trace-event JSON"""
+        if path is None:
+            path = os.path.join(create_config_dir(), f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            return tracer.export_chrome_trace(path)
+        except Exception as e:
+            logger.error(f"Error exporting trace: {e}")
+            return None
 
 def main():
     assistant = EyeMouseAssistant()
+    
+    # Dump a trace on demand with `kill -USR1 <pid>`
+    if tracer.enabled and hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: assistant.export_trace())
+    
     assistant.start()
             
 if __name__ == "__main__":
@@ -21,8 +21,11 @@ class MouseController:
         """Get current mouse position"""
         return pyautogui.position()
 
-    def move_to(self, x, y):
-        """Move mouse to absolute coordinates with custom fail-safe"""
+    def move_to(self, x, y, capture_time=None):
+        """Move mouse to absolute coordinates with custom fail-safe.
+
+        capture_time is accepted for PointerInjector compatibility and ignored.
+        """
         try:
             # Ensure coordinates are within screen bounds and avoid corners
             if (self.safe_margin < x < self.screen_width - self.safe_margin and
@@ -0,0 +1,210 @@
+import logging
+import threading
+
+from KalEmc.clock import SystemClock
+from KalEmc.eye_tracker import EyeTracker
+from KalEmc.gaze_sample import GazeSample
+
+logger = logging.getLogger(__name__)
+
+def fuse_gaze(samples, out=None):
+    """Fuse GazeSamples from several cameras into out (a new GazeSample if None).
+
+    Pupil offsets are relative to each camera's own eye box, so they are
+    averaged weighted by confidence. Pixel positions and blink state are not
+    comparable across cameras and are taken from the most confident sample.
+    Missing cameras are passed as None. Returns None if there is no sample.
+    """
+    best = None
+    timestamp = 0.0
+    total = 0.0
+    relative = [0.0, 0.0, 0.0, 0.0]
+    contributors = 0
+    for sample in samples:
+        if sample is None:
+            continue
+        if best is None or sample.confidence > best.confidence:
+            best = sample
+        timestamp = max(timestamp, sample.timestamp)
+        if sample.has_pupils and sample.confidence > 0:
+            weight = sample.confidence
+            relative[0] += sample.left_pupil.relative_x * weight
+            relative[1] += sample.left_pupil.relative_y * weight
+            relative[2] += sample.right_pupil.relative_x * weight
+            relative[3] += sample.right_pupil.relative_y * weight
+            total += weight
+            contributors += 1
+
+    if best is None:
+        return None
+
+    if out is None:
+        out = GazeSample()
+    out.copy_from(best)
+    out.timestamp = timestamp
+    if contributors >= 2 and total > 0:
+        out.has_pupils = True
+        out.left_pupil.relative_x = relative[0] / total
+        out.left_pupil.relative_y = relative[1] / total
+        out.right_pupil.relative_x = relative[2] / total
+        out.right_pupil.relative_y = relative[3] / total
+    return out
+
+class CameraWorker:
+    """Runs capture and detection for one camera on its own thread"""
+    def __init__(self, tracker, name):
+        self.tracker = tracker
+        self.name = name
+        self.running = False
+        self._thread = None
+        self._on_sample = None
+        
+        # The tracker refills its sample every frame, so the newest one is
+        # copied here under a lock for the fusing thread
+        self._latest = GazeSample()
+        self._seq = 0  # Bumped for every new sample, 0 until the first
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.samples = 0
+        self.dropouts = 0  # Frames where no face was found
+
+    def start(self, on_sample):
+        self._on_sample = on_sample
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while self.running:
+            frame = self.tracker.capture_frame()
+            if frame is None:
+                continue
+
+            sample = self.tracker.detect_eyes(frame)
+            if sample is None:
+                self.dropouts += 1
+                continue
+
+            with self._lock:
+                self._latest.copy_from(sample)
+                self._seq += 1
+            self.samples += 1
+            self._on_sample()
+
+    def snapshot(self, out):
+        """Copy the newest sample into out; returns its sequence number, 0 if there is none yet"""
+        with self._lock:
+            if self._seq:
+                out.copy_from(self._latest)
+            return self._seq
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.tracker.release()
+
+class MultiCameraTracker:
+    """Tracks the eyes with several cameras in parallel and fuses them by confidence.
+
+    Each EyeTracker captures and runs detection on its own thread. A fused
+    sample is produced whenever any camera delivers a new one, combining it
+    with the other cameras' latest samples that are younger than max_age.
+    Blink events are one-shot: a camera's sample only contributes them to
+    the first fused sample it takes part in.
+    """
+    def __init__(self, trackers, max_age=0.1, clock=None):
+        self.clock = clock if clock is not None else SystemClock()
+        self.max_age = max_age
+        self.workers = [CameraWorker(tracker, f"CameraWorker-{tracker.camera_id}") for tracker in trackers]
+        self._cond = threading.Condition()
+        self._pending = False
+        
+        # Preallocated per-camera snapshots and fused output
+        self._snapshots = [GazeSample() for _ in self.workers]
+        self._fresh = [None] * len(self.workers)
+        self._fused = GazeSample()
+        self._seqs = [0] * len(self.workers)
+        self._fused_seqs = [0] * len(self.workers)  # Newest sample of each camera already fused
+
+        # Statistics
+        self.fused_samples = 0
+        self.wins = [0] * len(self.workers)  # How often each camera was the most confident
+
+    def start(self):
+        for worker in self.workers:
+            worker.start(self._notify)
+        logger.info(f"Multi-camera tracking started with {len(self.workers)} cameras")
+
+    def _notify(self):
+        with self._cond:
+            self._pending = True
+            self._cond.notify_all()
+
+    def read_gaze(self, timeout=0.5):
+        """Wait for a new sample from any camera and return the fused GazeSample, or None.
+
+        The returned sample is reused by the next call.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending, timeout):
+                return None
+            self._pending = False
+
+        now = self.clock.time()
+        best = None
+        for i, (worker, snapshot) in enumerate(zip(self.workers, self._snapshots)):
+            seq = self._seqs[i] = worker.snapshot(snapshot)
+            fresh = seq > 0 and now - snapshot.timestamp <= self.max_age
+            self._fresh[i] = snapshot if fresh else None
+            if not fresh:
+                continue
+            if seq == self._fused_seqs[i]:
+                # Already fused before, its blink events were delivered then
+                snapshot.left_blink.clear_events()
+                snapshot.right_blink.clear_events()
+            if best is None or snapshot.confidence > self._fresh[best].confidence:
+                best = i
+
+        if best is None:
+            return None
+
+        for i, snapshot in enumerate(self._fresh):
+            if snapshot is not None:
+                self._fused_seqs[i] = self._seqs[i]
+
+        self.wins[best] += 1
+        self.fused_samples += 1
+        return fuse_gaze(self._fresh, self._fused)
+
+    def get_stats(self):
+        return {
+            'fused_samples': self.fused_samples,
+            'cameras': {
+                worker.tracker.camera_id: {
+                    'samples': worker.samples,
+                    'dropouts': worker.dropouts,
+                    'wins': wins
+                }
+                for worker, wins in zip(self.workers, self.wins)
+            }
+        }
+
+    def release(self):
+        for worker in self.workers:
+            worker.stop()
+
+def create_multi_camera_tracker(camera_ids, max_age=0.1, debug_sink=None, **tracker_kwargs):
+    """Build a MultiCameraTracker with one threaded EyeTracker per camera id.
+
+    Extra keyword arguments are passed to every EyeTracker. Only the first
+    camera feeds the debug sink.
+    """
+    trackers = []
+    for i, camera_id in enumerate(camera_ids):
+        trackers.append(EyeTracker(camera_id=camera_id, threaded_capture=True,
+                                   debug_sink=debug_sink if i == 0 else None, **tracker_kwargs))
+    return MultiCameraTracker(trackers, max_age=max_age)
@@ -0,0 +1,166 @@
+import collections
+import logging
+import threading
+import time
+
+from KalEmc.latency import LatencyMonitor
+
+logger = logging.getLogger(__name__)
+
+class PointerInjector:
+    """Sends mouse actions to a MouseController from a dedicated thread.
+
+    Has the MouseController interface, so GestureController can use it in
+    place of one, but actions are queued and return immediately: a slow OS
+    input layer no longer stalls the tracking loop. Consecutive moves are
+    coalesced so only the latest target is sent, moves are sent at most
+    refresh_rate times per second, and clicks and scrolls keep their order
+    relative to moves. Moves given a capture time are timed from capture to
+    injection ('capture_to_inject' in latency).
+    """
+    def __init__(self, mouse_controller, refresh_rate=60.0, name="PointerInjector"):
+        self.mouse_controller = mouse_controller
+        self.refresh_rate = refresh_rate
+        self.move_interval = 1.0 / refresh_rate if refresh_rate else 0.0
+        self.name = name
+
+        # (action, args, enqueue time, capture time); only the tail is ever replaced
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._next_move_time = 0.0
+        self._running = False
+        self._thread = None
+
+        # Statistics
+        self.moves_requested = 0
+        self.moves_sent = 0
+        self.moves_coalesced = 0
+        self.actions_sent = 0
+        self.max_queue_depth = 0
+        self.latency = LatencyMonitor()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"{self.name} started at up to {self.refresh_rate} moves/s")
+
+    def stop(self, timeout=1.0):
+        """Send what is still queued, then stop the thread"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info(f"{self.name} stopped")
+
+    def get_screen_size(self):
+        return self.mouse_controller.get_screen_size()
+
+    def get_current_position(self):
+        return self.mouse_controller.get_current_position()
+
+    def move_to(self, x, y, capture_time=None):
+        """Queue a move; capture_time is when the frame behind it was captured, None if unknown"""
+        with self._cond:
+            self.moves_requested += 1
+            if self._queue and self._queue[-1][0] == 'move_to':
+                # Not sent yet, so the newer target simply replaces it. The
+                # queue time stays that of the first request, the capture
+                # time becomes that of the frame the new target came from
+                _, _, enqueued, last_capture = self._queue[-1]
+                self._queue[-1] = ('move_to', (x, y), enqueued, capture_time or last_capture)
+                self.moves_coalesced += 1
+                return True
+            self._enqueue('move_to', (x, y), capture_time)
+        return True
+
+    def move_relative(self, dx, dy):
+        return self._submit('move_relative', (dx, dy))
+
+    def left_click(self):
+        return self._submit('left_click', ())
+
+    def right_click(self):
+        return self._submit('right_click', ())
+
+    def double_click(self):
+        return self._submit('double_click', ())
+
+    def scroll(self, amount):
+        return self._submit('scroll', (amount,))
+
+    def drag_to(self, x, y, button='left'):
+        return self._submit('drag_to', (x, y, button))
+
+    def _submit(self, action, args):
+        with self._cond:
+            self._enqueue(action, args)
+        return True
+
+    def _enqueue(self, action, args, capture_time=None):
+        # Caller holds _cond
+        self._queue.append((action, args, time.monotonic(), capture_time))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._cond.notify()
+
+    def _next_action(self):
+        """Block until an action is due and return it, or None once stopped and drained"""
+        with self._cond:
+            while True:
+                if not self._queue:
+                    if not self._running:
+                        return None
+                    self._cond.wait()
+                    continue
+
+                action = self._queue[0]
+                if action[0] == 'move_to' and self._running and len(self._queue) == 1:
+                    # Hold a lone move back to the refresh rate; newer targets
+                    # coalesce into it meanwhile. Anything queued behind it
+                    # sends it at once so clicks land without delay.
+                    delay = self._next_move_time - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+
+                return self._queue.popleft()
+
+    def _run(self):
+        while True:
+            item = self._next_action()
+            if item is None:
+                break
+
+            action, args, enqueued, capture_time = item
+            try:
+                getattr(self.mouse_controller, action)(*args)
+            except Exception as e:
+                logger.error(f"Error injecting {action}: {e}")
+
+            now = time.monotonic()
+            self.latency.record('queue_to_inject', now - enqueued)
+            if action == 'move_to':
+                if capture_time:
+                    self.latency.record('capture_to_inject', now - capture_time)
+                self.moves_sent += 1
+                self._next_move_time = now + self.move_interval
+            else:
+                self.actions_sent += 1
+
+    def get_stats(self):
+        """Return queue and coalescing counters as a dictionary"""
+        return {
+            'queue_depth': len(self._queue),
+            'max_queue_depth': self.max_queue_depth,
+            'moves_requested': self.moves_requested,
+            'moves_sent': self.moves_sent,
+            'moves_coalesced': self.moves_coalesced,
+            'actions_sent': self.actions_sent,
+            'latency': self.latency.get_stats()
+        }
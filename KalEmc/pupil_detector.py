@@ -0,0 +1,105 @@
+import cv2
+import numpy as np
+import logging
+
+from KalEmc.gaze_sample import PupilInfo
+
+logger = logging.getLogger(__name__)
+
+class PupilDetector:
+    """Fallback pupil detector used when FaceMesh iris landmarks are unavailable.
+
+    Works only inside the eye bounding box of a grayscale frame and reuses its
+    working buffers between calls. The pupil is estimated as the centroid of
+    the darkest pixels inside the eye contour rather than a single pixel.
+    """
+    def __init__(self, blur_size=7, dark_offset=12, margin=2):
+        self.blur_size = blur_size      # Gaussian kernel size (odd)
+        self.dark_offset = dark_offset  # Gray levels above the minimum still counted as pupil
+        self.margin = margin            # Extra pixels around the eye bounding box
+
+        # Working buffers, grown on demand and reused through views
+        self._mask = np.zeros((0, 0), dtype=np.uint8)
+        self._blurred = np.zeros((0, 0), dtype=np.uint8)
+        self._dark = np.zeros((0, 0), dtype=np.uint8)
+
+    def _buffers(self, height, width):
+        if self._mask.shape[0] < height or self._mask.shape[1] < width:
+            shape = (max(height, self._mask.shape[0]), max(width, self._mask.shape[1]))
+            self._mask = np.zeros(shape, dtype=np.uint8)
+            self._blurred = np.zeros(shape, dtype=np.uint8)
+            self._dark = np.zeros(shape, dtype=np.uint8)
+        return (self._mask[:height, :width],
+                self._blurred[:height, :width],
+                self._dark[:height, :width])
+
+    def detect(self, gray, eye_points, out=None):
+        """Detect the pupil in a grayscale frame given the eye contour points.
+
+        Fills and returns out, a PupilInfo, or a new one if out is None.
+        """
+        eye_xy = np.asarray(eye_points)[:, :2]
+        eye_min = eye_xy.min(axis=0)
+        eye_max = eye_xy.max(axis=0)
+        eye_size = eye_max - eye_min
+        eye_center = (eye_min + eye_max) / 2
+
+        # Clip the padded bounding box to the frame
+        frame_h, frame_w = gray.shape[:2]
+        x0 = max(0, int(eye_min[0]) - self.margin)
+        y0 = max(0, int(eye_min[1]) - self.margin)
+        x1 = min(frame_w, int(eye_max[0]) + self.margin + 1)
+        y1 = min(frame_h, int(eye_max[1]) + self.margin + 1)
+
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            position = (int(eye_center[0]), int(eye_center[1]))
+        else:
+            position = self._locate(gray[y0:y1, x0:x1], eye_xy, x0, y0)
+
+        # Calculate relative positions
+        if eye_size[0] == 0 or eye_size[1] == 0:
+            relative_x = 0
+            relative_y = 0
+        else:
+            relative_x = 2 * (position[0] - eye_center[0]) / eye_size[0]
+            relative_y = 2 * (position[1] - eye_center[1]) / eye_size[1]
+
+        # Amplify to make movements more pronounced
+        relative_x *= 2.0
+        relative_y *= 2.0
+
+        if out is None:
+            out = PupilInfo()
+        return out.set(position[0], position[1], relative_x, relative_y)
+
+    def _locate(self, roi, eye_xy, x0, y0):
+        """Return the full-frame pupil position within a grayscale eye ROI"""
+        h, w = roi.shape
+        mask, blurred, dark = self._buffers(h, w)
+
+        # Mask of the eye contour in ROI coordinates
+        mask.fill(0)
+        contour = (eye_xy - (x0, y0)).astype(np.int32)
+        cv2.fillPoly(mask, [contour], 255)
+
+        # Apply GaussianBlur to reduce noise
+        cv2.GaussianBlur(roi, (self.blur_size, self.blur_size), 0, dst=blurred)
+
+        min_val, _, min_loc, _ = cv2.minMaxLoc(blurred, mask=mask)
+        if min_loc[0] < 0:
+            # Degenerate contour covering no pixels
+            return (int(x0 + w / 2), int(y0 + h / 2))
+
+        # Centroid of the dark blob around the minimum is steadier than the
+        # single darkest pixel
+        cv2.threshold(blurred, min_val + self.dark_offset, 255, cv2.THRESH_BINARY_INV, dst=dark)
+        cv2.bitwise_and(dark, mask, dst=dark)
+        moments = cv2.moments(dark, binaryImage=True)
+
+        if moments['m00'] > 0:
+            cx = moments['m10'] / moments['m00']
+            cy = moments['m01'] / moments['m00']
+        else:
+            cx, cy = min_loc
+
+        return (int(cx + x0), int(cy + y0))
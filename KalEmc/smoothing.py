@@ -0,0 +1,178 @@
+"""
+Gaze smoothing filters.
+
+Every filter takes an (x, y) NumPy array and a timestamp per sample, works
+on both axes at once and returns its own output array, which is overwritten
+by the next call. create_filter() builds one from the GestureController
+`smoothing` setting.
+"""
+
+import math
+
+import numpy as np
+
+# Assumed sample interval when timestamps are missing or not increasing
+DEFAULT_INTERVAL = 1 / 30
+
+# Largest EMA weight; at 1.0 the output would never follow the input
+MAX_EMA_WEIGHT = 0.95
+
+class GazeFilter:
+    """Base class; filter(value, timestamp) returns the smoothed (x, y)"""
+    def __init__(self):
+        self.output = np.zeros(2, dtype=np.float64)
+        self._last_time = None
+
+    def reset(self):
+        self._last_time = None
+
+    def _interval(self, timestamp):
+        """Seconds since the previous sample, or None for the first one"""
+        last = self._last_time
+        self._last_time = timestamp
+        if last is None:
+            return None
+        dt = timestamp - last
+        return dt if dt > 0 else DEFAULT_INTERVAL
+
+    def filter(self, value, timestamp):
+        raise NotImplementedError
+
+class NoFilter(GazeFilter):
+    def filter(self, value, timestamp):
+        self.output[:] = value
+        return self.output
+
+class EMAFilter(GazeFilter):
+    """Exponential moving average of the filtered output.
+
+    weight is the share of the previous output kept on each sample, the
+    meaning the float `smoothing` setting has always had. It is capped at
+    MAX_EMA_WEIGHT so the output always follows the gaze.
+    """
+    def __init__(self, weight=0.5):
+        super().__init__()
+        self.weight = min(weight, MAX_EMA_WEIGHT)
+
+    def filter(self, value, timestamp):
+        if self._interval(timestamp) is None:
+            self.output[:] = value
+        else:
+            self.output *= self.weight
+            self.output += (1 - self.weight) * np.asarray(value)
+        return self.output
+
+class OneEuroFilter(GazeFilter):
+    """One Euro filter (Casiez et al., 2012).
+
+    A low-pass filter whose cutoff rises with speed: min_cutoff (Hz) sets the
+    smoothing while the gaze rests, beta how quickly lag shrinks as it moves.
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.5, d_cutoff=1.0):
+        super().__init__()
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._derivative = np.zeros(2, dtype=np.float64)
+        self._delta = np.zeros(2, dtype=np.float64)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, value, timestamp):
+        dt = self._interval(timestamp)
+        if dt is None:
+            self.output[:] = value
+            self._derivative[:] = 0
+            return self.output
+
+        # Smoothed speed of the signal, per axis
+        np.subtract(value, self.output, out=self._delta)
+        self._delta /= dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._derivative += a_d * (self._delta - self._derivative)
+
+        # Faster movement raises the cutoff and so lowers the lag
+        alpha = self._alpha(self.min_cutoff + self.beta * np.abs(self._derivative), dt)
+        self.output += alpha * (np.asarray(value) - self.output)
+        return self.output
+
+class KalmanFilter(GazeFilter):
+    """Constant-velocity Kalman filter, one independent (position, velocity) state per axis.
+
+    process_noise is the variance of the unmodelled acceleration,
+    measurement_noise the variance of a raw sample.
+    """
+    def __init__(self, process_noise=50.0, measurement_noise=0.01):
+        super().__init__()
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._velocity = np.zeros(2, dtype=np.float64)
+        # Covariance entries per axis: [[p00, p01], [p01, p11]]
+        self._p00 = np.zeros(2, dtype=np.float64)
+        self._p01 = np.zeros(2, dtype=np.float64)
+        self._p11 = np.zeros(2, dtype=np.float64)
+
+    def filter(self, value, timestamp):
+        dt = self._interval(timestamp)
+        if dt is None:
+            self.output[:] = value
+            self._velocity[:] = 0
+            self._p00[:] = self.measurement_noise
+            self._p01[:] = 0
+            self._p11[:] = self.process_noise
+            return self.output
+
+        # Predict
+        self.output += self._velocity * dt
+        q = self.process_noise
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + q * dt ** 4 / 4
+        p01 = self._p01 + dt * self._p11 + q * dt ** 3 / 2
+        p11 = self._p11 + q * dt ** 2
+
+        # Update with the measured position
+        innovation = np.asarray(value) - self.output
+        s = p00 + self.measurement_noise
+        k0 = p00 / s
+        k1 = p01 / s
+        self.output += k0 * innovation
+        self._velocity += k1 * innovation
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        return self.output
+
+FILTERS = {
+    'none': NoFilter,
+    'ema': EMAFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter
+}
+
+def create_filter(smoothing, **params):
+    """Build a filter from a `smoothing` setting.
+
+    A number is the EMA weight of the previous output, a string names one
+    of FILTERS (extra keyword arguments are passed to it), and a GazeFilter
+    is used as is.
+    """
+    if isinstance(smoothing, GazeFilter):
+        return smoothing
+    if smoothing is None:
+        return NoFilter()
+    if isinstance(smoothing, (int, float)):
+        return EMAFilter(weight=float(smoothing)) if smoothing > 0 else NoFilter()
+    if smoothing not in FILTERS:
+        raise ValueError(f"Unknown smoothing filter '{smoothing}', expected one of {sorted(FILTERS)}")
+    return FILTERS[smoothing](**params)
+
+def parse_smoothing(value):
+    """Command-line form of the smoothing setting: a number or a filter name"""
+    try:
+        return float(value)
+    except ValueError:
+        if value not in FILTERS:
+            raise ValueError(f"Unknown smoothing filter '{value}', expected a number or one of {sorted(FILTERS)}")
+        return value
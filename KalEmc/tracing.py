@@ -0,0 +1,113 @@
+"""
+Lightweight span tracing for the tracking pipeline.
+
+Spans are written into a fixed-size ring buffer without locks and can be
+exported to Chrome trace-event JSON (chrome://tracing, Perfetto) on demand.
+When tracing is disabled, span() returns a shared no-op context manager, so
+instrumentation can stay in production code.
+
+Enable with the KALEMC_TRACE=1 environment variable or tracer.enable().
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class Tracer:
+    """Records (name, start, end, thread) spans into a ring buffer"""
+    def __init__(self, capacity=65536, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self._events = [None] * capacity
+        # next() on itertools.count is atomic under the GIL, so concurrent
+        # writers each get their own slot without taking a lock
+        self._counter = itertools.count()
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name):
+        """Context manager timing a block; free when tracing is disabled"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        slot = next(self._counter) % self.capacity
+        # A single tuple store, so readers never see a half-written event
+        self._events[slot] = (name, start_ns, end_ns, threading.get_ident())
+
+    def clear(self):
+        self._events = [None] * self.capacity
+
+    def get_events(self):
+        """Snapshot of the recorded spans, oldest first"""
+        events = [event for event in list(self._events) if event is not None]
+        events.sort(key=lambda event: event[1])
+        return events
+
+    def export_chrome_trace(self, path):
+        """Write the recorded spans as Chrome trace-event JSON"""
+        pid = os.getpid()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        events = self.get_events()
+
+        trace_events = []
+        for tid in sorted({event[3] for event in events}):
+            trace_events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                'args': {'name': thread_names.get(tid, str(tid))}
+            })
+        for name, start_ns, end_ns, tid in events:
+            trace_events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start_ns - self._origin_ns) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': pid,
+                'tid': tid
+            })
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        logger.info(f"Exported {len(events)} trace spans to {path}")
+        return path
+
+# Process-wide tracer used by the pipeline
+tracer = Tracer(enabled=os.environ.get('KALEMC_TRACE') == '1')
@@ -195,6 +195,8 @@ def load_settings():
         "sleep_word": "go to sleep",
         "sensitivity": 10,
         "smoothing": 0.7,
+        "idle_release": 30.0,  # Seconds asleep before the camera is released
+        "calibration_points": 9,  # Targets shown by Calibrate: 9 or 16
         "autostart": False
     }
     
@@ -2,6 +2,7 @@ import threading
 import speech_recognition as sr
 import logging
 import time
+from KalEmc.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +36,12 @@ class VoiceListener:
             try:
                 with self.microphone as source:
                     logger.debug("Listening for commands...")
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=3)
+                    with tracer.span("voice.listen"):
+                        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=3)
                 
                 try:
-                    text = self.recognizer.recognize_google(audio).lower()
+                    with tracer.span("voice.recognize"):
+                        text = self.recognizer.recognize_google(audio).lower()
                     logger.debug(f"Recognized: {text}")
                     
                     if self.wake_word in text and self.wake_callback:
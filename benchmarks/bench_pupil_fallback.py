@@ -0,0 +1,78 @@
+"""
+Micro-benchmark for the fallback pupil detector used when FaceMesh iris
+landmarks are unavailable.
+
+Compares PupilDetector against the previous full-frame darkest-pixel method
+on a synthetic 640x480 frame with two eyes.
+
+    python benchmarks/bench_pupil_fallback.py --iterations 2000
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from KalEmc.pupil_detector import PupilDetector
+
+def make_frame(width=640, height=480):
+    """Synthetic frame with two bright eye regions and dark pupils"""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(90, 140, size=(height, width, 3), dtype=np.uint8)
+    left_eye = np.array([(380, 240, 0), (395, 232, 0), (410, 232, 0),
+                         (425, 240, 0), (410, 248, 0), (395, 248, 0)], dtype=np.float64)
+    right_eye = left_eye - (170, 0, 0)
+    for eye, pupil in ((left_eye, (405, 240)), (right_eye, (235, 241))):
+        cv2.fillPoly(frame, [eye[:, :2].astype(np.int32)], (220, 220, 220))
+        cv2.circle(frame, pupil, 4, (20, 20, 20), -1)
+    return frame, left_eye, right_eye
+
+def legacy_detect(frame, eye_points):
+    """Previous implementation: full-frame mask, two conversions, darkest pixel"""
+    mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+    cv2.fillPoly(mask, [eye_points[:, :2].astype(np.int32)], 255)
+    eye_roi = cv2.bitwise_and(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+                              cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), mask=mask)
+    eye_roi = cv2.GaussianBlur(eye_roi, (7, 7), 0)
+    _, _, min_loc, _ = cv2.minMaxLoc(eye_roi, mask=mask)
+    return min_loc
+
+def time_per_frame(func, iterations):
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    return samples * 1e6  # microseconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fallback pupil detector")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    frame, left_eye, right_eye = make_frame()
+    detector = PupilDetector()
+    gray = None
+
+    def current():
+        nonlocal gray
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        detector.detect(gray, left_eye)
+        detector.detect(gray, right_eye)
+
+    def legacy():
+        legacy_detect(frame, left_eye)
+        legacy_detect(frame, right_eye)
+
+    # Warm up caches and buffers
+    current()
+    legacy()
+
+    for name, func in (("legacy", legacy), ("roi", current)):
+        samples = time_per_frame(func, args.iterations)
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        print(f"{name:>8}: p50={p50:8.1f}us  p95={p95:8.1f}us  p99={p99:8.1f}us  (both eyes per frame)")
+
+if __name__ == "__main__":
+    main()
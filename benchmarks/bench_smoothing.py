@@ -0,0 +1,153 @@
+"""
+Jitter versus lag of the gaze smoothing filters.
+
+Runs a set of filter configurations over the combined gaze signal of a
+recorded session (a GazeRecorder file) or of a synthetic session of noisy
+fixations and saccades, and reports for each:
+
+    jitter  RMS sample-to-sample movement of the output during fixations
+    lag     delay that best aligns the output with the raw signal
+    error   RMS distance to the true gaze (synthetic sessions only)
+
+With --max-lag-ms, the configuration with the least jitter within that lag
+budget is marked, which is the one to pick for that user.
+
+    python benchmarks/bench_smoothing.py
+    python benchmarks/bench_smoothing.py --recording session.gaze --max-lag-ms 60
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from KalEmc.gaze_recorder import GazeRecording
+from KalEmc.smoothing import create_filter
+
+CONFIGS = [
+    ('none', 'none', {}),
+    ('ema 0.5', 0.5, {}),
+    ('ema 0.7', 0.7, {}),
+    ('ema 0.85', 0.85, {}),
+    ('one_euro 0.5/0.3', 'one_euro', {'min_cutoff': 0.5, 'beta': 0.3}),
+    ('one_euro 1.0/0.5', 'one_euro', {'min_cutoff': 1.0, 'beta': 0.5}),
+    ('one_euro 1.0/2.0', 'one_euro', {'min_cutoff': 1.0, 'beta': 2.0}),
+    ('one_euro 2.0/1.0', 'one_euro', {'min_cutoff': 2.0, 'beta': 1.0}),
+    ('kalman 10', 'kalman', {'process_noise': 10.0, 'measurement_noise': 0.001}),
+    ('kalman 50', 'kalman', {'process_noise': 50.0, 'measurement_noise': 0.001}),
+    ('kalman 500', 'kalman', {'process_noise': 500.0, 'measurement_noise': 0.001}),
+]
+
+def synthetic_session(duration=30.0, fps=60.0, noise=0.03, seed=0):
+    """Fixations on random targets joined by 40 ms saccades; returns (times, raw, truth)"""
+    rng = np.random.default_rng(seed)
+    n = int(duration * fps)
+    times = np.arange(n) / fps
+    truth = np.empty((n, 2))
+    position = np.zeros(2)
+    i = 0
+    while i < n:
+        target = rng.uniform(-1.5, 1.5, 2)
+        saccade = int(0.04 * fps)
+        for k in range(min(saccade, n - i)):
+            truth[i + k] = position + (target - position) * (k + 1) / saccade
+        i += saccade
+        fixation = int(rng.uniform(0.3, 1.0) * fps)
+        truth[i:i + fixation] = target
+        i += fixation
+        position = target
+    raw = truth + rng.normal(0, noise, truth.shape)
+    return times, raw, truth
+
+def recorded_session(path):
+    """Gaze signal as GestureController sees it, from frames with pupils"""
+    records = GazeRecording(path).records
+    records = records[records['has_pupils'] == 1]
+    raw = (records['left_pupil_relative'] + records['right_pupil_relative']).astype(np.float64) * 1.5
+    return records['timestamp'].astype(np.float64), raw, None
+
+def fixation_mask(times, raw, speed_threshold, settle=0.2):
+    """Samples whose locally averaged speed has been below speed_threshold units/s for settle seconds.
+
+    Skipping the start of each fixation keeps a filter still catching up
+    after a saccade from counting as jitter; that shows up as lag instead.
+    """
+    kernel = np.ones(5) / 5
+    smooth = np.stack([np.convolve(raw[:, axis], kernel, mode='same') for axis in range(2)], axis=1)
+    slow = np.linalg.norm(np.gradient(smooth, times, axis=0), axis=1) < speed_threshold
+
+    # Time since the last fast sample
+    index = np.arange(len(times))
+    last_fast = np.maximum.accumulate(np.where(slow, 0, index))
+    return slow & (times - times[last_fast] >= settle)
+
+def run_filter(times, raw, smoothing, params):
+    gaze_filter = create_filter(smoothing, **params)
+    out = np.empty_like(raw)
+    for i in range(len(raw)):
+        out[i] = gaze_filter.filter(raw[i], times[i])
+    return out
+
+def measure(times, raw, out, fixating, max_shift):
+    steps = np.linalg.norm(np.diff(out, axis=0), axis=1)
+    both = fixating[1:] & fixating[:-1]
+    jitter = float(np.sqrt(np.mean(steps[both] ** 2))) if both.any() else float('nan')
+
+    # The shift that makes the output best match the raw signal
+    errors = [np.mean((out[shift:] - raw[:len(raw) - shift]) ** 2) for shift in range(max_shift)]
+    lag = int(np.argmin(errors)) * float(np.median(np.diff(times)))
+    return jitter, lag
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gaze smoothing filters by jitter and lag")
+    parser.add_argument("--recording", help="Gaze recording to use instead of a synthetic session")
+    parser.add_argument("--fps", type=float, default=60.0, help="Synthetic session sample rate")
+    parser.add_argument("--noise", type=float, default=0.03, help="Synthetic session noise (gaze units)")
+    parser.add_argument("--speed-threshold", type=float, default=1.5,
+                        help="Gaze speed (units/s) below which samples count as fixation")
+    parser.add_argument("--max-lag-ms", type=float, help="Mark the least jittery filter within this lag")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    if args.recording:
+        times, raw, truth = recorded_session(args.recording)
+    else:
+        times, raw, truth = synthetic_session(fps=args.fps, noise=args.noise)
+    if len(raw) < 10:
+        raise SystemExit("Not enough samples with pupils")
+
+    fixating = fixation_mask(times, raw, args.speed_threshold)
+    max_shift = min(30, len(raw) // 2)
+
+    results = []
+    for name, smoothing, params in CONFIGS:
+        out = run_filter(times, raw, smoothing, params)
+        jitter, lag = measure(times, raw, out, fixating, max_shift)
+        result = {'filter': name, 'smoothing': smoothing, 'params': params,
+                  'jitter': jitter, 'lag_ms': lag * 1000}
+        if truth is not None:
+            result['error'] = float(np.sqrt(np.mean(np.sum((out - truth) ** 2, axis=1))))
+        results.append(result)
+
+    best = None
+    if args.max_lag_ms is not None:
+        within = [result for result in results if result['lag_ms'] <= args.max_lag_ms]
+        if within:
+            best = min(within, key=lambda result: result['jitter'])
+
+    print(f"{len(raw)} samples, {fixating.mean() * 100:.0f}% settled fixation")
+    print(f"{'filter':<20} {'jitter':>9} {'lag ms':>8}" + (f" {'error':>8}" if truth is not None else ""))
+    for result in results:
+        line = f"{result['filter']:<20} {result['jitter']:9.4f} {result['lag_ms']:8.1f}"
+        if truth is not None:
+            line += f" {result['error']:8.4f}"
+        if result is best:
+            line += "  <- best within lag budget"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'samples': len(raw), 'results': results, 'best': best and best['filter']}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Per-stage benchmark suite for the tracking pipeline.
+
+Runs each stage on synthetic frames (default) or a recorded video / image
+directory, reports p50/p95/p99 latency and frames per second, and writes
+machine-readable JSON that can be compared across commits.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --source session.mp4 --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from KalEmc.eye_tracker import EyeTracker
+from KalEmc.frame_source import FrameSource, create_frame_source
+from KalEmc.gaze_recorder import CountingMouseController
+from KalEmc.gaze_sample import BlinkInfo, GazeSample
+from KalEmc.gesture_controller import GestureController
+
+from bench_pupil_fallback import make_frame
+
+class SyntheticSource(FrameSource):
+    """In-memory frames so capture can be measured without a camera"""
+    def __init__(self, count=64, width=640, height=480):
+        super().__init__("synthetic")
+        rng = np.random.default_rng(0)
+        self.frames = [rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8) for _ in range(count)]
+        self.index = 0
+        self.opened = False
+
+    def open(self):
+        self.opened = True
+        return True
+
+    def is_opened(self):
+        return self.opened
+
+    def read(self):
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame
+
+    def get_frame_size(self):
+        return self.frames[0].shape[1], self.frames[0].shape[0]
+
+def synthetic_landmarks(count=478, seed=0):
+    """Face-like landmark set shaped like FaceMesh output"""
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(0.3, 0.7, count)
+    ys = rng.uniform(0.3, 0.7, count)
+    zs = rng.uniform(-0.05, 0.05, count)
+    return [SimpleNamespace(x=x, y=y, z=z) for x, y, z in zip(xs, ys, zs)]
+
+def load_frames(spec, limit):
+    """Read up to limit frames from a FrameSource spec, or synthetic frames"""
+    if spec is None:
+        return [make_frame()[0]]
+
+    source = create_frame_source(spec)
+    if not source.open():
+        raise SystemExit(f"Cannot open {spec}")
+    frames = []
+    while len(frames) < limit:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(cv2.flip(frame, 1))
+    source.release()
+    if not frames:
+        raise SystemExit(f"No frames in {spec}")
+    return frames
+
+def cycle(items):
+    """Return a function handing out items round-robin"""
+    state = {'i': 0}
+
+    def next_item():
+        item = items[state['i'] % len(items)]
+        state['i'] += 1
+        return item
+    return next_item
+
+def measure(func, iterations, warmup=5):
+    for _ in range(warmup):
+        func()
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    return samples
+
+def summarize(samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    mean = float(samples.mean())
+    return {
+        'iterations': int(len(samples)),
+        'mean_ms': mean * 1000,
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'fps': 1.0 / mean if mean > 0 else float('inf')
+    }
+
+def build_stages(args):
+    """Return an ordered dict of stage name -> zero-argument callable"""
+    frames = load_frames(args.source, args.iterations)
+    rgb_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+    next_frame = cycle(frames)
+    next_rgb_frame = cycle(rgb_frames)
+
+    tracker = EyeTracker(source=SyntheticSource())
+    tracker.initialize_camera()
+    landmarks = synthetic_landmarks()
+    h, w = frames[0].shape[:2]
+
+    _, left_eye, right_eye = make_frame()
+    gray = cv2.cvtColor(make_frame()[0], cv2.COLOR_BGR2GRAY)
+
+    blink_clock = {'t': 0.0, 'n': 0}
+    left_blink, right_blink = BlinkInfo(), BlinkInfo()
+    open_ears = np.array([0.3, 0.3])
+    closed_ears = np.array([0.1, 0.1])
+
+    def classify_blink():
+        # Alternate open and closed so the window always holds blinks; the
+        # detector's window fills up after its first capacity calls
+        blink_clock['t'] += 1 / 30
+        blink_clock['n'] += 1
+        ears = closed_ears if blink_clock['n'] % 10 < 3 else open_ears
+        tracker.blink_detector.update(blink_clock['t'], ears, left_blink, right_blink)
+
+    gesture = GestureController(CountingMouseController())
+    gaze_sample = GazeSample()
+    gaze_sample.left_pupil.set(300, 200, 0.3, -0.1)
+    gaze_sample.right_pupil.set(200, 200, 0.2, -0.2)
+    gaze_sample.has_pupils = True
+
+    stages = {
+        'capture_frame': tracker.capture_frame,
+        'cvtColor': lambda: cv2.cvtColor(next_frame(), cv2.COLOR_BGR2RGB),
+        'face_mesh.process': lambda: tracker.face_mesh.process(next_rgb_frame()),
+        'landmark_extraction': lambda: tracker._extract_landmarks(landmarks, w, h),
+        'pupil_fallback': lambda: (tracker._detect_pupil(gray, left_eye, out=gaze_sample.left_pupil),
+                                   tracker._detect_pupil(gray, right_eye, out=gaze_sample.right_pupil)),
+        'blink_detector': classify_blink,
+        'process_gaze': lambda: gesture._process_gaze(gaze_sample),
+    }
+
+    if args.source is not None:
+        stages['detect_eyes'] = lambda: tracker.detect_eyes(next_frame())
+
+    move_to = mouse_move_stage(args.live_mouse)
+    if move_to is not None:
+        stages['MouseController.move_to'] = move_to
+
+    return stages, tracker
+
+def mouse_move_stage(live):
+    """MouseController.move_to, with the OS call stubbed out unless live"""
+    try:
+        import pyautogui
+        from KalEmc.mouse_controller import MouseController
+    except Exception as e:
+        print(f"Skipping MouseController.move_to: {e}", file=sys.stderr)
+        return None
+
+    controller = MouseController()
+    positions = [(controller.screen_width // 2 + dx, controller.screen_height // 2) for dx in range(-20, 21, 4)]
+    state = {'i': 0}
+
+    def move():
+        x, y = positions[state['i'] % len(positions)]
+        state['i'] += 1
+        controller.move_to(x, y)
+
+    if not live:
+        # Measure the wrapper without moving the real pointer
+        pyautogui.moveTo = lambda *args, **kwargs: None
+    return move
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(results, baseline_path, threshold, min_delta_ms):
+    """Print per-stage p50/p95 changes; return True if any stage regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    regressed = False
+    print(f"\nComparison with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for name, stats in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            print(f"  {name:<26} (new stage)")
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms'):
+            # Ignore sub-resolution noise on very cheap stages
+            if base[key] > 0 and stats[key] - base[key] > min_delta_ms:
+                changes.append((stats[key] - base[key]) / base[key])
+        worst = max(changes) if changes else 0.0
+        flag = "REGRESSION" if worst > threshold else ""
+        regressed = regressed or worst > threshold
+        print(f"  {name:<26} p50 {base['p50_ms']:8.3f} -> {stats['p50_ms']:8.3f} ms  "
+              f"p95 {base['p95_ms']:8.3f} -> {stats['p95_ms']:8.3f} ms  {flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the tracking pipeline")
+    parser.add_argument("--source", help="Video file or image directory to use instead of synthetic frames")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--stages", nargs="*", help="Only run these stages")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative p50/p95 slowdown counted as a regression (default 0.15)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="Absolute slowdown in ms below which changes are ignored (default 0.01)")
+    parser.add_argument("--live-mouse", action="store_true",
+                        help="Really move the pointer in the MouseController.move_to stage")
+    args = parser.parse_args()
+
+    stages, tracker = build_stages(args)
+    if args.stages:
+        stages = {name: func for name, func in stages.items() if name in args.stages}
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'opencv': cv2.__version__,
+            'source': args.source or 'synthetic',
+            'iterations': args.iterations
+        },
+        'stages': {}
+    }
+
+    print(f"{'stage':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'fps':>10}")
+    try:
+        for name, func in stages.items():
+            stats = summarize(measure(func, args.iterations))
+            results['stages'][name] = stats
+            print(f"{name:<26} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} {stats['fps']:10.1f}")
+    finally:
+        tracker.release()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold, args.min_delta):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -49,6 +49,7 @@ class SystemTrayApp:
         menu_items = [
             pystray.MenuItem('Start Assistant', self.start_assistant),
             pystray.MenuItem('Stop Assistant', self.stop_assistant),
+            pystray.MenuItem('Calibrate', self.calibrate_assistant),
             pystray.MenuItem('Settings', self.show_settings),
             pystray.MenuItem('Exit', self.exit_app)
         ]
@@ -69,7 +70,7 @@ class SystemTrayApp:
             def __init__(self, name, parent):
                 super().__init__(name)
                 self.parent = parent
-                self.menu = ["Start Assistant", "Stop Assistant", "Settings", "Exit"]
+                self.menu = ["Start Assistant", "Stop Assistant", "Calibrate", "Settings", "Exit"]
                 
                 # Auto-start if configured
                 if self.parent.settings.get('autostart', False):
@@ -83,6 +84,10 @@ class SystemTrayApp:
             def stop(self, _):
                 self.parent.stop_assistant()
             
+            @rumps.clicked("Calibrate")
+            def calibrate(self, _):
+                self.parent.calibrate_assistant()
+            
             @rumps.clicked("Settings")
             def settings(self, _):
                 self.parent.show_settings()
@@ -117,6 +122,11 @@ class SystemTrayApp:
         stop_item.connect("activate", self.stop_assistant)
         menu.append(stop_item)
         
+        # Calibrate item
+        calibrate_item = Gtk.MenuItem.new_with_label("Calibrate")
+        calibrate_item.connect("activate", self.calibrate_assistant)
+        menu.append(calibrate_item)
+        
         # Settings item
         settings_item = Gtk.MenuItem.new_with_label("Settings")
         settings_item.connect("activate", self.show_settings)
@@ -171,7 +181,8 @@ class SystemTrayApp:
             # Create and start the assistant
             self.assistant = EyeMouseAssistant(
                 wake_word=self.settings.get('wake_word', "wake up"),
-                sleep_word=self.settings.get('sleep_word', "go to sleep")
+                sleep_word=self.settings.get('sleep_word', "go to sleep"),
+                idle_release=self.settings.get('idle_release', 30.0)
             )
             
             # Configure from settings
@@ -194,6 +205,14 @@ class SystemTrayApp:
             self.assistant = None
             logger.info("Assistant stopped")
     
+    def calibrate_assistant(self, *args):
+        if self.assistant and self.assistant_thread and self.assistant_thread.is_alive():
+            logger.info("Starting gaze calibration")
+            calibration_thread = threading.Thread(target=self.assistant.calibrate,
+                                                  kwargs={'points': self.settings.get('calibration_points', 9)})
+            calibration_thread.daemon = True
+            calibration_thread.start()
+    
     def show_settings(self, *args):
         system = platform.system()
         
@@ -232,7 +251,7 @@ class SystemTrayApp:
         # Smoothing
         ttk.Label(settings_window, text="Smoothing:").grid(column=0, row=3, padx=10, pady=10, sticky=tk.W)
         smoothing_var = tk.DoubleVar(value=self.settings.get('smoothing', 0.7))
-        ttk.Scale(settings_window, from_=0, to=1, variable=smoothing_var, orient=tk.HORIZONTAL).grid(
+        ttk.Scale(settings_window, from_=0, to=0.95, variable=smoothing_var, orient=tk.HORIZONTAL).grid(
             column=1, row=3, padx=10, pady=10, sticky=tk.W+tk.E)
         
         # Autostart
@@ -348,7 +367,7 @@ class SystemTrayApp:
         # Smoothing
         hbox4 = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         hbox4.pack_start(Gtk.Label("Smoothing:"), False, False, 0)
-        smoothing_scale = Gtk.Scale.new_with_range(Gtk.Orientation.HORIZONTAL, 0, 1, 0.1)
+        smoothing_scale = Gtk.Scale.new_with_range(Gtk.Orientation.HORIZONTAL, 0, 0.9, 0.1)
         smoothing_scale.set_value(self.settings.get('smoothing', 0.7))
         hbox4.pack_start(smoothing_scale, True, True, 0)
         content_area.pack_start(hbox4, False, False, 0)
@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+from KalEmc.blink_detector import BlinkDetector, eye_aspect_ratio
+from KalEmc.gaze_sample import BlinkInfo
+
+OPEN = 0.30
+CLOSED = 0.08
+
+def run(detector, ears, fps=60.0, start=0.0):
+    """Feed (left, right) EAR pairs at a fixed rate and return the BlinkInfo pairs"""
+    results = []
+    for i, pair in enumerate(ears):
+        left, right = BlinkInfo(), BlinkInfo()
+        detector.update(start + i / fps, np.asarray(pair, dtype=np.float64), left, right)
+        results.append((left, right))
+    return results
+
+def blink(seconds, fps=60.0, left=True, right=True):
+    n = int(round(seconds * fps))
+    return [(CLOSED if left else OPEN, CLOSED if right else OPEN)] * n
+
+def open_eyes(seconds, fps=60.0):
+    return [(OPEN, OPEN)] * int(round(seconds * fps))
+
+class TestEyeAspectRatio(unittest.TestCase):
+    def test_ratio(self):
+        # Corners 4 apart, both lid pairs 1 apart: (1 + 1) / (2 * 4)
+        eye = np.array([(0, 0), (1, -0.5), (3, -0.5), (4, 0), (3, 0.5), (1, 0.5)], dtype=np.float64)
+        ears = eye_aspect_ratio(np.stack([eye, eye * 3]))
+        np.testing.assert_allclose(ears, [0.25, 0.25])
+
+class TestBlinkDetector(unittest.TestCase):
+    def test_single_blink(self):
+        detector = BlinkDetector()
+        results = run(detector, open_eyes(1.0) + blink(0.2) + open_eyes(0.1))
+        completed = [(i, left) for i, (left, _) in enumerate(results) if left.blink_detected]
+        self.assertEqual(len(completed), 1)
+
+        index, left = completed[0]
+        self.assertEqual(index, 72)
+        self.assertAlmostEqual(left.duration, 0.2)
+        self.assertFalse(left.long_blink)
+        self.assertFalse(left.double_blink)
+        self.assertFalse(left.wink)
+        self.assertTrue(results[index][1].blink_detected)
+
+        # While closed, the duration keeps growing
+        self.assertTrue(results[70][0].is_closed)
+        self.assertAlmostEqual(results[70][0].duration, 10 / 60)
+
+    def test_long_and_double_blink(self):
+        detector = BlinkDetector()
+        results = run(detector, open_eyes(1.0) + blink(1.2) + open_eyes(0.2) + blink(0.1) + open_eyes(0.1))
+        completed = [left for left, _ in results if left.blink_detected]
+        self.assertEqual(len(completed), 2)
+        self.assertTrue(completed[0].long_blink)
+        self.assertFalse(completed[0].double_blink)
+        self.assertFalse(completed[1].long_blink)
+        self.assertTrue(completed[1].double_blink)
+
+    def test_blinks_far_apart_are_not_double(self):
+        detector = BlinkDetector()
+        results = run(detector, open_eyes(1.0) + blink(0.1) + open_eyes(1.0) + blink(0.1) + open_eyes(0.1))
+        completed = [left for left, _ in results if left.blink_detected]
+        self.assertEqual(len(completed), 2)
+        self.assertFalse(any(left.double_blink for left in completed))
+
+    def test_wink(self):
+        detector = BlinkDetector(wink_duration=0.2)
+        results = run(detector, open_eyes(1.0) + blink(0.3, left=False))
+        self.assertFalse(any(left.wink for left, _ in results))
+
+        winks = [i for i, (_, right) in enumerate(results) if right.wink]
+        # The right eye must stay closed alone for wink_duration first
+        self.assertAlmostEqual((winks[0] - 60) / 60, 0.2, delta=1 / 60)
+        self.assertEqual(winks[-1], len(results) - 1)
+
+        # Both eyes closing is a blink, not a wink
+        results = run(BlinkDetector(), open_eyes(1.0) + blink(0.5))
+        self.assertFalse(any(left.wink or right.wink for left, right in results))
+
+    def test_threshold_adapts_to_user(self):
+        # An eye whose open EAR (0.17) is below the default closed threshold
+        detector = BlinkDetector()
+        self.assertGreater(detector.threshold[0], 0.17)
+        results = run(detector, [(0.17, 0.17)] * 60 + [(0.05, 0.05)] * 6 + [(0.17, 0.17)] * 3)
+        self.assertAlmostEqual(detector.baseline[0], 0.17)
+        self.assertLess(detector.threshold[0], 0.17)
+        self.assertFalse(results[59][0].is_closed)
+        self.assertEqual(sum(left.blink_detected for left, _ in results), 1)
+
+    def test_window_wraps(self):
+        # Many times the ring capacity, at 120 fps; every blink is still found
+        detector = BlinkDetector(capacity=64)
+        cycle = open_eyes(0.4, fps=120) + blink(0.1, fps=120)
+        results = run(detector, cycle * 20, fps=120)
+        completed = [left for left, _ in results if left.blink_detected]
+        self.assertEqual(len(completed), 19)
+        for left in completed:
+            self.assertAlmostEqual(left.duration, 0.1)
+            self.assertFalse(left.double_blink)
+
+        detector.reset()
+        self.assertEqual(detector.count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
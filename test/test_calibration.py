@@ -0,0 +1,127 @@
+import queue
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from KalEmc.calibration import (CalibrationSession, HomographyMapping, PolynomialMapping, _calibration_main,
+                                calibration_targets, create_mapping)
+from KalEmc.gaze_sample import GazeSample
+from KalEmc.gesture_controller import GestureController
+
+def gaze_for(screen):
+    """Synthetic gaze signal: a mildly nonlinear, offset function of the screen target"""
+    screen = np.asarray(screen, dtype=np.float64)
+    x = 0.4 * screen[..., 0] - 0.2 + 0.05 * screen[..., 1] ** 2
+    y = 0.3 * screen[..., 1] - 0.15 + 0.03 * screen[..., 0] * screen[..., 1]
+    return np.stack([x, y], axis=-1)
+
+class TestCalibration(unittest.TestCase):
+    def test_targets(self):
+        targets = calibration_targets(9)
+        self.assertEqual(targets.shape, (9, 2))
+        np.testing.assert_allclose(targets[0], (0.1, 0.1))
+        np.testing.assert_allclose(targets[4], (0.5, 0.5))
+        self.assertEqual(calibration_targets(16).shape, (16, 2))
+        with self.assertRaises(ValueError):
+            calibration_targets(12)
+
+    def test_polynomial_recovers_mapping(self):
+        for points in (9, 16):
+            targets = calibration_targets(points)
+            mapping = create_mapping('polynomial', points)
+            residual = mapping.fit(gaze_for(targets), targets)
+            self.assertLess(residual, 0.01)
+
+            # Also accurate between the targets
+            probe = np.array([0.3, 0.7])
+            np.testing.assert_allclose(mapping.apply(gaze_for(probe)), probe, atol=0.02)
+        self.assertEqual(create_mapping('polynomial', 16).degree, 3)
+
+    def test_homography_recovers_projective_mapping(self):
+        matrix = np.array([[0.5, 0.1, -0.2], [0.05, 0.4, -0.1], [0.2, 0.1, 1.0]])
+        targets = calibration_targets(9)
+        projected = np.c_[targets, np.ones(9)] @ np.linalg.inv(matrix).T
+        gaze = projected[:, :2] / projected[:, 2:]
+
+        mapping = HomographyMapping()
+        self.assertLess(mapping.fit(gaze, targets), 1e-9)
+        out = np.zeros(2)
+        self.assertIs(mapping.apply(gaze[3], out=out), out)
+        np.testing.assert_allclose(out, targets[3])
+
+    def test_too_few_points(self):
+        targets = calibration_targets(9)
+        with self.assertRaises(ValueError):
+            PolynomialMapping(degree=3).fit(gaze_for(targets), targets)
+
+    def test_session_skips_settle_and_takes_median(self):
+        targets = calibration_targets(9)
+        session = CalibrationSession(targets, samples_per_target=5, settle=0.5)
+        t = 0.0
+        for index in range(9):
+            true_gaze = gaze_for(targets[index])
+            # Glances elsewhere while settling are ignored
+            for _ in range(10):
+                self.assertFalse(session.add_sample((9.0, 9.0), t))
+                t += 0.04
+            t += 0.2
+            samples = [true_gaze] * 4 + [true_gaze + 5.0]
+            done = [session.add_sample(sample, t + i * 0.03) for i, sample in enumerate(samples)]
+            self.assertEqual(done, [False] * 4 + [True])
+            t += 0.5
+        self.assertTrue(session.finished)
+        np.testing.assert_allclose(session.gaze, gaze_for(targets))
+
+        mapping, residual = session.fit('polynomial')
+        self.assertIsInstance(mapping, PolynomialMapping)
+        self.assertLess(residual, 0.01)
+
+    def run_window(self, samples, key=-1):
+        sample_queue = queue.Queue()
+        result_queue = queue.Queue()
+        for sample in samples:
+            sample_queue.put(sample)
+        with patch('KalEmc.calibration.cv2') as cv2:
+            cv2.waitKey.return_value = key
+            _calibration_main(calibration_targets(9), (320, 180), 5, 10.0, sample_queue, result_queue, "test")
+        cv2.destroyAllWindows.assert_called_once()
+        return result_queue.get_nowait(), cv2
+
+    def test_window_process_collects_streamed_samples(self):
+        targets = calibration_targets(9)
+        samples = []
+        for index, target in enumerate(targets):
+            gaze = gaze_for(target)
+            # The first five fall within the settle time, the next five are kept
+            samples += [(gaze[0], gaze[1], index * 10 + i * 0.13) for i in range(10)]
+        gaze, cv2 = self.run_window(samples)
+        np.testing.assert_allclose(gaze, gaze_for(targets))
+        self.assertGreater(cv2.imshow.call_count, 0)
+
+    def test_window_process_cancelled_by_esc(self):
+        gaze, _ = self.run_window([(0.0, 0.0, 0.0)], key=27)
+        self.assertIsNone(gaze)
+
+    def test_gesture_controller_uses_mapping(self):
+        mouse = MagicMock()
+        mouse.get_screen_size.return_value = (1920, 1080)
+        controller = GestureController(mouse, smoothing='none')
+
+        targets = calibration_targets(9)
+        mapping = create_mapping('homography')
+        mapping.fit(targets * 0.5 - 0.25, targets)
+        controller.set_gaze_mapping(mapping)
+
+        # gaze_signal is 1.5 * the sum of both eyes' relative positions
+        sample = GazeSample()
+        sample.has_pupils = True
+        sample.timestamp = 1.0
+        for pupil in (sample.left_pupil, sample.right_pupil):
+            pupil.relative_x = (0.75 * 0.5 - 0.25) / 3
+            pupil.relative_y = (0.25 * 0.5 - 0.25) / 3
+        controller._process_gaze(sample)
+        x, y = mouse.move_to.call_args[0]
+        self.assertAlmostEqual(x, 0.75 * 1920, delta=2)
+        self.assertAlmostEqual(y, 0.25 * 1080, delta=2)
+
+if __name__ == '__main__':
+    unittest.main()
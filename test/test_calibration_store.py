@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from KalEmc.calibration import HomographyMapping, calibration_targets, create_mapping
+from KalEmc.calibration_store import load_profile, profile_key, profile_path, save_profile
+
+class TestCalibrationStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.targets = calibration_targets(16)
+        self.gaze = self.targets * 0.4 - 0.2 + 0.02 * self.targets ** 2
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        key = profile_key("0:HD Webcam", (1920, 1080), user="alice")
+        for model in ('polynomial', 'homography'):
+            mapping = create_mapping(model, 16)
+            residual = mapping.fit(self.gaze, self.targets)
+            path = save_profile(key, mapping, residual, directory=self.directory)
+            self.assertTrue(os.path.exists(path))
+
+            loaded, loaded_residual = load_profile(key, directory=self.directory)
+            self.assertIsInstance(loaded, type(mapping))
+            self.assertAlmostEqual(loaded_residual, residual)
+            probe = np.array([0.1, 0.3])
+            np.testing.assert_allclose(loaded.apply(probe), mapping.apply(probe))
+
+    def test_profiles_are_keyed(self):
+        mapping = HomographyMapping()
+        residual = mapping.fit(self.gaze, self.targets)
+        key = profile_key("0:HD Webcam", (1920, 1080), user="alice")
+        save_profile(key, mapping, residual, directory=self.directory)
+
+        self.assertIsNone(load_profile(profile_key("0:HD Webcam", (2560, 1440), user="alice"), self.directory))
+        self.assertIsNone(load_profile(profile_key("1:USB Camera", (1920, 1080), user="alice"), self.directory))
+        self.assertIsNone(load_profile(profile_key("0:HD Webcam", (1920, 1080), user="bob"), self.directory))
+
+    def test_corrupt_profile_ignored(self):
+        key = profile_key("0", (800, 600), user="alice")
+        with open(profile_path(key, self.directory), 'wb') as f:
+            f.write(b'garbage')
+        self.assertIsNone(load_profile(key, self.directory))
+
+if __name__ == '__main__':
+    unittest.main()
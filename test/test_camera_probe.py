@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from KalEmc.camera_probe import (candidate_modes, decode_fourcc, get_camera_mode, load_cached_modes,
+                                 probe_camera)
+from KalEmc.clock import ManualClock
+
+class FakeCapture:
+    """Camera that only does 1280x720 in MJPG and delivers 60 fps only in MJPG"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.props = {}
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH and value > 640 and self._fourcc() != 'MJPG':
+            value = 640
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT and value > 480 and self._fourcc() != 'MJPG':
+            value = 480
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def _fourcc(self):
+        return decode_fourcc(self.props.get(cv2.CAP_PROP_FOURCC, 0))
+
+    def read(self):
+        fps = min(self.props[cv2.CAP_PROP_FPS], 60 if self._fourcc() == 'MJPG' else 30)
+        # Deeper driver queues make each read a little slower here
+        self.clock.advance(1.0 / fps + self.props[cv2.CAP_PROP_BUFFERSIZE] * 0.002)
+        return True, np.zeros((2, 2, 3), dtype=np.uint8)
+
+    def release(self):
+        self.opened = False
+
+class TestCameraProbe(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, "camera_modes.json")
+        self.clock = ManualClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def probe_kwargs(self):
+        return {'capture_factory': lambda camera_id: FakeCapture(self.clock), 'clock': self.clock, 'frames': 10}
+
+    def test_candidate_modes(self):
+        modes = candidate_modes(fourccs=('MJPG',), resolutions=((640, 480),), frame_rates=(30,), buffer_sizes=(1, 4))
+        self.assertEqual([mode['buffer_size'] for mode in modes], [1, 4])
+
+    def test_probe_picks_fastest_mode(self):
+        results = probe_camera(0, **self.probe_kwargs())
+        best = results[0]
+        self.assertEqual(best['mode']['fourcc'], 'MJPG')
+        self.assertEqual(best['mode']['fps'], 60)
+        self.assertEqual(best['mode']['buffer_size'], 1)
+        self.assertEqual((best['mode']['width'], best['mode']['height']), (640, 480))
+        self.assertAlmostEqual(best['delivered_fps'], 1 / (1 / 60 + 0.002), places=3)
+
+        # YUYV requests for 1280x720 fell back to 640x480 and were measured once
+        yuyv = [result['mode'] for result in results if result['mode']['fourcc'] == 'YUYV']
+        self.assertEqual(len(yuyv), 4)
+
+    def test_get_camera_mode_is_cached(self):
+        mode = get_camera_mode(0, cache_path=self.cache_path, **self.probe_kwargs())
+        self.assertEqual(len(load_cached_modes(self.cache_path)), 1)
+
+        # A second call must not touch the camera
+        def no_camera(camera_id):
+            raise AssertionError("camera probed again")
+        cached = get_camera_mode(0, cache_path=self.cache_path, capture_factory=no_camera)
+        self.assertEqual(cached, mode)
+
+if __name__ == '__main__':
+    unittest.main()
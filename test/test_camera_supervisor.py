@@ -0,0 +1,93 @@
+import unittest
+from KalEmc.camera_supervisor import CameraSupervisor, HEALTHY, UNAVAILABLE
+from KalEmc.clock import ManualClock
+from KalEmc.frame_source import FrameSource
+
+class FlakySource(FrameSource):
+    """Source whose open() fails a given number of times"""
+    def __init__(self, open_failures=0, present=True):
+        super().__init__("flaky")
+        self.open_failures = open_failures
+        self.present = present
+        self.open_calls = 0
+        self.released = 0
+
+    def open(self):
+        self.open_calls += 1
+        if not self.present or self.open_failures > 0:
+            self.open_failures -= 1
+            return False
+        return True
+
+    def is_present(self):
+        return self.present
+
+    def release(self):
+        self.released += 1
+
+class TestCameraSupervisor(unittest.TestCase):
+    def make_supervisor(self, source, **kwargs):
+        self.clock = ManualClock(100.0)
+        supervisor = CameraSupervisor(source, failure_threshold=3, initial_backoff=0.001, max_backoff=0.004,
+                                      presence_interval=0.001, clock=self.clock, **kwargs)
+        self.addCleanup(supervisor.stop)
+        return supervisor
+
+    def test_lost_after_consecutive_failures(self):
+        supervisor = self.make_supervisor(FlakySource(open_failures=1000))
+        supervisor.report_failure()
+        supervisor.report_failure()
+        supervisor.report_success()
+        supervisor.report_failure()
+        self.assertTrue(supervisor.available)
+
+        for _ in range(3):
+            supervisor.report_failure()
+        self.assertFalse(supervisor.available)
+        self.assertEqual(supervisor.state, UNAVAILABLE)
+        self.assertEqual(supervisor.source.released, 1)
+
+    def test_reconnects_with_backoff(self):
+        source = FlakySource(open_failures=4)
+        reconnected = []
+        supervisor = self.make_supervisor(source, on_reconnect=lambda: reconnected.append(True))
+
+        supervisor.mark_lost("test")
+        self.clock.advance(2.5)
+        self.assertTrue(supervisor.wait_available(5.0))
+
+        self.assertEqual(supervisor.state, HEALTHY)
+        self.assertEqual(source.open_calls, 5)
+        self.assertEqual(reconnected, [True])
+
+        stats = supervisor.get_stats()
+        self.assertEqual(stats['outages'], 1)
+        self.assertEqual(stats['reconnect_attempts'], 5)
+        self.assertAlmostEqual(stats['last_outage_duration'], 2.5)
+
+    def test_waits_for_replug(self):
+        source = FlakySource(present=False)
+        supervisor = self.make_supervisor(source)
+
+        supervisor.mark_lost("unplugged")
+        self.assertFalse(supervisor.wait_available(0.05))
+        # No open attempts while the device is gone
+        self.assertEqual(source.open_calls, 0)
+
+        source.present = True
+        self.assertTrue(supervisor.wait_available(5.0))
+        self.assertEqual(source.open_calls, 1)
+
+    def test_mark_lost_ignored_after_stop(self):
+        source = FlakySource()
+        supervisor = self.make_supervisor(source)
+        supervisor.stop()
+
+        supervisor.mark_lost("source closed")
+        self.assertTrue(supervisor.available)
+        self.assertEqual(supervisor.state, HEALTHY)
+        self.assertEqual(source.open_calls, 0)
+        self.assertEqual(source.released, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import time
+import numpy as np
+from KalEmc.capture import LatestFrameBuffer
+
+class TestLatestFrameBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = LatestFrameBuffer(size=3, max_age=0.1)
+
+    def test_get_returns_newest_frame(self):
+        for i in range(3):
+            self.buffer.put(np.full((2, 2), i, dtype=np.uint8))
+
+        frame, _ = self.buffer.get(timeout=0)
+        self.assertEqual(frame[0, 0], 2)
+
+        # The two unread frames were skipped
+        self.assertEqual(self.buffer.dropped_frames, 2)
+
+    def test_get_times_out_without_new_frame(self):
+        self.buffer.put(np.zeros((2, 2), dtype=np.uint8))
+        self.buffer.get(timeout=0)
+
+        # Nothing new since the last read
+        frame, timestamp = self.buffer.get(timeout=0.01)
+        self.assertIsNone(frame)
+        self.assertIsNone(timestamp)
+
+    def test_stale_frame_counted(self):
+        self.buffer.put(np.zeros((2, 2), dtype=np.uint8), timestamp=time.monotonic() - 1.0)
+        self.buffer.get(timeout=0)
+        self.assertEqual(self.buffer.stale_frames, 1)
+
+        self.buffer.put(np.zeros((2, 2), dtype=np.uint8))
+        self.buffer.get(timeout=0)
+        self.assertEqual(self.buffer.stale_frames, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from KalEmc.debug_preview import build_overlay, draw_debug_indicators
+from KalEmc.eye_tracker import EyeTracker
+from KalEmc.frame_source import FrameSource
+from KalEmc.gaze_sample import BlinkInfo, PupilInfo
+
+class StaticSource(FrameSource):
+    def __init__(self):
+        super().__init__("static")
+        self.opened = False
+
+    def open(self):
+        self.opened = True
+        return True
+
+    def is_opened(self):
+        return self.opened
+
+    def read(self):
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get_frame_size(self):
+        return 640, 480
+
+    def release(self):
+        self.opened = False
+
+class TestDebugPreview(unittest.TestCase):
+    def test_overlay_drawn(self):
+        left_eye = np.array([(100, 100, 0), (140, 90, 0), (180, 100, 0), (140, 110, 0)], dtype=np.float64)
+        right_eye = left_eye + (300, 0, 0)
+        overlay = build_overlay(left_eye, right_eye, PupilInfo(140, 100, 0.1, 0.0), PupilInfo(440, 100, 0.1, 0.0),
+                                BlinkInfo(is_closed=True), BlinkInfo())
+
+        # Plain values, copied out of the reused tracker objects
+        self.assertEqual(overlay['left_pupil'], (140, 100, 0.1, 0.0))
+        self.assertTrue(overlay['left_closed'])
+        self.assertEqual(overlay['right_eye'].dtype, np.int32)
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.assertIs(draw_debug_indicators(frame, overlay), frame)
+        # Red pupil dots and green eye outlines
+        np.testing.assert_array_equal(frame[100, 140], (0, 0, 255))
+        np.testing.assert_array_equal(frame[100, 440], (0, 0, 255))
+        np.testing.assert_array_equal(frame[100, 100], (0, 255, 0))
+        np.testing.assert_array_equal(frame[100, 400], (0, 255, 0))
+
+    def detect(self, debug_sink):
+        with patch('mediapipe.solutions.face_mesh.FaceMesh'):
+            tracker = EyeTracker(source=StaticSource(), debug_sink=debug_sink)
+        self.addCleanup(tracker.release)
+        face = MagicMock(landmark=[MagicMock(x=0.5 + i / 5000, y=0.5, z=0.0) for i in range(478)])
+        tracker.face_mesh = MagicMock()
+        tracker.face_mesh.process.return_value.multi_face_landmarks = [face]
+
+        frame = tracker.capture_frame()
+        with patch('KalEmc.eye_tracker.build_overlay', wraps=build_overlay) as overlay:
+            self.assertIsNotNone(tracker.detect_eyes(frame))
+        return frame, overlay
+
+    def test_sink_receives_frame_and_overlay(self):
+        sink = MagicMock()
+        frame, overlay = self.detect(sink)
+        overlay.assert_called_once()
+        sink.submit.assert_called_once()
+        self.assertIs(sink.submit.call_args[0][0], frame)
+
+    def test_no_sink_no_drawing(self):
+        frame, overlay = self.detect(None)
+        overlay.assert_not_called()
+        # The tracker neither draws on nor keeps the frame
+        self.assertFalse(frame.any())
+
+if __name__ == '__main__':
+    unittest.main()
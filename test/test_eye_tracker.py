@@ -55,44 +55,6 @@ class TestEyeTracker(unittest.TestCase):
         center = self.eye_tracker._calculate_eye_center(eye_points)
         self.assertEqual(center, (1, 1))
 
-    def test_check_blink_state(self):
-        current_time = 100.0
-        eye_state = {'closed': False, 'closed_time': 0, 'last_blink': 0}
-        
-        # Test eye not closed
-        blink_info = self.eye_tracker._check_blink_state(0.05, eye_state, current_time, threshold=0.018)
-        self.assertFalse(blink_info['is_closed'])
-        self.assertFalse(blink_info['blink_detected'])
-        
-        # Test eye just closed
-        blink_info = self.eye_tracker._check_blink_state(0.01, eye_state, current_time, threshold=0.018)
-        self.assertTrue(blink_info['is_closed'])
-        self.assertFalse(blink_info['blink_detected'])
-        self.assertTrue(eye_state['closed'])
-        self.assertEqual(eye_state['closed_time'], current_time)
-        
-        # Test eye opened after being closed (completed blink)
-        eye_state = {'closed': True, 'closed_time': current_time - 0.2, 'last_blink': 0}
-        blink_info = self.eye_tracker._check_blink_state(0.05, eye_state, current_time, threshold=0.018)
-        self.assertFalse(blink_info['is_closed'])
-        self.assertTrue(blink_info['blink_detected'])
-        self.assertFalse(eye_state['closed'])
-        self.assertEqual(eye_state['last_blink'], current_time)
-        
-        # Test long blink
-        eye_state = {'closed': True, 'closed_time': current_time - 1.5, 'last_blink': 0}
-        blink_info = self.eye_tracker._check_blink_state(0.05, eye_state, current_time, threshold=0.018)
-        self.assertFalse(blink_info['is_closed'])
-        self.assertTrue(blink_info['blink_detected'])
-        self.assertTrue(blink_info['long_blink'])
-        
-        # Test double blink
-        eye_state = {'closed': True, 'closed_time': current_time - 0.2, 'last_blink': current_time - 0.3}
-        blink_info = self.eye_tracker._check_blink_state(0.05, eye_state, current_time, threshold=0.018)
-        self.assertFalse(blink_info['is_closed'])
-        self.assertTrue(blink_info['blink_detected'])
-        self.assertTrue(blink_info['double_blink'])
-
     def tearDown(self):
         self.eye_tracker.release()
 
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from KalEmc.fixation import FIXATION, PURSUIT, SACCADE, FixationDetector
+
+FPS = 60.0
+
+def run(detector, points):
+    moves = []
+    for i, (x, y) in enumerate(points):
+        if detector.update(x, y, i / FPS):
+            moves.append((i, detector.state, detector.x, detector.y))
+    return moves
+
+class TestFixationDetector(unittest.TestCase):
+    def test_fixation_holds_through_jitter(self):
+        rng = np.random.default_rng(0)
+        points = (0.4, 0.6) + rng.normal(0, 0.01, (120, 2))
+        moves = run(FixationDetector(), points)
+
+        # The first sample, then one settle move to the centroid
+        self.assertEqual(len(moves), 2)
+        self.assertEqual(moves[0][1], SACCADE)
+        index, state, x, y = moves[1]
+        self.assertEqual(state, FIXATION)
+        self.assertAlmostEqual(index / FPS, 0.1, delta=1 / FPS)
+        self.assertAlmostEqual(x, 0.4, delta=0.01)
+        self.assertAlmostEqual(y, 0.6, delta=0.01)
+
+    def test_saccade_moves_at_once(self):
+        points = [(0.2, 0.2)] * 30 + [(0.8, 0.7)] * 30
+        moves = run(FixationDetector(), points)
+        self.assertIn((30, SACCADE, 0.8, 0.7), moves)
+
+    def test_single_stray_sample_ignored(self):
+        detector = FixationDetector(saccade_velocity=100.0)
+        points = [(0.5, 0.5)] * 20 + [(0.6, 0.5)] + [(0.5, 0.5)] * 20
+        moves = run(detector, points)
+        self.assertEqual([state for _, state, _, _ in moves], [SACCADE, FIXATION])
+
+    def test_pursuit_followed(self):
+        # 0.3 screen/s is far below saccade speed but leaves any fixation
+        points = [(0.1 + 0.3 * i / FPS, 0.5) for i in range(120)]
+        detector = FixationDetector()
+        moves = run(detector, points)
+        self.assertGreaterEqual(detector.counts[PURSUIT], 4)
+        self.assertAlmostEqual(moves[-1][2], points[-1][0], delta=detector.dispersion + 0.01)
+
+    def test_reset(self):
+        detector = FixationDetector()
+        run(detector, [(0.5, 0.5)] * 10)
+        detector.reset()
+        self.assertTrue(detector.update(0.5, 0.5, 1.0))
+        self.assertEqual(detector.get_stats()['moves'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from KalEmc.frame_source import (CameraSource, ImageSequenceSource, VideoFileSource,
+                                 create_frame_source)
+
+class TestFrameSource(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for i in range(3):
+            cv2.imwrite(os.path.join(self.directory, f"frame_{i:03d}.png"),
+                        np.full((48, 64, 3), i * 50, dtype=np.uint8))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_image_sequence_order_and_end(self):
+        source = ImageSequenceSource(self.directory)
+        self.assertTrue(source.open())
+        self.assertEqual(source.get_frame_size(), (64, 48))
+        
+        values = []
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            values.append(int(frame[0, 0, 0]))
+        
+        self.assertEqual(values, [0, 50, 100])
+        self.assertTrue(source.exhausted)
+
+    def test_image_sequence_loop(self):
+        source = ImageSequenceSource(self.directory, loop=True)
+        source.open()
+        for _ in range(7):
+            ret, _ = source.read()
+            self.assertTrue(ret)
+        self.assertFalse(source.exhausted)
+
+    def test_missing_directory(self):
+        source = ImageSequenceSource(os.path.join(self.directory, "missing"))
+        self.assertFalse(source.open())
+
+    def test_create_frame_source(self):
+        self.assertIsInstance(create_frame_source(0), CameraSource)
+        self.assertIsInstance(create_frame_source("1"), CameraSource)
+        self.assertIsInstance(create_frame_source(self.directory), ImageSequenceSource)
+        self.assertIsInstance(create_frame_source("session.mp4"), VideoFileSource)
+
+if __name__ == '__main__':
+    unittest.main()
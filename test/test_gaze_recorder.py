@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from KalEmc.clock import ManualClock
+from KalEmc.gaze_recorder import CountingMouseController, GazeRecorder, GazeRecording, replay
+from KalEmc.gaze_sample import GazeSample
+from KalEmc.gesture_controller import GestureController
+
+def make_sample(timestamp, closed=False, blink=False):
+    sample = GazeSample()
+    sample.timestamp = timestamp
+    sample.left_eye_center[:] = (300, 200)
+    sample.right_eye_center[:] = (200, 200)
+    sample.left_pupil.set(305, 201, 0.25, -0.5)
+    sample.right_pupil.set(204, 199, 0.5, 0.125)
+    sample.has_pupils = True
+    sample.left_blink.is_closed = closed
+    sample.left_blink.blink_detected = blink
+    return sample
+
+class TestGazeRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.gaze")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        sample = make_sample(12.5, closed=True)
+        with GazeRecorder(self.path) as recorder:
+            recorder.write(sample)
+            recorder.write(make_sample(12.55))
+        
+        recording = GazeRecording(self.path)
+        self.assertEqual(len(recording), 2)
+        self.assertAlmostEqual(recording.duration, 0.05)
+        self.assertEqual(recording.sample(0), sample)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording at all')
+        with self.assertRaises(ValueError):
+            GazeRecording(self.path)
+
+    def test_replay_uses_recorded_time(self):
+        # Two blinks 0.2s apart in recorded time: only the first is a click
+        with GazeRecorder(self.path) as recorder:
+            recorder.write(make_sample(100.0, blink=True))
+            recorder.write(make_sample(100.2, blink=True))
+            recorder.write(make_sample(101.0, blink=True))
+        
+        clock = ManualClock()
+        mouse = CountingMouseController()
+        controller = GestureController(mouse, clock=clock, fixation_detection=False)
+        count = replay(GazeRecording(self.path), controller, clock)
+        
+        self.assertEqual(count, 3)
+        self.assertEqual(mouse.counts['left_click'], 2)
+        self.assertEqual(mouse.counts['move_to'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
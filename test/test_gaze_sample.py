@@ -0,0 +1,30 @@
+import unittest
+from KalEmc.gaze_sample import BlinkInfo, GazeSample
+
+class TestGazeSample(unittest.TestCase):
+    def test_copy_is_independent(self):
+        sample = GazeSample()
+        sample.left_eye_center[:] = (300, 200)
+        sample.left_pupil.set(305.7, 201.2, 0.25, -0.5)
+        sample.left_blink.blink_detected = True
+        sample.has_pupils = True
+
+        copy = sample.copy()
+        self.assertEqual(copy, sample)
+        self.assertEqual(copy.left_pupil.position, (305, 201))
+
+        # Refilling the original for the next frame leaves the copy alone
+        sample.left_eye_center[:] = 0
+        sample.left_pupil.set(0, 0, 0.0, 0.0)
+        sample.left_blink.reset()
+        self.assertEqual(tuple(copy.left_eye_center), (300, 200))
+        self.assertEqual(copy.left_pupil.relative_x, 0.25)
+        self.assertTrue(copy.left_blink.blink_detected)
+        self.assertNotEqual(copy, sample)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            BlinkInfo().closed = True
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock
+from KalEmc.clock import ManualClock
+from KalEmc.gesture_controller import GestureController
+from KalEmc.gaze_sample import BlinkInfo, GazeSample, PupilInfo
+
+def make_blink_sample(left_blink, right_blink):
+    sample = GazeSample()
+    sample.left_blink = left_blink
+    sample.right_blink = right_blink
+    return sample
+
+class TestGestureProcessing(unittest.TestCase):
+    def setUp(self):
+        self.mock_mouse_controller = MagicMock()
+        self.mock_mouse_controller.get_screen_size.return_value = (1920, 1080)
+        self.gesture_controller = GestureController(self.mock_mouse_controller)
+
+    def test_process_blinks_single_blink(self):
+        # Test single blink detection
+        eye_data = make_blink_sample(
+            BlinkInfo(is_closed=False, blink_detected=True, long_blink=False, double_blink=False),
+            BlinkInfo(is_closed=False, blink_detected=False)
+        )
+        
+        # Ensure enough time has passed since last blink
+        self.gesture_controller.last_blink_time = 0
+        
+        # Process the blink
+        self.gesture_controller._process_blinks(eye_data)
+        
+        # Check that left click was called
+        self.mock_mouse_controller.left_click.assert_called_once()
+
+    def test_process_blinks_double_blink(self):
+        # Test double blink detection
+        eye_data = make_blink_sample(
+            BlinkInfo(is_closed=False, blink_detected=True, long_blink=False, double_blink=True),
+            BlinkInfo(is_closed=False, blink_detected=False)
+        )
+        
+        # Process the blink
+        self.gesture_controller._process_blinks(eye_data)
+        
+        # Check that double click was called
+        self.mock_mouse_controller.double_click.assert_called_once()
+
+    def test_process_blinks_long_blink(self):
+        # Test long blink detection
+        eye_data = make_blink_sample(
+            BlinkInfo(is_closed=False, blink_detected=True, long_blink=True, double_blink=False),
+            BlinkInfo(is_closed=False, blink_detected=False)
+        )
+        
+        # Process the blink
+        self.gesture_controller._process_blinks(eye_data)
+        
+        # Check that right click was called
+        self.mock_mouse_controller.right_click.assert_called_once()
+
+    def test_refractory_period(self):
+        clock = ManualClock(start=10.0)
+        controller = GestureController(self.mock_mouse_controller, clock=clock,
+                                       refractory_periods={'right_click': 1.0}, fixation_detection=False)
+        eye_data = make_blink_sample(
+            BlinkInfo(is_closed=False, blink_detected=True, long_blink=True),
+            BlinkInfo(is_closed=False, blink_detected=False)
+        )
+        eye_data.left_pupil = PupilInfo(relative_x=0.2, relative_y=0.1)
+        eye_data.right_pupil = PupilInfo(relative_x=0.3, relative_y=0.2)
+        eye_data.has_pupils = True
+        
+        controller.process_eye_data(eye_data)
+        clock.advance(0.5)
+        controller.process_eye_data(eye_data)
+        
+        # The repeat is dropped without blocking; gaze is still processed
+        self.mock_mouse_controller.right_click.assert_called_once()
+        self.assertEqual(self.mock_mouse_controller.move_to.call_count, 2)
+        self.assertEqual(controller.suppressed_gestures, 1)
+        self.assertEqual(clock.time(), 10.5)
+        
+        clock.advance(0.5)
+        controller.process_eye_data(eye_data)
+        self.assertEqual(self.mock_mouse_controller.right_click.call_count, 2)
+
+    def test_process_gaze(self):
+        # Test gaze processing
+        eye_data = GazeSample()
+        eye_data.left_pupil = PupilInfo(relative_x=0.2, relative_y=0.1)
+        eye_data.right_pupil = PupilInfo(relative_x=0.3, relative_y=0.2)
+        eye_data.has_pupils = True
+        
+        # Process the gaze
+        self.gesture_controller._process_gaze(eye_data)
+        
+        # Check that move_to was called with appropriate coordinates
+        self.mock_mouse_controller.move_to.assert_called_once()
+        
+        # The same gaze a frame later is a fixation: the pointer holds still
+        self.mock_mouse_controller.move_to.reset_mock()
+        eye_data.timestamp = 1 / 30
+        self.gesture_controller._process_gaze(eye_data)
+        self.mock_mouse_controller.move_to.assert_not_called()
+        
+        # A fast jump across the screen is a saccade and moves it at once
+        eye_data.left_pupil = PupilInfo(relative_x=-0.2, relative_y=-0.1)
+        eye_data.right_pupil = PupilInfo(relative_x=-0.3, relative_y=-0.2)
+        eye_data.timestamp = 2 / 30
+        self.gesture_controller._process_gaze(eye_data)
+        self.mock_mouse_controller.move_to.assert_called_once()
+        
+        # The filter follows the smoothing setting
+        self.gesture_controller.smoothing = 'kalman'
+        self.assertEqual(type(self.gesture_controller.gaze_filter).__name__, 'KalmanFilter')
+
+if __name__ == '__main__':
+    unittest.main()
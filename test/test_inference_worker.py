@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from KalEmc.inference_worker import InferenceWorker
+
+class TestInferenceWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = InferenceWorker([33, 133], [468, 473], max_frame_shape=(120, 160, 3))
+        self.addCleanup(self.worker.stop)
+        self.assertTrue(self.worker.start())
+        self.frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.out = np.full((4, 3), -1.0, dtype=np.float32)
+
+    def test_process_without_face(self):
+        for _ in range(3):
+            self.assertIsNone(self.worker.process(self.frame, self.out, timeout=5.0))
+        self.assertEqual(self.worker.timeouts, 0)
+        # Nothing is copied when no face was found
+        self.assertTrue((self.out == -1.0).all())
+
+    def test_oversized_frame_rejected(self):
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        self.assertIsNone(self.worker.process(frame, self.out, timeout=5.0))
+        self.assertEqual(self.worker.timeouts, 0)
+
+    def test_timeout_reply_discarded(self):
+        self.assertIsNone(self.worker.process(self.frame, self.out, timeout=0))
+        self.assertEqual(self.worker.timeouts, 1)
+
+        # The late reply to the timed-out request is skipped, not taken as this one's
+        self.assertIsNone(self.worker.process(self.frame, self.out, timeout=5.0))
+        self.assertEqual(self.worker.timeouts, 1)
+        self.assertEqual(self.worker._seq, 2)
+
+    def test_restart_after_worker_dies(self):
+        process = self.worker._process
+        process.kill()
+        process.join()
+
+        self.assertIsNone(self.worker.process(self.frame, self.out, timeout=5.0))
+        self.assertEqual(self.worker.restarts, 1)
+        self.assertIsNot(self.worker._process, process)
+        self.assertTrue(self.worker._process.is_alive())
+        self.assertEqual(self.worker.timeouts, 0)
+
+if __name__ == '__main__':
+    unittest.main()
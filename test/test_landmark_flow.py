@@ -0,0 +1,39 @@
+import unittest
+import cv2
+import numpy as np
+from KalEmc.landmark_flow import LandmarkFlowTracker
+
+def textured_frame(shift=0):
+    rng = np.random.default_rng(1)
+    texture = cv2.GaussianBlur(rng.integers(0, 256, size=(240, 320), dtype=np.uint8), (5, 5), 0)
+    frame = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
+    return np.roll(frame, shift, axis=1)
+
+class TestLandmarkFlowTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = LandmarkFlowTracker(keyframe_interval=3)
+        self.points = np.array([(100, 100), (150, 120), (200, 90)], dtype=np.float32)
+
+    def test_tracks_small_motion(self):
+        self.assertTrue(self.tracker.needs_keyframe())
+        self.tracker.reset(self.tracker.convert(textured_frame()), self.points)
+        self.assertFalse(self.tracker.needs_keyframe())
+        
+        tracked = self.tracker.track(self.tracker.convert(textured_frame(shift=3)))
+        self.assertIsNotNone(tracked)
+        np.testing.assert_allclose(tracked, self.points + (3, 0), atol=0.5)
+
+    def test_keyframe_interval(self):
+        self.tracker.reset(self.tracker.convert(textured_frame()), self.points)
+        for shift in (1, 2, 3):
+            self.assertIsNotNone(self.tracker.track(self.tracker.convert(textured_frame(shift))))
+        self.assertTrue(self.tracker.needs_keyframe())
+
+    def test_large_motion_forces_keyframe(self):
+        self.tracker.reset(self.tracker.convert(textured_frame()), self.points)
+        self.assertIsNone(self.tracker.track(self.tracker.convert(textured_frame(shift=40))))
+        self.assertTrue(self.tracker.needs_keyframe())
+        self.assertEqual(self.tracker.forced_keyframes, 1)
+
+if __name__ == '__main__':
+    unittest.main()
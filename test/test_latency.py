@@ -0,0 +1,73 @@
+import unittest
+import time
+from unittest.mock import MagicMock
+import cv2
+from KalEmc.frame_source import CameraSource
+from KalEmc.gaze_sample import GazeSample
+from KalEmc.gesture_controller import GestureController
+from KalEmc.gaze_recorder import CountingMouseController
+from KalEmc.latency import LatencyHistogram
+from KalEmc.pointer_injector import PointerInjector
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.010)
+        for _ in range(10):
+            histogram.record(0.100)
+
+        stats = histogram.get_stats()
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['mean_ms'], 19.0)
+        # Bucket edges are 20 per decade, so within 12% above the true value
+        self.assertGreaterEqual(stats['p50_ms'], 10.0)
+        self.assertLess(stats['p50_ms'], 11.3)
+        self.assertGreaterEqual(stats['p99_ms'], 100.0 - 1e-9)
+        self.assertLessEqual(stats['p99_ms'], stats['max_ms'])
+        self.assertEqual(len(histogram.format().splitlines()), 2)
+
+        histogram.reset()
+        self.assertEqual(histogram.get_stats()['p95_ms'], 0.0)
+
+class TestCaptureTimestamps(unittest.TestCase):
+    def test_camera_timestamp(self):
+        source = CameraSource(0)
+        source.cap = MagicMock()
+        source.cap.read.return_value = (True, None)
+
+        # A V4L2 buffer timestamp on the monotonic clock is used as is
+        stamp = time.monotonic() - 0.02
+        source.cap.get.side_effect = lambda prop: stamp * 1000 if prop == cv2.CAP_PROP_POS_MSEC else 0
+        source.read()
+        self.assertAlmostEqual(source.capture_time, stamp)
+
+        # A stream position is not a capture time
+        source.cap.get.side_effect = lambda prop: 33.3
+        before = time.monotonic()
+        source.read()
+        self.assertGreaterEqual(source.capture_time, before)
+
+    def test_gesture_controller_records_latency(self):
+        display = CountingMouseController()
+        injector = PointerInjector(display, refresh_rate=0)
+        controller = GestureController(injector, fixation_detection=False)
+
+        sample = GazeSample()
+        sample.left_pupil.set(0, 0, 0.3, 0.0)
+        sample.right_pupil.set(0, 0, 0.3, 0.0)
+        sample.has_pupils = True
+        sample.capture_time = time.monotonic() - 0.05
+        sample.timestamp = sample.capture_time + 0.03
+        controller.process_eye_data(sample)
+        injector.start()
+        injector.stop()
+
+        self.assertEqual(display.counts['move_to'], 1)
+        self.assertAlmostEqual(controller.latency.get_stats()['capture_to_detect']['max_ms'], 30.0)
+        stats = injector.latency.get_stats()
+        self.assertEqual(stats['capture_to_inject']['count'], 1)
+        self.assertGreaterEqual(stats['capture_to_inject']['max_ms'], 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from KalEmc.gaze_sample import GazeSample
+from KalEmc import main
+
+class TestEyeMouseAssistant(unittest.TestCase):
+    def setUp(self):
+        patchers = [patch.object(main, 'VoiceListener'), patch.object(main, 'EyeTracker'),
+                    patch.object(main, 'MouseController')]
+        self.voice_listener, self.eye_tracker, self.mouse_controller = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.mouse_controller.return_value.get_screen_size.return_value = (1920, 1080)
+        # No stored calibration profile is looked up
+        self.assistant = main.EyeMouseAssistant(idle_release=0.1, source='replay')
+        self.addCleanup(self.assistant.stop)
+
+    def test_tracker_acquired_on_activate(self):
+        self.assertIsNone(self.assistant.eye_tracker)
+        self.assistant.activate()
+        self.assertIs(self.assistant.eye_tracker, self.eye_tracker.return_value)
+        self.assertTrue(self.assistant.active)
+
+        # Activating again reuses the tracker
+        self.assistant.activate()
+        self.assertEqual(self.eye_tracker.call_count, 1)
+
+    def test_idle_release(self):
+        self.assistant.activate()
+        tracker = self.assistant.eye_tracker
+        self.assistant.deactivate()
+        self.assertIs(self.assistant.eye_tracker, tracker)
+
+        time.sleep(0.3)
+        self.assertIsNone(self.assistant.eye_tracker)
+        tracker.release.assert_called_once()
+
+    def test_reactivate_cancels_release(self):
+        self.assistant.activate()
+        tracker = self.assistant.eye_tracker
+        self.assistant.deactivate()
+        self.assistant.activate()
+
+        time.sleep(0.3)
+        self.assertIs(self.assistant.eye_tracker, tracker)
+        tracker.release.assert_not_called()
+
+    def test_stop_releases(self):
+        self.assistant.activate()
+        tracker = self.assistant.eye_tracker
+        self.assistant.stop()
+        self.assertIsNone(self.assistant.eye_tracker)
+        tracker.release.assert_called_once()
+        self.assertIsNone(self.assistant._read_eye_data())
+
+    def start_loop(self):
+        self.reads = []
+        def read_eye_data():
+            self.reads.append(time.monotonic())
+            time.sleep(0.005)
+            return None
+        self.assistant._read_eye_data = read_eye_data
+        thread = threading.Thread(target=self.assistant.start)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def test_loop_blocks_while_inactive(self):
+        thread = self.start_loop()
+        time.sleep(0.1)
+        self.assertEqual(self.reads, [])
+        self.assertTrue(thread.is_alive())
+
+        # Waking up starts reading frames, going back to sleep stops it
+        self.assistant.activate()
+        time.sleep(0.1)
+        self.assertGreater(len(self.reads), 0)
+        self.assistant.deactivate()
+        time.sleep(0.02)
+        count = len(self.reads)
+        time.sleep(0.1)
+        self.assertEqual(len(self.reads), count)
+
+    def test_stop_from_another_thread(self):
+        for activate in (False, True):
+            thread = self.start_loop()
+            if activate:
+                self.assistant.activate()
+            time.sleep(0.05)
+
+            start = time.monotonic()
+            self.assistant.stop()
+            thread.join(timeout=1.0)
+            self.assertFalse(thread.is_alive())
+            self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_calibration_reads_do_not_overlap_main_loop(self):
+        in_flight = []
+        overlaps = []
+        sample = GazeSample()
+        sample.has_pupils = True
+        def read_eye_data():
+            in_flight.append(True)
+            if len(in_flight) > 1:
+                overlaps.append(True)
+            time.sleep(0.005)
+            in_flight.pop()
+            return sample
+        self.assistant._read_eye_data = read_eye_data
+        self.assistant.gesture_controller.process_eye_data = lambda eye_data: time.sleep(0.005)
+
+        thread = threading.Thread(target=self.assistant.start)
+        thread.daemon = True
+        thread.start()
+        self.assistant.activate()
+        time.sleep(0.02)
+
+        # Calibration reads from another thread while the loop is mid-frame
+        reader = threading.Thread(target=lambda: [self.assistant._read_calibration_gaze() for _ in range(20)])
+        reader.start()
+        reader.join()
+        self.assistant.stop()
+        thread.join(timeout=1.0)
+        self.assertEqual(overlaps, [])
+
+if __name__ == '__main__':
+    unittest.main()
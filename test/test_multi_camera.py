@@ -0,0 +1,98 @@
+import unittest
+import time
+import numpy as np
+from KalEmc.clock import ManualClock
+from KalEmc.gaze_sample import GazeSample
+from KalEmc.multi_camera import MultiCameraTracker, fuse_gaze
+
+def make_sample(relative_x, confidence, timestamp=0.0, position=(100, 100)):
+    sample = GazeSample()
+    sample.timestamp = timestamp
+    sample.left_eye_center[:] = position
+    sample.right_eye_center[:] = position
+    sample.left_pupil.set(position[0], position[1], relative_x, 0.0)
+    sample.right_pupil.set(position[0], position[1], relative_x, 0.0)
+    sample.has_pupils = True
+    sample.confidence = confidence
+    return sample
+
+class FakeTracker:
+    """Delivers one sample per frame after a short delay, like a 100 fps camera"""
+    def __init__(self, camera_id, relative_x, confidence):
+        self.camera_id = camera_id
+        self.relative_x = relative_x
+        self.confidence = confidence
+        self.released = False
+
+    def capture_frame(self, timeout=0.5):
+        time.sleep(0.01)
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    def detect_eyes(self, frame):
+        if self.confidence is None:
+            return None
+        return make_sample(self.relative_x, self.confidence, timestamp=time.monotonic())
+
+    def release(self):
+        self.released = True
+
+class TestFuseGaze(unittest.TestCase):
+    def test_weighted_pupil_offsets(self):
+        fused = fuse_gaze([make_sample(0.2, 0.75, position=(10, 10)), make_sample(0.6, 0.25, position=(50, 50))])
+        self.assertAlmostEqual(fused.left_pupil.relative_x, 0.3)
+        self.assertAlmostEqual(fused.right_pupil.relative_x, 0.3)
+
+        # Pixel positions come from the most confident camera
+        self.assertEqual(fused.left_pupil.position, (10, 10))
+        self.assertEqual(tuple(fused.left_eye_center), (10, 10))
+
+    def test_missing_cameras_ignored(self):
+        sample = make_sample(0.4, 0.5)
+        self.assertIsNone(fuse_gaze([None, None]))
+        self.assertEqual(fuse_gaze([None, sample]).left_pupil.relative_x, 0.4)
+
+class TestMultiCameraTracker(unittest.TestCase):
+    def test_fuses_cameras_running_in_parallel(self):
+        trackers = [FakeTracker(0, 0.0, 0.5), FakeTracker(1, 1.0, 0.5), FakeTracker(2, 0.0, None)]
+        tracker = MultiCameraTracker(trackers, max_age=1.0)
+        tracker.start()
+        try:
+            results = [tracker.read_gaze(timeout=1.0) for _ in range(10)]
+        finally:
+            tracker.release()
+
+        self.assertTrue(all(result is not None for result in results))
+        self.assertAlmostEqual(results[-1].left_pupil.relative_x, 0.5)
+
+        stats = tracker.get_stats()
+        self.assertGreater(stats['cameras'][0]['samples'], 0)
+        self.assertEqual(stats['cameras'][2]['samples'], 0)
+        self.assertGreater(stats['cameras'][2]['dropouts'], 0)
+        self.assertTrue(all(fake.released for fake in trackers))
+
+    def test_blink_event_delivered_once(self):
+        clock = ManualClock(start=1.0)
+        tracker = MultiCameraTracker([FakeTracker(0, 0.0, 0.9), FakeTracker(1, 0.0, 0.5)], max_age=1.0, clock=clock)
+        def deliver(index, blink):
+            # What CameraWorker._run does with a new sample, without the threads
+            sample = make_sample(0.0, tracker.workers[index].tracker.confidence, timestamp=clock.time())
+            sample.left_blink.blink_detected = sample.right_blink.blink_detected = blink
+            worker = tracker.workers[index]
+            worker._latest.copy_from(sample)
+            worker._seq += 1
+            tracker._notify()
+            return tracker.read_gaze(timeout=0)
+
+        # The more confident camera sees the blink
+        self.assertTrue(deliver(0, True).left_blink.blink_detected)
+        # Samples from the other camera fuse in camera 0's latest one again,
+        # but not its blink
+        for _ in range(3):
+            clock.advance(0.01)
+            fused = deliver(1, False)
+            self.assertFalse(fused.left_blink.blink_detected)
+            self.assertFalse(fused.right_blink.blink_detected)
+        self.assertEqual(tracker.wins[0], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import time
+from KalEmc.pointer_injector import PointerInjector
+
+class SlowMouse:
+    """Records actions with their time; moves take a while, like a slow input layer"""
+    def __init__(self, move_time=0.0):
+        self.move_time = move_time
+        self.actions = []
+
+    def get_screen_size(self):
+        return 1920, 1080
+
+    def move_to(self, x, y):
+        time.sleep(self.move_time)
+        self.actions.append(('move_to', (x, y), time.monotonic()))
+
+    def left_click(self):
+        self.actions.append(('left_click', (), time.monotonic()))
+
+    def scroll(self, amount):
+        self.actions.append(('scroll', (amount,), time.monotonic()))
+
+class TestPointerInjector(unittest.TestCase):
+    def test_moves_coalesced_and_order_kept(self):
+        mouse = SlowMouse()
+        injector = PointerInjector(mouse, refresh_rate=60)
+
+        # Queued before the thread runs, so the order is deterministic
+        for x in range(5):
+            injector.move_to(x, 0)
+        injector.left_click()
+        injector.move_to(10, 0)
+        injector.move_to(11, 0)
+        injector.scroll(2)
+        self.assertEqual(injector.get_stats()['queue_depth'], 4)
+
+        injector.start()
+        injector.stop()
+
+        self.assertEqual([(action, args) for action, args, _ in mouse.actions],
+                         [('move_to', (4, 0)), ('left_click', ()), ('move_to', (11, 0)), ('scroll', (2,))])
+        stats = injector.get_stats()
+        self.assertEqual(stats['moves_requested'], 7)
+        self.assertEqual(stats['moves_sent'], 2)
+        self.assertEqual(stats['moves_coalesced'], 5)
+        self.assertEqual(stats['actions_sent'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_coalesced_move_timed_from_newest_capture(self):
+        mouse = SlowMouse()
+        injector = PointerInjector(mouse, refresh_rate=0)
+        injector.move_to(1, 0, capture_time=time.monotonic() - 1.0)
+        time.sleep(0.03)
+        injector.move_to(2, 0, capture_time=time.monotonic() - 0.05)
+        injector.left_click()
+        injector.start()
+        injector.stop()
+
+        stats = injector.latency.get_stats()
+        # The pointer shows the frame captured 50 ms ago, not the one a second ago
+        self.assertEqual(stats['capture_to_inject']['count'], 1)
+        self.assertGreaterEqual(stats['capture_to_inject']['max_ms'], 50.0)
+        self.assertLess(stats['capture_to_inject']['max_ms'], 500.0)
+        # The merged move waited as long as its first request
+        self.assertEqual(stats['queue_to_inject']['count'], 2)
+        self.assertGreaterEqual(stats['queue_to_inject']['max_ms'], 30.0)
+
+    def test_move_rate_capped(self):
+        mouse = SlowMouse()
+        injector = PointerInjector(mouse, refresh_rate=50)
+        injector.start()
+        try:
+            # A 1 kHz stream of targets does not reach the mouse at 1 kHz
+            end = time.monotonic() + 0.3
+            x = 0
+            while time.monotonic() < end:
+                injector.move_to(x, 0)
+                x += 1
+                time.sleep(0.001)
+        finally:
+            injector.stop()
+
+        # stop() flushes the pending move without waiting, so leave it out
+        times = [t for _, _, t in mouse.actions[:-1]]
+        self.assertLessEqual(len(times), 0.3 * 50 + 1)
+        self.assertGreaterEqual(min(b - a for a, b in zip(times, times[1:])), 0.02 - 0.002)
+        # The last target always gets through
+        self.assertEqual(mouse.actions[-1][1], (x - 1, 0))
+
+    def test_slow_mouse_does_not_block_caller(self):
+        injector = PointerInjector(SlowMouse(move_time=0.05), refresh_rate=0)
+        injector.start()
+        try:
+            start = time.monotonic()
+            for x in range(20):
+                injector.move_to(x, 0)
+            self.assertLess(time.monotonic() - start, 0.05)
+        finally:
+            injector.stop()
+        self.assertGreater(injector.moves_coalesced, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import cv2
+import numpy as np
+from KalEmc.pupil_detector import PupilDetector
+
+class TestPupilDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = PupilDetector()
+        
+        # Bright eye region with a dark pupil right of center
+        self.gray = np.full((480, 640), 120, dtype=np.uint8)
+        self.eye_points = np.array([(380, 240, 0), (395, 232, 0), (410, 232, 0),
+                                    (425, 240, 0), (410, 248, 0), (395, 248, 0)], dtype=np.float64)
+        cv2.fillPoly(self.gray, [self.eye_points[:, :2].astype(np.int32)], 220)
+        cv2.circle(self.gray, (405, 240), 4, 20, -1)
+
+    def test_detect_pupil_position(self):
+        pupil = self.detector.detect(self.gray, self.eye_points)
+        self.assertEqual(pupil.position, (405, 240))
+        self.assertGreater(pupil.relative_x, 0)
+        self.assertAlmostEqual(pupil.relative_y, 0.0)
+
+    def test_buffers_reused(self):
+        pupil = self.detector.detect(self.gray, self.eye_points)
+        mask = self.detector._mask
+        self.assertIs(self.detector.detect(self.gray, self.eye_points, out=pupil), pupil)
+        self.assertIs(self.detector._mask, mask)
+
+    def test_eye_outside_frame(self):
+        pupil = self.detector.detect(self.gray, self.eye_points + (1000, 0, 0))
+        self.assertEqual(pupil.position, (1402, 240))
+
+if __name__ == '__main__':
+    unittest.main()
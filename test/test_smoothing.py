@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from KalEmc.smoothing import MAX_EMA_WEIGHT, EMAFilter, KalmanFilter, NoFilter, OneEuroFilter, create_filter
+
+def run(gaze_filter, values, fps=60.0):
+    return np.array([gaze_filter.filter(np.asarray(value, dtype=np.float64), i / fps).copy()
+                     for i, value in enumerate(values)])
+
+class TestSmoothing(unittest.TestCase):
+    def test_ema_uses_previous_output(self):
+        out = run(EMAFilter(weight=0.5), [(0, 0)] + [(1, -2)] * 3)
+        np.testing.assert_allclose(out[:, 0], [0, 0.5, 0.75, 0.875])
+        np.testing.assert_allclose(out[:, 1], [0, -1, -1.5, -1.75])
+
+    def test_ema_weight_capped(self):
+        # A weight of 1.0 would hold the first output forever
+        gaze_filter = create_filter(1.0)
+        self.assertEqual(gaze_filter.weight, MAX_EMA_WEIGHT)
+        out = run(gaze_filter, [(0, 0)] + [(1, -1)] * 120)
+        self.assertGreater(out[-1][0], 0.99)
+        self.assertLess(out[-1][1], -0.99)
+
+    def test_noise_suppressed_and_steps_followed(self):
+        rng = np.random.default_rng(0)
+        noisy = rng.normal(0, 0.05, (300, 2))
+        step = np.zeros((120, 2))
+        step[20:] = (1.0, -1.0)
+        for gaze_filter in (OneEuroFilter(), KalmanFilter(), EMAFilter(0.7)):
+            # Less jitter than the raw signal while resting...
+            out = run(gaze_filter, noisy)
+            self.assertLess(np.std(np.diff(out, axis=0)), 0.5 * np.std(np.diff(noisy, axis=0)))
+
+            # ...and a step is reached on both axes within half a second
+            gaze_filter.reset()
+            out = run(gaze_filter, step)
+            np.testing.assert_allclose(out[50], (1.0, -1.0), atol=0.05)
+
+    def test_kalman_tracks_constant_velocity(self):
+        ramp = [(i / 60, -i / 120) for i in range(120)]
+        out = run(KalmanFilter(), ramp)
+        np.testing.assert_allclose(out[-1], ramp[-1], atol=0.01)
+
+    def test_create_filter(self):
+        self.assertIsInstance(create_filter(0.5), EMAFilter)
+        self.assertIsInstance(create_filter(0), NoFilter)
+        gaze_filter = create_filter('one_euro', min_cutoff=2.0)
+        self.assertIsInstance(gaze_filter, OneEuroFilter)
+        self.assertEqual(gaze_filter.min_cutoff, 2.0)
+        self.assertIs(create_filter(gaze_filter), gaze_filter)
+        with self.assertRaises(ValueError):
+            create_filter('median')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from KalEmc.tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(capacity=8)
+        with tracer.span("stage"):
+            pass
+        self.assertEqual(tracer.get_events(), [])
+        
+        # The same no-op object is handed out every time
+        self.assertIs(tracer.span("a"), tracer.span("b"))
+
+    def test_ring_buffer_wraps(self):
+        tracer = Tracer(capacity=4, enabled=True)
+        for i in range(10):
+            tracer.record(f"span{i}", i, i + 1)
+        
+        names = [event[0] for event in tracer.get_events()]
+        self.assertEqual(names, ["span6", "span7", "span8", "span9"])
+
+    def test_export_chrome_trace(self):
+        tracer = Tracer(capacity=8, enabled=True)
+        with tracer.span("detect_eyes"):
+            pass
+        
+        directory = tempfile.mkdtemp()
+        try:
+            path = tracer.export_chrome_trace(os.path.join(directory, "trace.json"))
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            shutil.rmtree(directory)
+        
+        spans = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]['name'], "detect_eyes")
+        self.assertGreaterEqual(spans[0]['dur'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
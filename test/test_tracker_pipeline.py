@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from KalEmc.eye_tracker import EyeTracker
+from KalEmc.frame_source import FrameSource
+
+class CountingSource(FrameSource):
+    """Source that counts how often it is opened"""
+    def __init__(self):
+        super().__init__("counting")
+        self.opens = 0
+        self.opened = False
+
+    def open(self):
+        self.opens += 1
+        self.opened = True
+        return True
+
+    def is_opened(self):
+        return self.opened
+
+    def read(self):
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get_frame_size(self):
+        return 640, 480
+
+    def release(self):
+        self.opened = False
+
+class TestTrackerPipeline(unittest.TestCase):
+    def setUp(self):
+        with patch('mediapipe.solutions.face_mesh.FaceMesh'):
+            self.eye_tracker = EyeTracker(source=CountingSource())
+        self.eye_tracker.face_mesh = MagicMock()
+        self.addCleanup(self.eye_tracker.release)
+
+    def test_calculate_iris_center(self):
+        eye_points = np.array([(0, 0, 0), (10, 0, 0), (0, 10, 0), (10, 10, 0)], dtype=np.float64)
+        iris_points = np.array([(6, 5, 0), (8, 5, 0), (7, 4, 0), (7, 6, 0)], dtype=np.float64)
+        pupil = self.eye_tracker._calculate_iris_center(iris_points, eye_points)
+        self.assertEqual(pupil.position, (7, 5))
+        self.assertAlmostEqual(pupil.relative_x, 0.8)  # 2 * (7 - 5) / 10, amplified by 2
+        self.assertAlmostEqual(pupil.relative_y, 0.0)
+
+    def test_extract_landmarks(self):
+        # Landmark i sits at normalized (i / 1000, i / 2000)
+        landmarks = [MagicMock(x=i / 1000, y=i / 2000, z=0.0) for i in range(478)]
+        has_iris = self.eye_tracker._extract_landmarks(landmarks, 640, 480)
+        self.assertTrue(has_iris)
+        
+        left_eye = self.eye_tracker._landmarks[self.eye_tracker._left_eye_rows]
+        expected_x = [i / 1000 * 640 for i in self.eye_tracker.LEFT_EYE_INDICES]
+        np.testing.assert_allclose(left_eye[:, 0], expected_x)
+        
+        right_iris = self.eye_tracker._landmarks[self.eye_tracker._right_iris_rows]
+        expected_y = [i / 2000 * 480 for i in self.eye_tracker.RIGHT_IRIS]
+        np.testing.assert_allclose(right_iris[:, 1], expected_y)
+        
+        # Without refined landmarks there is no iris
+        self.assertFalse(self.eye_tracker._extract_landmarks(landmarks[:468], 640, 480))
+
+    def test_extract_landmarks_roi(self):
+        landmarks = [MagicMock(x=0.5, y=0.25, z=0.1) for _ in range(478)]
+        self.eye_tracker._extract_landmarks(landmarks, 640, 480, roi=(100, 50, 300, 250))
+        
+        # Normalized crop coordinates are mapped back to the full frame
+        np.testing.assert_allclose(self.eye_tracker._landmarks[0], (200, 100, 0.1 * 200 / 640))
+
+    def test_process_face_roi_fallback(self):
+        self.eye_tracker.roi_tracking = True
+        self.eye_tracker._face_roi = (100, 50, 300, 250)
+        face = MagicMock(landmark=[MagicMock(x=0.5, y=0.25, z=0.0) for _ in range(478)])
+        
+        # No face in the crop, face found on the full frame
+        lost = MagicMock(multi_face_landmarks=None)
+        found = MagicMock(multi_face_landmarks=[face])
+        self.eye_tracker.face_mesh.process.side_effect = [lost, found]
+        
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        has_iris, roi = self.eye_tracker._process_face(frame)
+        self.assertTrue(has_iris)
+        self.assertEqual(roi, (0, 0, 640, 480))
+        np.testing.assert_allclose(self.eye_tracker._landmarks[0, :2], (0.5, 0.25))
+        self.assertIsNone(self.eye_tracker._face_roi)
+        
+        # Second call received the full frame
+        full_input = self.eye_tracker.face_mesh.process.call_args_list[1][0][0]
+        self.assertEqual(full_input.shape, (480, 640, 3))
+
+    def test_release_then_capture_does_not_reopen(self):
+        source = CountingSource()
+        with patch('mediapipe.solutions.face_mesh.FaceMesh'):
+            tracker = EyeTracker(source=source, threaded_capture=True)
+        self.addCleanup(tracker.release)
+        self.assertIsNotNone(tracker.capture_frame())
+        
+        tracker.release()
+        self.assertIsNone(tracker.capture_frame(timeout=0.05))
+        self.assertIsNone(tracker.detect_eyes(np.zeros((480, 640, 3), dtype=np.uint8)))
+        self.assertEqual(source.opens, 1)
+        self.assertFalse(source.opened)
+        self.assertEqual(tracker.get_camera_health()['outages'], 0)
+
+if __name__ == '__main__':
+    unittest.main()